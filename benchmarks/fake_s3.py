@@ -0,0 +1,299 @@
+import os
+import io
+import bisect
+import hashlib
+import threading
+import time
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+
+'''
+Local stand-in for the S3 client calls issued by the DataMapGenerator (list_objects_v2, head_object,
+get_object w/ HTTP Range requests & download_fileobj), so the pipelines under main/ can be benchmarked w/o network access.
+
+Each bucket is backed by a sorted in-memory listing of keys & sizes, so listings of millions of keys
+can be served. Objects whose payload exists under the bucket's payload folder on local disk (e.g.
+synthetic Land DA tarballs) are served from disk, while the remaining keys are served as zero-filled
+payloads of their listed size. Failures of ranged reads can be injected to check that the pipelines
+surface storage errors rather than stall.
+
+'''
+
+
+class FakeBody():
+    """
+    Streaming body of an object, throttled to the fake client's bandwidth.
+
+    """
+    def __init__(self, fileobj, client):
+        """
+        Args:
+            fileobj (file-like): Object's payload.
+
+            client (FakeS3Client): Client serving the payload.
+
+        """
+        self.fileobj = fileobj
+        self.client = client
+
+    def read(self, size=-1):
+        buf = self.fileobj.read(size if size is not None else -1)
+        self.client._transfer(len(buf))
+        return buf
+
+    def close(self):
+        self.fileobj.close()
+
+
+class FakeBucket():
+    """
+    Listing & payloads of a fake bucket.
+
+    """
+    def __init__(self, keys, sizes, payload_dir=None):
+        """
+        Args:
+            keys (list): Object keys.
+
+            sizes (list): Object sizes in bytes (ignored for objects w/ a payload on disk).
+
+            payload_dir (str): Folder directory of the objects' payloads saved on local disk
+                               (relative path = object's key). If not applicable, set as
+                               default value.
+
+        """
+        payloads = {}
+        if payload_dir is not None and os.path.exists(payload_dir):
+            for root, _, fns in os.walk(payload_dir):
+                for fn in fns:
+                    path = os.path.join(root, fn)
+                    payloads[os.path.relpath(path, payload_dir).replace(os.sep, '/')] = path
+
+        objects = dict(zip(keys, sizes))
+        for key, path in payloads.items():
+            objects[key] = os.path.getsize(path)
+        self.keys = sorted(objects)
+        self.sizes = [objects[key] for key in self.keys]
+        self.payloads = payloads
+
+    def etag(self, key, size):
+        """
+        Derive an object's ETag from its key, size & payload's modification time.
+
+        Args:
+            key (str): Object's key.
+
+            size (int): Object's size in bytes.
+
+        Return (str): Object's ETag.
+
+        """
+        mtime = os.path.getmtime(self.payloads[key]) if key in self.payloads else 0
+        return '"%s"' % hashlib.md5(f'{key}:{size}:{mtime}'.encode()).hexdigest()
+
+
+class FakeS3Client():
+    """
+    Fake S3 client serving the fake buckets w/ an optional per-request latency & bandwidth
+    limit, while counting the API calls & bytes transferred.
+
+    """
+    def __init__(self, buckets, latency=0.0, bandwidth=None):
+        """
+        Args:
+            buckets (dict): Bucket names mapped to their FakeBucket.
+
+            latency (float): Seconds added to each request.
+
+            bandwidth (float): Bytes transferred per second. If not applicable, set as
+                               default value (unlimited).
+
+        """
+        self.buckets = buckets
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.lock = threading.Lock()
+        self.faults = None
+        self.reset_counters()
+
+    def inject_faults(self, skip=0, count=0):
+        """
+        Fail upcoming ranged GetObject requests w/ a ConnectionError.
+
+        Args:
+            skip (int): Number of ranged requests served before the first failure.
+
+            count (int): Number of ranged requests failed (none if set to 0).
+
+        """
+        with self.lock:
+            self.faults = [skip, count] if count else None
+
+    def _fault(self):
+        """
+        Determine whether to fail the current ranged request (refer to inject_faults()).
+
+        Return (bool): True if the request fails.
+
+        """
+        with self.lock:
+            if self.faults is None:
+                return False
+            if self.faults[0]:
+                self.faults[0] -= 1
+                return False
+            self.faults[1] -= 1
+            if not self.faults[1]:
+                self.faults = None
+            return True
+
+    def reset_counters(self):
+        """
+        Reset the API call & bytes transferred counters.
+
+        """
+        with self.lock:
+            self.calls = {}
+            self.bytes = 0
+
+    def _request(self, operation):
+        """
+        Count an API call & apply the request latency.
+
+        Args:
+            operation (str): Name of the S3 API operation.
+
+        """
+        with self.lock:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _transfer(self, nbytes):
+        """
+        Count the bytes transferred & apply the bandwidth limit.
+
+        Args:
+            nbytes (int): Number of bytes transferred.
+
+        """
+        with self.lock:
+            self.bytes += nbytes
+        if self.bandwidth:
+            time.sleep(nbytes / self.bandwidth)
+
+    def _lookup(self, Bucket, Key, operation='GetObject'):
+        """
+        Look up an object w/in a fake bucket.
+
+        Args:
+            Bucket (str): Bucket name.
+
+            Key (str): Object's key.
+
+            operation (str): Name of the S3 API operation (reported by the error raised
+                             for missing objects, as per S3's client errors).
+
+        Return (FakeBucket, int): Object's bucket & size in bytes.
+
+        """
+        bucket = self.buckets[Bucket]
+        idx = bisect.bisect_left(bucket.keys, Key)
+        if idx == len(bucket.keys) or bucket.keys[idx] != Key:
+            raise ClientError({'Error': {'Code': 'NoSuchKey', 'Message': f'{Key} does not exist.'}}, operation)
+        return bucket, bucket.sizes[idx]
+
+    def list_objects_v2(self, Bucket, Prefix='', Delimiter=None, ContinuationToken=None, MaxKeys=1000, **kwargs):
+        """
+        List up to MaxKeys objects & common prefixes under a prefix (refer to S3's ListObjectsV2).
+
+        """
+        self._request('ListObjectsV2')
+        bucket = self.buckets[Bucket]
+        keys = bucket.keys
+        idx = int(ContinuationToken) if ContinuationToken else bisect.bisect_left(keys, Prefix)
+        contents, prefixes = [], []
+        while idx < len(keys) and keys[idx].startswith(Prefix) and len(contents) + len(prefixes) < MaxKeys:
+            key = keys[idx]
+            pos = key.find(Delimiter, len(Prefix)) if Delimiter else -1
+            if pos != -1:
+
+                # Group the keys sharing the common prefix & skip past them.
+                common_prefix = key[:pos + len(Delimiter)]
+                prefixes.append({'Prefix': common_prefix})
+                idx = bisect.bisect_left(keys, common_prefix[:-1] + chr(ord(common_prefix[-1]) + 1), idx)
+            else:
+                contents.append({'Key': key,
+                                 'Size': bucket.sizes[idx],
+                                 'ETag': bucket.etag(key, bucket.sizes[idx]),
+                                 'LastModified': datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)})
+                idx += 1
+
+        resp = {'KeyCount': len(contents) + len(prefixes), 'IsTruncated': False}
+        if contents:
+            resp['Contents'] = contents
+        if prefixes:
+            resp['CommonPrefixes'] = prefixes
+        if idx < len(keys) and keys[idx].startswith(Prefix):
+            resp['IsTruncated'] = True
+            resp['NextContinuationToken'] = str(idx)
+        return resp
+
+    def head_object(self, Bucket, Key, **kwargs):
+        """
+        Request an object's metadata (refer to S3's HeadObject).
+
+        """
+        self._request('HeadObject')
+        bucket, size = self._lookup(Bucket, Key, 'HeadObject')
+        return {'ContentLength': size, 'ETag': bucket.etag(Key, size)}
+
+    def get_object(self, Bucket, Key, Range=None, **kwargs):
+        """
+        Read an object or a byte range of an object (refer to S3's GetObject).
+
+        """
+        self._request('GetObject')
+        bucket, size = self._lookup(Bucket, Key)
+        start, end = 0, size - 1
+        if Range is not None and self._fault():
+            raise ConnectionError(f"Injected failure of {Key} ({Range}).")
+        if Range is not None:
+            first, last = Range[len('bytes='):].split('-')
+            start, end = int(first), min(int(last), size - 1)
+
+        if Key in bucket.payloads and Range is None:
+            fileobj = open(bucket.payloads[Key], 'rb')
+        elif Key in bucket.payloads:
+            with open(bucket.payloads[Key], 'rb') as f_handle:
+                f_handle.seek(start)
+                fileobj = io.BytesIO(f_handle.read(end - start + 1))
+        else:
+            fileobj = io.BytesIO(bytes(max(end - start + 1, 0)))
+        return {'Body': FakeBody(fileobj, self),
+                'ContentLength': max(end - start + 1, 0),
+                'ETag': bucket.etag(Key, size)}
+
+    def download_fileobj(self, Bucket, Key, Fileobj, Config=None, **kwargs):
+        """
+        Download an object into a file as parallel byte range reads (as per boto3's
+        managed transfers, w/ a HeadObject followed by one GetObject per part).
+
+        """
+        size = self.head_object(Bucket, Key)['ContentLength']
+        if Config is None or size < Config.multipart_threshold:
+            Fileobj.write(self.get_object(Bucket, Key)['Body'].read())
+            return
+
+        lock = threading.Lock()
+        def get_part(start):
+            end = min(start + Config.multipart_chunksize, size) - 1
+            data = self.get_object(Bucket, Key, Range=f'bytes={start}-{end}')['Body'].read()
+            with lock:
+                Fileobj.seek(start)
+                Fileobj.write(data)
+
+        with ThreadPoolExecutor(max_workers=Config.max_request_concurrency) as executor:
+            list(executor.map(get_part, range(0, size, Config.multipart_chunksize)))
+        Fileobj.seek(size)
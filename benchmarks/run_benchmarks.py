@@ -0,0 +1,402 @@
+import sys
+import os
+import io
+import json
+import time
+import runpy
+import shutil
+import platform
+import argparse
+import tempfile
+import threading
+import importlib
+import subprocess
+import tracemalloc
+import contextlib
+import faulthandler
+import functools
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.append( os.path.join(REPO_DIR, 'modules') )
+import boto3
+import numpy as np
+import pandas as pd
+import yaml
+from fake_s3 import FakeBucket, FakeS3Client
+from synthetic_data import make_rt_listing, make_land_da_tarball
+
+'''
+The benchmark suite will run the pipelines under main/ end to end against a local S3 stand-in (refer to
+fake_s3.py) serving a synthetic bucket shaped like noaa-ufs-regtests-pds & synthetic Land DA TAR-based
+objects of configurable size & member count (refer to synthetic_data.py).
+
+Each scenario is timed w/ the inclusive time spent per DataMapGenerator stage (e.g. listing, TAR scanning,
+extraction), the S3 API calls & bytes served, & the peak Python memory (traced w/in a separate pass, so
+timings are not skewed by tracing). Results are saved as JSON & can be compared against a previous run's
+results to flag regressions. Scenarios injecting failures of ranged reads check that the failure is raised
+by the pipelines (a scenario stalling past its timeout aborts the suite).
+
+Example:
+python run_benchmarks.py
+python run_benchmarks.py -n_keys 2000000 -tar_members 50000 -tar_mb 512 -latency_ms 20
+python run_benchmarks.py -s land_da_ranged land_da_stream -c ../results/benchmarks/baseline.json
+
+'''
+
+# DataMapGenerator methods timed as pipeline stages (timings are inclusive of nested stages).
+STAGES = ['refresh_listing_snapshot', 'load_listing_snapshot', 'get_s3_listing', 'read_s3_tar_index',
+          'read_s3_tar_headers', 'read_s3_tar_stream', 'read_s3_tar_pipeline', 'read_s3_tar_gz_index', 'extract_object_details',
+          'extract_attributes', 'map_tar_objects', 'save_data']
+
+# Bucket names of the UFS-WM RT & Land DA datasets.
+RT_BUCKET = 'noaa-ufs-regtests-pds'
+LAND_DA_BUCKET = 'noaa-ufs-land-da-pds'
+
+# Land DA v1.2.0 TAR-based object mapped by map_land_da_v1p2_data.py (w/ an uncompressed counterpart).
+LAND_DA_KEY = 'current_land_da_release_data/v1.2.0/Landdav1.2.0_input_data.tar.gz'
+LAND_DA_PLAIN_KEY = 'current_land_da_release_data/v1.2.0/Landdav1.2.0_input_data.tar'
+
+
+class StageTimer():
+    """
+    Record the calls & inclusive time spent per DataMapGenerator stage.
+
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.rows_saved = 0
+
+    def wrap(self, stage, method):
+        """
+        Wrap a DataMapGenerator method w/ a timer.
+
+        Args:
+            stage (str): Stage name.
+
+            method (callable): Method to time.
+
+        Return (callable): Timed method.
+
+        """
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self.lock:
+                    record = self.stages.setdefault(stage, {'calls': 0, 'seconds': 0.0})
+                    record['calls'] += 1
+                    record['seconds'] += elapsed
+                    if stage == 'save_data':
+                        self.rows_saved += len(args[1])
+        return timed
+
+
+def prepare_data(args, workdir):
+    """
+    Generate the synthetic datasets w/in the work directory (reused while the dataset
+    settings remain unchanged).
+
+    Args:
+        args (argparse.Namespace): Benchmark settings.
+
+        workdir (str): Work directory.
+
+    Return (dict): Fake buckets & the prefixes of the synthetic UFS-WM RT datasets.
+
+    """
+    settings = {'n_keys': args.n_keys, 'tar_members': args.tar_members, 'tar_mb': args.tar_mb,
+                'specs_members': args.specs_members, 'seed': args.seed}
+    settings_fn = os.path.join(workdir, 'dataset.json')
+    payload_dir = os.path.join(workdir, 'payloads', LAND_DA_BUCKET)
+    if os.path.exists(settings_fn):
+        with open(settings_fn) as f_handle:
+            if json.load(f_handle) != settings:
+                shutil.rmtree(payload_dir, ignore_errors=True)
+
+    # Land DA TAR-based objects: the v1.2.0 object at full size, the remaining spec objects reduced.
+    with open(os.path.join(REPO_DIR, 'main', 'land_da_map_specs.yaml')) as f_handle:
+        spec_keys = [key for spec in yaml.safe_load(f_handle) for key in spec['keys']]
+    tarballs = {LAND_DA_KEY: ('gz', args.tar_members, args.tar_mb * 1024**2),
+                LAND_DA_PLAIN_KEY: ('', args.tar_members, args.tar_mb * 1024**2)}
+    for key in spec_keys:
+        tarballs.setdefault(key, ('gz', args.specs_members, args.specs_members * 1024))
+    for idx, (key, (compression, n_members, total_bytes)) in enumerate(tarballs.items()):
+        save_fn = os.path.join(payload_dir, key)
+        if not os.path.exists(save_fn):
+            print(f"Generating {key} ({n_members} members, {total_bytes} bytes).")
+            make_land_da_tarball(save_fn, n_members, total_bytes, compression, seed=args.seed + idx)
+    with open(settings_fn, 'w') as f_handle:
+        json.dump(settings, f_handle)
+
+    print(f"Generating {args.n_keys} UFS-WM RT keys.")
+    keys, sizes, develop_prefixes, input_prefixes = make_rt_listing(args.n_keys, seed=args.seed)
+    buckets = {RT_BUCKET: FakeBucket(keys, sizes),
+               LAND_DA_BUCKET: FakeBucket([], [], payload_dir)}
+
+    return {'buckets': buckets, 'develop': develop_prefixes[0], 'input': input_prefixes[0]}
+
+
+def define_scenarios(data, workdir):
+    """
+    Define the benchmark scenarios.
+
+    Args:
+        data (dict): Synthetic datasets (refer to prepare_data()).
+
+        workdir (str): Work directory.
+
+    Return (dict): Scenario names mapped to the main/ script, its arguments & the
+    setup applied before each run (e.g. cold or warm caches), along w/ the failures
+    injected (ranged reads served & failed), the error expected & the run's timeout
+    in seconds, if any.
+
+    """
+    results_dir = os.path.join(workdir, 'results')
+    snapshot_fn = os.path.join(results_dir, f'{RT_BUCKET}_listing_snapshot.parquet')
+    index_cache_dir = os.path.join(results_dir, 'tar_index_cache')
+    rt_args = ['-b', 'rt', '-k_input_data', data['input'], '-k_bl_data', data['develop']]
+    v1p2_args = ['-b', 'land-da', '-k', LAND_DA_KEY]
+
+    def remove(path):
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+    return {
+        # UFS-WM RT maps w/ the bucket listed from scratch, w/ the listing snapshot reused & w/ the
+        # maps held as categoricals.
+        'rt_listing_cold': {'script': 'map_rt_data.py', 'argv': rt_args + ['-r'],
+                            'setup': lambda: remove(snapshot_fn)},
+        'rt_listing_warm': {'script': 'map_rt_data.py', 'argv': rt_args,
+                            'setup': lambda: None, 'warmup': True},
+        'rt_listing_compact': {'script': 'map_rt_data.py', 'argv': rt_args + ['-c'],
+                               'setup': lambda: None, 'warmup': True},
+
+        # Land DA v1.2.0 map w/ an uncompressed (ranged header reads) & compressed (streamed) TAR
+        # (inflate checkpoints are recorded during the stream if indexed_gzip is installed).
+        'land_da_ranged': {'script': 'map_land_da_v1p2_data.py', 'argv': ['-b', 'land-da', '-k', LAND_DA_PLAIN_KEY],
+                           'setup': lambda: remove(index_cache_dir)},
+        'land_da_stream': {'script': 'map_land_da_v1p2_data.py', 'argv': v1p2_args,
+                           'setup': lambda: remove(index_cache_dir)},
+        'land_da_cached': {'script': 'map_land_da_v1p2_data.py', 'argv': v1p2_args,
+                           'setup': lambda: None, 'warmup': True},
+
+        # Land DA v1.2.0 map w/ the first ranged read past the format sniff failing (the failure
+        # must be raised by the pipelined/checkpointed scan rather than stall its stages).
+        'land_da_get_failure': {'script': 'map_land_da_v1p2_data.py', 'argv': v1p2_args,
+                                'setup': lambda: remove(index_cache_dir), 'faults': (1, 1),
+                                'expected_error': 'ConnectionError', 'timeout': 60},
+
+        # All Land DA mapping specs mapped concurrently.
+        'land_da_specs': {'script': 'map_land_da_specs.py',
+                          'argv': ['-s', os.path.join(REPO_DIR, 'main', 'land_da_map_specs.yaml')],
+                          'setup': lambda: remove(index_cache_dir)},
+    }
+
+
+def run_script(scenario, workdir, verbose=False):
+    """
+    Run a main/ script w/in the work directory against the fake S3 client.
+
+    Args:
+        scenario (dict): Scenario's script & arguments.
+
+        workdir (str): Work directory (the script is run from its main folder, so its
+                       results are saved under the work directory's results folder).
+
+        verbose (bool): If set to True, the script's output will be printed.
+
+    Return (StageTimer, float, str): Stage timings, wall time in seconds & error (if any).
+
+    """
+    import data_map_generator
+    dmg = importlib.reload(data_map_generator)
+    timer = StageTimer()
+    for stage in STAGES:
+        if hasattr(dmg.DataMapGenerator, stage):
+            setattr(dmg.DataMapGenerator, stage, timer.wrap(stage, getattr(dmg.DataMapGenerator, stage)))
+
+    cwd, argv = os.getcwd(), sys.argv
+    os.chdir(os.path.join(workdir, 'main'))
+    sys.argv = [scenario['script']] + scenario['argv']
+    out = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    error = None
+    if scenario.get('timeout'):
+        faulthandler.dump_traceback_later(scenario['timeout'], exit=True)
+    start = time.perf_counter()
+    try:
+        with out:
+            runpy.run_path(os.path.join(REPO_DIR, 'main', scenario['script']), run_name='__main__')
+    except Exception as exc:
+        error = f'{type(exc).__name__}: {exc}'
+    finally:
+        wall = time.perf_counter() - start
+        faulthandler.cancel_dump_traceback_later()
+        os.chdir(cwd)
+        sys.argv = argv
+
+    return timer, wall, error
+
+
+def run_scenario(name, scenario, client, workdir, trace_memory=True, verbose=False):
+    """
+    Benchmark a scenario.
+
+    Args:
+        name (str): Scenario's name.
+
+        scenario (dict): Scenario's script, arguments & setup.
+
+        client (FakeS3Client): Fake S3 client.
+
+        workdir (str): Work directory.
+
+        trace_memory (bool): If set to True, the scenario is run a second time w/ the
+                             peak Python memory traced.
+
+        verbose (bool): If set to True, the scripts' output will be printed.
+
+    Return (dict): Scenario's wall time, stage timings, S3 calls & bytes served, rows
+    saved, peak traced memory, error (if any) & error expected (if any).
+
+    """
+    scenario['setup']()
+    if scenario.get('warmup'):
+        run_script(scenario, workdir, verbose)
+    client.reset_counters()
+    client.inject_faults(*scenario.get('faults', (0, 0)))
+    timer, wall, error = run_script(scenario, workdir, verbose)
+    client.inject_faults()
+    result = {'script': scenario['script'],
+              'argv': scenario['argv'],
+              'wall_seconds': round(wall, 4),
+              'stages': {stage: {'calls': record['calls'], 'seconds': round(record['seconds'], 4)}
+                         for stage, record in timer.stages.items()},
+              's3_calls': dict(client.calls),
+              's3_bytes': client.bytes,
+              'rows_saved': timer.rows_saved,
+              'error': error,
+              'expected_error': scenario.get('expected_error')}
+
+    if trace_memory and error is None and 'faults' not in scenario:
+        scenario['setup']()
+        if scenario.get('warmup'):
+            run_script(scenario, workdir, verbose)
+        tracemalloc.start()
+        run_script(scenario, workdir, verbose)
+        result['peak_traced_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    print(f"{name}: {result['wall_seconds']:.3f} s, {result['s3_bytes']} bytes served, "
+          f"{result.get('peak_traced_bytes', 0) / 1024**2:.1f} MB peak" + (f", {error}" if error else ""))
+    return result
+
+
+def compare_results(results, baseline_fn, tolerance):
+    """
+    Compare the scenarios' wall time & peak memory against a previous run's results.
+
+    Args:
+        results (dict): Current results.
+
+        baseline_fn (str): Filename of the previous run's results.
+
+        tolerance (float): Allowed relative increase (e.g. 0.25 = 25%).
+
+    Return (list): Regressions found (scenario, metric, baseline value & current value).
+
+    """
+    with open(baseline_fn) as f_handle:
+        baseline = json.load(f_handle)['scenarios']
+    regressions = []
+    for name, result in results['scenarios'].items():
+        if name not in baseline:
+            continue
+        for metric in ['wall_seconds', 'peak_traced_bytes', 's3_bytes']:
+            prev, curr = baseline[name].get(metric), result.get(metric)
+            if prev and curr and curr > prev * (1 + tolerance):
+                regressions.append((name, metric, prev, curr))
+    return regressions
+
+
+def environment_details():
+    """
+    Collect the interpreter, package & commit details the results were generated with.
+
+    Return (dict): Environment details.
+
+    """
+    try:
+        commit = subprocess.run(['git', '-C', REPO_DIR, 'rev-parse', 'HEAD'],
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+if __name__ == '__main__':
+
+    # User inputs
+    argParser = argparse.ArgumentParser()
+    argParser.add_argument("-s", "--scenarios", nargs="*", help="Scenarios to run (all if not set). Type: String. Ex: 'land_da_ranged' ")
+    argParser.add_argument("-n_keys", "--n_keys", type=int, default=1000000, help="Number of keys in the synthetic UFS-WM RT bucket. Type: Integer. Ex: 1000000 ")
+    argParser.add_argument("-tar_members", "--tar_members", type=int, default=10000, help="Number of members in the synthetic Land DA v1.2.0 TAR. Type: Integer. Ex: 10000 ")
+    argParser.add_argument("-tar_mb", "--tar_mb", type=int, default=64, help="Payload size (MB) of the synthetic Land DA v1.2.0 TAR. Type: Integer. Ex: 64 ")
+    argParser.add_argument("-specs_members", "--specs_members", type=int, default=1000, help="Number of members in each of the remaining Land DA spec TARs. Type: Integer. Ex: 1000 ")
+    argParser.add_argument("-latency_ms", "--latency_ms", type=float, default=0, help="Latency (ms) added to each S3 request. Type: Float. Ex: 20 ")
+    argParser.add_argument("-bandwidth_mbps", "--bandwidth_mbps", type=float, default=0, help="S3 bandwidth (MB/s), unlimited if 0. Type: Float. Ex: 100 ")
+    argParser.add_argument("-seed", "--seed", type=int, default=0, help="Random seed of the synthetic datasets. Type: Integer. Ex: 0 ")
+    argParser.add_argument("-w", "--workdir", help="Work directory of the synthetic datasets & results (temporary if not set). Type: String. ")
+    argParser.add_argument("-o", "--output", help="Results filename (JSON). Type: String. Ex: '../results/benchmarks/benchmark.json' ")
+    argParser.add_argument("-c", "--compare", help="Previous results (JSON) to check for regressions. Type: String. ")
+    argParser.add_argument("-t", "--tolerance", type=float, default=0.25, help="Allowed relative increase before flagging a regression. Type: Float. Ex: 0.25 ")
+    argParser.add_argument("--skip_memory", action="store_true", help="Skip the peak memory tracing pass.")
+    argParser.add_argument("-v", "--verbose", action="store_true", help="Print the scripts' output.")
+    args = argParser.parse_args()
+
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix='land_da_bench_')
+    output_fn = os.path.abspath(args.output or os.path.join(REPO_DIR, 'results', 'benchmarks',
+                                                            f'benchmark_{time.strftime("%Y%m%d_%H%M%S")}.json'))
+    for folder in [os.path.join(workdir, 'main'), os.path.join(workdir, 'results'), os.path.dirname(output_fn)]:
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+    # Serve the synthetic datasets through the fake S3 client.
+    data = prepare_data(args, workdir)
+    client = FakeS3Client(data['buckets'],
+                          latency=args.latency_ms / 1000,
+                          bandwidth=args.bandwidth_mbps * 1024**2 or None)
+    boto3.client = lambda *client_args, **client_kwargs: client
+
+    scenarios = define_scenarios(data, workdir)
+    names = args.scenarios or list(scenarios)
+    results = {'environment': environment_details(), 'settings': vars(args), 'scenarios': {}}
+    for name in names:
+        results['scenarios'][name] = run_scenario(name, scenarios[name], client, workdir,
+                                                  trace_memory=not args.skip_memory,
+                                                  verbose=args.verbose)
+
+    with open(output_fn, 'w') as f_handle:
+        json.dump(results, f_handle, indent=2)
+    print(f"Benchmark results saved to {output_fn}.")
+
+    # Flag regressions against the previous run's results.
+    # Scenarios injecting failures fail unless the expected error is raised.
+    failed = any((result['error'] or '').split(':')[0] != (result['expected_error'] or '')
+                 for result in results['scenarios'].values())
+    if args.compare:
+        regressions = compare_results(results, args.compare, args.tolerance)
+        for name, metric, prev, curr in regressions:
+            print(f"Regression: {name} {metric} {prev} -> {curr}")
+        failed = failed or bool(regressions)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,104 @@
+import os
+import io
+import random
+import tarfile
+
+'''
+Synthetic datasets shaped like the UFS-WM RT bucket (noaa-ufs-regtests-pds) & the Land DA
+TAR-based objects (noaa-ufs-land-da-pds), generated for the offline benchmarks.
+
+'''
+
+# Folder/file name vocabulary of the UFS-WM RT baseline datasets (develop-YYYYMMDD).
+RT_TESTS = ['control_p8', 'control_c48', 'control_c192', 'control_c384', 'cpld_control_p8',
+            'cpld_control_c96_noaero_p8', 'cpld_restart_p8', 'regional_control', 'datm_cdeps_control_cfsr',
+            'hafs_regional_atm', 'control_p8_atmlnd_sbs', 'rap_control', 'hrrr_control', 'ufs_lnd_da']
+RT_COMPILERS = ['intel', 'gnu']
+RT_BL_DIRS = ['', 'RESTART/', 'INPUT/', 'history/']
+RT_BL_FILES = ['atmf{:03d}.nc', 'sfcf{:03d}.nc', 'GFSFLX.GrbF{:02d}', 'ufs.cpld.cpl.r.2021-03-23-{:05d}.nc',
+               '20210323.060000.fv_core.res.tile{}.nc', 'ufs.hafs.cpl.hi.2019-08-29-{:05d}.nc']
+
+# Folder/file name vocabulary of the UFS-WM RT input datasets (input-data-YYYYMMDD).
+RT_INPUT_DIRS = ['FV3_fix_tiled/C96/', 'FV3_fix_tiled/C384/', 'FV3_input_data/INPUT/', 'FV3_input_data48/INPUT/',
+                 'CPL_FIX/aC96o100/', 'CPL_FIX/aC384o025/', 'MOM6_FIX/100/', 'MOM6_FIX/025/', 'CICE_IC/100/',
+                 'FV3_input_frac/C96.mx100_frac/', 'LM4_input_data/gswp3/2019-12/forcing/C96/tile1/v2/ens01/',
+                 'DATM_CDEPS/gefs/2020/12/forcing/C96/mx100/v1/']
+RT_INPUT_FILES = ['oro_C96.mx100.tile{}.nc', 'C96_grid.tile{}.nc', 'gfs_data.tile{}.nc', 'grid_spec_{}.nc',
+                  'ocean_hgrid_{}.nc', 'cice_model_0.25.res_{}.nc', 'sfc_data.tile{}.nc', 'global_soilmgldas.t{}.nc']
+
+# Folder/file name vocabulary of the Land DA TAR-based objects.
+LAND_DA_DIRS = ['C96', 'C48', 'mx100', 'inputs', 'forcing', '2016', '2019-12', 'gswp3', 'develop-20240501',
+                'input-data-20221101', 'NOAA', 'DATA_v1', 'FV3_fix_tiled', 'snow_obs', 'ghcn', 'IMS']
+LAND_DA_FILES = ['C96_grid.tile{}.nc', 'C96_oro_data.tile{}.nc', 'ufs.cpld.mx100.{}.nc', 'ghcn_snwd_ioda_{}.nc',
+                 'ims{}_4km_v1.3.nc', 'sfc_data.tile{}.nc', 'input{}.nml', 'restart_{}.txt']
+
+
+def make_rt_listing(n_keys, n_develop=20, n_input=5, seed=0):
+    """
+    Generate the keys & sizes of a bucket shaped like the UFS-WM RT bucket.
+
+    Args:
+        n_keys (int): Total number of keys.
+
+        n_develop (int): Number of baseline datasets (develop-YYYYMMDD prefixes).
+
+        n_input (int): Number of input datasets (input-data-YYYYMMDD prefixes).
+
+        seed (int): Random seed.
+
+    Return (list, list, list, list): Keys, object sizes, baseline dataset prefixes &
+    input dataset prefixes.
+
+    """
+    rng = random.Random(seed)
+    develop_prefixes = [f'develop-2023{1 + i // 28:02d}{1 + i % 28:02d}' for i in range(n_develop)]
+    input_prefixes = [f'input-data-2022{1 + i // 28:02d}{1 + i % 28:02d}' for i in range(n_input)]
+    prefixes = develop_prefixes + input_prefixes
+
+    keys = []
+    for idx in range(n_keys):
+        prefix = prefixes[idx % len(prefixes)]
+        if prefix.startswith('develop'):
+            folder = f'{rng.choice(RT_TESTS)}_{rng.choice(RT_COMPILERS)}/{rng.choice(RT_BL_DIRS)}'
+            fn = rng.choice(RT_BL_FILES).format(idx % 48)
+        else:
+            folder = rng.choice(RT_INPUT_DIRS)
+            fn = rng.choice(RT_INPUT_FILES).format(idx % 6 + 1)
+        keys.append(f'{prefix}/{folder}{idx:08d}_{fn}')
+    sizes = [rng.randint(0, 2 * 1024**3) for _ in range(n_keys)]
+
+    return keys, sizes, develop_prefixes, input_prefixes
+
+
+def make_land_da_tarball(save_fn, n_members, total_bytes, compression='gz', seed=0):
+    """
+    Generate a TAR-based object shaped like a Land DA dataset (nested folders of
+    resolution, year & forcing named directories).
+
+    Args:
+        save_fn (str): Filename of the generated TAR.
+
+        n_members (int): Number of file members.
+
+        total_bytes (int): Total size of the members' payloads (split evenly).
+
+        compression (str): Compression of the TAR.
+                           Options: '' (uncompressed), 'gz', 'bz2', 'xz'
+
+        seed (int): Random seed.
+
+    """
+    rng = random.Random(seed)
+    member_size = total_bytes // max(n_members, 1)
+    if not os.path.exists(os.path.dirname(save_fn)):
+        os.makedirs(os.path.dirname(save_fn))
+
+    with tarfile.open(save_fn, mode=f'w:{compression}' if compression else 'w') as tarf:
+        for idx in range(n_members):
+
+            # Land DA TAR-based objects' members reside 11-12 folder levels deep.
+            folders = '/'.join(rng.choice(LAND_DA_DIRS) for _ in range(rng.randint(11, 12)))
+            name = f'./{folders}/{idx:07d}_' + rng.choice(LAND_DA_FILES).format(idx % 6 + 1)
+            tarinfo = tarfile.TarInfo(name)
+            tarinfo.size = member_size
+            tarf.addfile(tarinfo, io.BytesIO(rng.randbytes(member_size)))
@@ -0,0 +1,73 @@
+import sys
+sys.path.append( '../modules' )
+from data_map_generator import *
+from profiler import Profiler
+import argparse
+
+'''
+The development tool will extract only the members of a Land DA TAR-based cloud object required by a given
+Land DA test case, rather than downloading the entire TAR-based object.
+
+The members to extract can be selected via a data map generated by the mapping tools (or a query filtering
+the data map's rows) and/or via the members' directories within the TAR-based object. Members of uncompressed
+TAR-based objects are read via ranged requests spanning their payloads & members of .tar.gz objects are
+inflated from their nearest inflate checkpoint, so only the bytes of the selected members are requested.
+
+Users must input the S3 bucket, the TAR-based object's key & the data map and/or member directories to extract.
+
+Example:
+python extract_tar_members.py -b land-da -k current_land_da_release_data/v1.2.0/Landdav1.2.0_input_data.tar.gz -map ../results/current_land_da_release_data/v1.2.0/Landdav1.2.0_input_data.tar.gz_land-da_data_map.csv -q "`Resolution (C)` == 96"
+python extract_tar_members.py -b land-da -k current_land_da_release_data/v1.2.0/Landdav1.2.0_input_data.tar.gz -n inputs/NOAHMP_IC/ufs-land_C96_init_fields.tile1.nc
+python extract_tar_members.py -b land-da -k current_land_da_release_data/v1.2.0/Landdav1.2.0_input_data.tar.gz -map ../results/land_da_specs_land-da_data_map.csv -o ../results/test_case_data
+python extract_tar_members.py -b land-da -k current_land_da_release_data/v1.2.0/Landdav1.2.0_input_data.tar.gz -n inputs/NOAHMP_IC/ufs-land_C96_init_fields.tile1.nc -prof ../results/extract_profile.json
+
+'''
+
+# User inputs
+argParser = argparse.ArgumentParser()
+argParser.add_argument("-b", "--bucket", help="Object's bucket label. Type: String. Options: 'land-da' ")
+argParser.add_argument("-k", "--key", help="TAR-based object's key. Type: String. Ex: 'current_land_da_release_data/v1.2.0/Landdav1.2.0_input_data.tar.gz' ")
+argParser.add_argument("-map", "--map_fn", help="Data map (csv, parquet or feather) of the members to extract. Type: String. Ex: '../results/land_da_specs_land-da_data_map.csv' ")
+argParser.add_argument("-q", "--query", help="Query filtering the data map's rows (refer to pandas.DataFrame.query). Type: String. Ex: '`Resolution (C)` == 96' ")
+argParser.add_argument("-n", "--names", nargs="*", help="Members' directories w/in the TAR-based object. Type: String. Ex: 'inputs/NOAHMP_IC/ufs-land_C96_init_fields.tile1.nc' ")
+argParser.add_argument("-o", "--save_dir", help="Folder directory the members are saved to (../results/extracted/[object's filename] if not set). Type: String. Ex: '../results/test_case_data' ")
+argParser.add_argument("-w", "--max_workers", type=int, default=8, help="Number of concurrent requests. Type: Integer. Ex: 8 ")
+argParser.add_argument("-m", "--max_inflight_mb", type=int, default=256, help="Maximum MB requested from cloud storage at the same time. Type: Integer. Ex: 256 ")
+argParser.add_argument("-be", "--backend", default="s3", help="Storage backend serving the bucket. Type: String. Options: 's3', 'http', 'local' ")
+argParser.add_argument("-mirror", "--mirror_dir", help="Root folder of the bucket's mirror on local disk (if backend is 'local'). Type: String. Ex: '/scratch/noaa-ufs-land-da-pds' ")
+argParser.add_argument("-prof", "--profile_fn", help="Save a profiling report (wall time, rows & memory peak per stage, requests & bytes per S3 operation) as JSON. Type: String. Ex: '../results/profile.json' ")
+argParser.add_argument("-progress", "--progress_interval", type=float, help="Seconds between progress line updates (if profiling). Type: Float. Ex: 5 ")
+argParser.add_argument("-tm", "--trace_memory", action="store_true", help="Trace the peak of memory allocated per stage (if profiling).")
+args = argParser.parse_args()
+
+if not args.map_fn and not args.names:
+    argParser.error("a data map (-map) and/or member directories (-n) are required.")
+
+# Record the stages & storage requests (opt-in).
+profiler = Profiler(trace_memory=args.trace_memory, progress_interval=args.progress_interval) if args.profile_fn else None
+if profiler is not None:
+    profiler.start()
+
+# Read S3 cloud storage reserved for Land DA app's dataset
+wrapper = DataMapGenerator(use_bucket=args.bucket, backend=args.backend, mirror_dir=args.mirror_dir, profiler=profiler)
+
+# Read data map of the members to extract (csv, Parquet or Feather).
+data_map = None
+if args.map_fn:
+    data_map = wrapper.load_data(args.map_fn)
+    if args.query:
+        data_map = data_map.query(args.query)
+
+# Extract the selected members from the TAR-based object.
+members = wrapper.extract_s3_tar_members(args.key,
+                                         data_map=data_map,
+                                         names=args.names,
+                                         save_dir=args.save_dir,
+                                         max_workers=args.max_workers,
+                                         max_inflight_bytes=args.max_inflight_mb * 1024**2)
+
+# Save profiling report.
+if profiler is not None:
+    profiler.stop()
+    print(profiler.stage_table())
+    profiler.save(args.profile_fn)
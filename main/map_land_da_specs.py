@@ -0,0 +1,96 @@
+import sys
+import os
+sys.path.append( '../modules' )
+from data_map_generator import *
+from profiler import Profiler
+import yaml
+import argparse
+
+'''
+The development tool will translate the Land DA's TAR-based cloud objects' details into data maps as declared
+within a mapping spec file (e.g. land_da_map_specs.yaml), featuring one entry per Land DA dataset version.
+Each entry declares the TAR-based objects' keys, the feature names of each folder level, the attributes to
+extract, the redundant columns to filter out, the order of the data map's columns & (optionally) the
+digests of the data files' payloads & whether to introspect the NetCDF data files' headers.
+
+All of the requested specs are executed within a single process, so the cloud client, the bucket listing
+snapshot & the parsed path attributes are shared across the data maps. The TAR-based objects are mapped
+concurrently w/ a cap on the number of bytes requested from cloud storage at the same time.
+
+Users must input the mapping spec file & (optionally) the names of the specs to execute.
+
+Example:
+python map_land_da_specs.py -s land_da_map_specs.yaml
+python map_land_da_specs.py -s land_da_map_specs.yaml -n v1p2 v1p1
+python map_land_da_specs.py -s land_da_map_specs.yaml -w 8 -m 512
+python map_land_da_specs.py -s land_da_map_specs.yaml -fmt parquet
+python map_land_da_specs.py -s land_da_map_specs.yaml -c
+python map_land_da_specs.py -s land_da_map_specs.yaml -d crc32 sha256
+python map_land_da_specs.py -s land_da_map_specs.yaml -nc
+python map_land_da_specs.py -s land_da_map_specs.yaml -prof ../results/profile.json -progress 5 -tm
+python map_land_da_specs.py -s land_da_map_specs.yaml -be local -mirror /scratch/noaa-ufs-land-da-pds
+
+'''
+
+# User inputs
+argParser = argparse.ArgumentParser()
+argParser.add_argument("-s", "--spec_fn", default="land_da_map_specs.yaml", help="Mapping spec file. Type: String. Ex: 'land_da_map_specs.yaml' ")
+argParser.add_argument("-n", "--names", nargs="*", help="Names of the specs to execute (all specs if not set). Type: String. Ex: 'v1p2' ")
+argParser.add_argument("-w", "--max_workers", type=int, default=4, help="Number of TAR-based objects mapped concurrently. Type: Integer. Ex: 4 ")
+argParser.add_argument("-m", "--max_inflight_mb", type=int, default=256, help="Maximum MB requested from cloud storage at the same time. Type: Integer. Ex: 256 ")
+argParser.add_argument("-be", "--backend", default="s3", help="Storage backend serving the bucket. Type: String. Options: 's3', 'http', 'local' ")
+argParser.add_argument("-mirror", "--mirror_dir", help="Root folder of the bucket's mirror on local disk (if backend is 'local'). Type: String. Ex: '/scratch/noaa-ufs-regtests-pds' ")
+argParser.add_argument("-fmt", "--file_format", default="csv", help="File format of the saved data maps. Type: String. Options: 'csv', 'xlsx', 'parquet', 'feather' ")
+argParser.add_argument("-c", "--compact", action="store_true", help="Hold the data maps' text columns as categoricals in memory & report the combined data map's memory usage.")
+argParser.add_argument("-d", "--digests", nargs="*", default=[], help="Digests of each data file's payload computed w/in the same pass as the TAR headers & added as data map columns (unless set per spec). Type: String. Options: 'crc32', 'sha256' ")
+argParser.add_argument("-nc", "--introspect", action="store_true", help="Add the file format, dimensions & variable names read from each NetCDF member's header as data map columns (unless set per spec).")
+argParser.add_argument("-prof", "--profile_fn", help="Save a profiling report (wall time, rows & memory peak per stage, requests & bytes per S3 operation) as JSON. Type: String. Ex: '../results/profile.json' ")
+argParser.add_argument("-progress", "--progress_interval", type=float, help="Seconds between progress line updates (if profiling). Type: Float. Ex: 5 ")
+argParser.add_argument("-tm", "--trace_memory", action="store_true", help="Trace the peak of memory allocated per stage (if profiling).")
+args = argParser.parse_args()
+
+# Read mapping specs
+with open(args.spec_fn) as f_handle:
+    specs = yaml.safe_load(f_handle)
+if args.names:
+    specs = [spec for spec in specs if spec['name'] in args.names]
+
+# Group the TAR-based objects' mapping specs per bucket.
+bucket_specs = {}
+for spec in specs:
+    for key in spec['keys']:
+        bucket_specs.setdefault(spec['bucket'], {})[key] = dict(feats_dict=spec['feats_dict'],
+                                                                attributes=spec.get('attributes', {}),
+                                                                drop_cols=spec.get('drop', []),
+                                                                col_order=spec.get('order', []),
+                                                                digests=spec.get('digests', args.digests),
+                                                                introspect=spec.get('introspect', args.introspect))
+
+# Record the stages & storage requests (opt-in).
+profiler = Profiler(trace_memory=args.trace_memory, progress_interval=args.progress_interval) if args.profile_fn else None
+if profiler is not None:
+    profiler.start()
+
+# Read S3 cloud storage reserved for each bucket once & generate the data maps of all TAR-based objects concurrently.
+for bucket, tar_object_specs in bucket_specs.items():
+    wrapper = DataMapGenerator(use_bucket=bucket, backend=args.backend, mirror_dir=args.mirror_dir, profiler=profiler)
+    data_maps, combined_df = wrapper.map_tar_objects(tar_object_specs,
+                                                     max_workers=args.max_workers,
+                                                     max_inflight_bytes=args.max_inflight_mb * 1024**2,
+                                                     compact=args.compact)
+    if args.compact:
+        print(wrapper.memory_report(combined_df))
+
+    # Save data details.
+    for key, df in data_maps.items():
+        save_fn = f'../results/{key}_{bucket}_data_map.{args.file_format}'
+        if not os.path.exists(os.path.dirname(save_fn)):
+            os.makedirs(os.path.dirname(save_fn))
+        wrapper.save_data(df, save_fn)
+    wrapper.save_data(combined_df, f'../results/land_da_specs_{bucket}_data_map.{args.file_format}')
+
+# Save profiling report.
+if profiler is not None:
+    profiler.stop()
+    print(profiler.stage_table())
+    profiler.save(args.profile_fn)
@@ -26,9 +26,6 @@ args = argParser.parse_args()
 # Read S3 cloud storage reserved for Land DA app's dataset
 wrapper = DataMapGenerator(use_bucket=args.bucket)
 
-# Generate list of keys from S3 cloud storage
-key_list = wrapper.get_all_s3_keys()
-
 # Read required Land DA's TAR-based object's details from cloud storage & save data details.
 dir_list, sz_list = wrapper.read_s3_object_dirs(tar_object_fn=args.key)
 
@@ -1,6 +1,7 @@
 import sys
 sys.path.append( '../modules' )
 from data_map_generator import *
+from profiler import Profiler
 import pandas as pd
 import argparse
 
@@ -15,6 +16,12 @@ required for the current Land DA app's test case into data maps.
 
 Example:
 python map_rt_data.py -b rt -k_input_data input-data-20221101 -k_bl_data develop-20231122
+python map_rt_data.py -b rt -k_input_data input-data-20221101 -k_bl_data develop-20231122 -fmt parquet
+python map_rt_data.py -b rt -k_input_data input-data-20221101 -k_bl_data develop-20231122 -c
+python map_rt_data.py -b rt -k_input_data input-data-20221101 -k_bl_data develop-20231122 -rl develop-20231122 -ttl 6
+python map_rt_data.py -b rt -k_input_data input-data-20221101 -k_bl_data develop-20231122 -nc
+python map_rt_data.py -b rt -k_input_data input-data-20221101 -k_bl_data develop-20231122 -prof ../results/profile.json -progress 5
+python map_rt_data.py -b rt -k_input_data input-data-20221101 -k_bl_data develop-20231122 -be local -mirror /scratch/noaa-ufs-regtests-pds
 
 '''
 
@@ -23,41 +30,65 @@ argParser = argparse.ArgumentParser()
 argParser.add_argument("-b", "--bucket", help="Object's bucket label. Type: String. Options: 'rt' ")
 argParser.add_argument("-k_input_data", "--input_data_key", help="Input Data Object's key. Type: String. Ex: 'f'input-data-20221101' ")
 argParser.add_argument("-k_bl_data", "--bl_data_key", help="Baseline Data Object's key. Type: String. Ex: 'f'develop-20231122' ")
+argParser.add_argument("-r", "--refresh_listing", action="store_true", help="Refresh the bucket's listing snapshot saved under ../results prior to mapping.")
+argParser.add_argument("-rl", "--relist_prefixes", nargs="*", default=[], help="Top-level prefixes re-listed into the bucket's listing snapshot prior to mapping (e.g. datasets updated in place). Type: String. Ex: 'develop-20231122' ")
+argParser.add_argument("-ttl", "--snapshot_ttl", type=float, default=24, help="Hours after which a top-level prefix's listing w/in the snapshot is re-listed (never if 0). Type: Float. Ex: 24 ")
+argParser.add_argument("-be", "--backend", default="s3", help="Storage backend serving the bucket. Type: String. Options: 's3', 'http', 'local' ")
+argParser.add_argument("-mirror", "--mirror_dir", help="Root folder of the bucket's mirror on local disk (if backend is 'local'). Type: String. Ex: '/scratch/noaa-ufs-regtests-pds' ")
+argParser.add_argument("-fmt", "--file_format", default="csv", help="File format of the saved data maps. Type: String. Options: 'csv', 'xlsx', 'parquet', 'feather' ")
+argParser.add_argument("-c", "--compact", action="store_true", help="Hold the data maps' text columns as categoricals in memory & report the data maps' memory usage.")
+argParser.add_argument("-nc", "--introspect", action="store_true", help="Add the file format, dimensions & variable names read from each NetCDF data file's header (via ranged reads) as data map columns.")
+argParser.add_argument("-prof", "--profile_fn", help="Save a profiling report (wall time, rows & memory peak per stage, requests & bytes per S3 operation) as JSON. Type: String. Ex: '../results/profile.json' ")
+argParser.add_argument("-progress", "--progress_interval", type=float, help="Seconds between progress line updates (if profiling). Type: Float. Ex: 5 ")
+argParser.add_argument("-tm", "--trace_memory", action="store_true", help="Trace the peak of memory allocated per stage (if profiling).")
 args = argParser.parse_args()
 
+# Record the stages & storage requests (opt-in).
+profiler = Profiler(trace_memory=args.trace_memory, progress_interval=args.progress_interval) if args.profile_fn else None
+if profiler is not None:
+    profiler.start()
+
 # Read S3 cloud storage reserved for UFS-WM RT datasets
 # Note: A subset of the UFS-WM RT's data is used for the current Land DA release's test case.
-wrapper = DataMapGenerator(use_bucket=args.bucket)
+wrapper = DataMapGenerator(use_bucket=args.bucket, 
+                           snapshot_ttl=args.snapshot_ttl * 3600 or None, 
+                           backend=args.backend, 
+                           mirror_dir=args.mirror_dir, 
+                           profiler=profiler)
 
-# Generate list of keys from S3 cloud storage
-key_list = wrapper.get_all_s3_keys()
+# Re-list the new, stale & requested top-level prefixes (e.g. new develop-YYYYMMDD datasets) into the bucket's listing snapshot.
+if args.refresh_listing or args.relist_prefixes:
+    wrapper.refresh_listing_snapshot(relist_prefixes=args.relist_prefixes)
 
 # Generate & save data map for the UFS-WM RT input datasets of interest. 
 # Note: Data map for the UFS-WM RT input datasets' details will be saved to a csv file, but
 # map can be save in a different format should futher development be required.
-df_input = wrapper.extract_object_details(key_list, 
+# Note: Only the keys residing under the input dataset's prefix are listed from S3 cloud storage.
+df_input = wrapper.extract_object_details([], 
                                           feats_dict={0: 'Dataset',
                                                       1: 'UFS Component',
                                                       2: 'Sub-Category',
                                                       4: 'Category'}, 
-                                          filter2prefix=args.input_data_key
+                                          filter2prefix=args.input_data_key,
+                                          compact=args.compact,
+                                          introspect=args.introspect
                                          )
 
+# Hold the NetCDF header details (if introspected) apart while the features are re-arranged.
+nc_input = df_input[[col for col in NC_HEADER_COLUMNS if col in df_input.columns]]
+df_input = df_input.drop(nc_input.columns, axis=1)
+
 # = Additional Preprocessing Is Required for Generating Data Map Made Against Current UFS-WM RT's Input Data Structure Set For Land DA v1.2.0. =
 
-# C resolution extracted
+# C resolution, ocean resolution (o, mx, & (w/out symbol declared) & data version extracted w/in a single pass.
 # Currently, the "C" resolutions are featured within multiple foldernames
 # across the keys/directories of the UFS-WM RT input datasets. The reason is
 # the due to the current way the data has been structured for the UFS-WM RT framework.
-df_input = wrapper.extract_cres(df_input, 'Sub-Category', 'UFS Component', 'Data File')
-
-# Ocean resolution (o, mx, & (w/out symbol declared) extracted
-df_input = wrapper.extract_o_res(df_input, 'Sub-Category')
-df_input = wrapper.extract_mx_res(df_input, 'Sub-Category', 'Data File')
-df_input = wrapper.extract_nosym_res(df_input, 'Sub-Category')
-
-# Data version extracted
-df_input = wrapper.extract_version(df_input, 5, 6)
+df_input = wrapper.extract_attributes(df_input, {'cres': ['Sub-Category', 'UFS Component', 'Data File'],
+                                                 'o_res': ['Sub-Category'],
+                                                 'mx_res': ['Sub-Category', 'Data File'],
+                                                 'nosym_res': ['Sub-Category'],
+                                                 'version': [5, 6]})
 
 # Filter out redundant column details
 df_input = df_input.drop([3], axis=1)
@@ -72,27 +103,31 @@ df_input.insert(2, "Resolution (C)", df_input.pop("Resolution (C)"))
 df_input.insert(3, "Ocean Resolution (o)", df_input.pop("Ocean Resolution (o)"))
 df_input.insert(4, "Ocean Resolution (mx)", df_input.pop("Ocean Resolution (mx)"))
 df_input.insert(5, "Ocean Resolution (w/o symbol)", df_input.pop("Ocean Resolution (w/o symbol)"))
-df_input.insert(6, "Data Format", df_input.pop("Data Format"))
+df_input.insert(6, "File Extension", df_input.pop("File Extension"))
 df_input.insert(7, "File Size (Bytes)", df_input.pop("File Size (Bytes)"))
 df_input.insert(8, "Category", df_input.pop("Category"))
 df_input.insert(9, "Sub-Category", df_input.pop("Sub-Category"))
 df_input.insert(10, "Dataset", df_input.pop("Dataset"))
+df_input = pd.concat([df_input, nc_input], axis=1)
 
 # Generate & save data map for the UFS-WM RT baseline datasets of interest. 
 # Note: Data map for the UFS-WM RT baseline datasets' details will be saved to a csv file, but
 # map can be save in a different format should futher development be required.
-df_bl = wrapper.extract_object_details(key_list,
+# Note: Only the keys residing under the baseline dataset's prefix are listed from S3 cloud storage.
+df_bl = wrapper.extract_object_details([],
                                        feats_dict={0: 'Dataset',
                                                    2: "Category"},
-                                       filter2prefix=args.bl_data_key
+                                       filter2prefix=args.bl_data_key,
+                                       compact=args.compact,
+                                       introspect=args.introspect
                                       )
+nc_bl = df_bl[[col for col in NC_HEADER_COLUMNS if col in df_bl.columns]]
+df_bl = df_bl.drop(nc_bl.columns, axis=1)
 # = Additional Preprocessing Is Required for Generating Data Map Made Against Current UFS-WM RT's Baseline Data Structure Set For Land DA v1.2.0. =
 
-# Associated regression test names extracted
-df_bl = wrapper.extract_test_name(df_bl, 1)
-
-# Associated compiler names extracted
-df_bl = wrapper.extract_compiler(df_bl, 1)
+# Associated regression test & compiler names extracted w/in a single pass.
+df_bl = wrapper.extract_attributes(df_bl, {'test_name': [1],
+                                           'compiler': [1]})
 
 # Filter out redundant column details
 df_bl = df_bl.drop([1], axis=1)
@@ -103,9 +138,23 @@ df_bl.insert(1, "Test Name", df_bl.pop("Test Name"))
 df_bl.insert(2, "Compiler", df_bl.pop("Compiler"))
 df_bl.insert(len(df_bl.columns)-2, "File Size (Bytes)", df_bl.pop("File Size (Bytes)"))
 df_bl.insert(len(df_bl.columns)-1, "Dataset", df_bl.pop("Dataset"))
+df_bl = pd.concat([df_bl, nc_bl], axis=1)
+
+# Dictionary-encode the extracted attributes & report the data maps' memory usage.
+if args.compact:
+    df_input = wrapper.compact_map(df_input)
+    df_bl = wrapper.compact_map(df_bl)
+    print(wrapper.memory_report(df_input))
+    print(wrapper.memory_report(df_bl))
 
 # Save data details
 wrapper.save_data(df_input, 
-                  f'../results/{args.bucket}_{args.input_data_key}_data_map.csv')
+                  f'../results/{args.bucket}_{args.input_data_key}_data_map.{args.file_format}')
 wrapper.save_data(df_bl,
-                  f'../results/{args.bucket}_{args.bl_data_key}_data_map.csv')
+                  f'../results/{args.bucket}_{args.bl_data_key}_data_map.{args.file_format}')
+
+# Save profiling report.
+if profiler is not None:
+    profiler.stop()
+    print(profiler.stage_table())
+    profiler.save(args.profile_fn)
@@ -1,10 +1,7 @@
 import io
 import tarfile
 import sys
-import boto3
 from boto3.s3.transfer import TransferConfig
-from botocore import UNSIGNED
-from botocore.client import Config
 import pandas as pd
 from pandas import ExcelWriter
 import numpy as np
@@ -14,14 +11,612 @@ import csv
 import re
 import os
 import warnings
+import hashlib
+import queue
+import shutil
+import tempfile
+import threading
+import contextvars
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from storage_backends import REQUEST_ERRORS, S3Backend, HTTPBackend, LocalBackend
+from profiler import profiled
+from netcdf_header import read_netcdf_header
+from tar_scanner import BLOCKSIZE, TAR_INDEX_COLUMNS, RangeReader, RangeFile, StreamInflater, ChunkReader, MemberHasher, COMPRESSION_MAGICS, is_tar_header, walk_tar_headers, scan_tar_mmap, scan_local_tar
+
+# Optional: zran-style random access into gzip-compressed objects.
+try:
+    import indexed_gzip
+except ImportError:
+    indexed_gzip = None
+
+# Errors raised by the Parquet engine on corrupt files (pyarrow's, if installed).
+try:
+    from pyarrow import ArrowException
+except ImportError:
+    ArrowException = ValueError
 warnings.filterwarnings("ignore")
 
+# Patterns searched within each path token (first match per token), w/ a single
+# named group capturing the attribute's value.
+TOKEN_PATTERNS = {
+    'cres': r'C(?P<cres>\d{2,4})',
+    'cres_data': r'data(?P<cres_data>\d{2,4})',
+    'first_res': r'C(?P<first_res>\d{2,3})',
+    'mx_res': r'mx(?P<mx_res>\d{2,3})',
+    'o_res': r'o(?P<o_res>\d{2,3})',
+    'develop': r'(?P<develop>develop-\d{8})',
+    'input_data': r'(?P<input_data>input-data-\d{8})',
+    'yyyy_mm': r'(?P<yyyy_mm>[0-9]{4}-[0-9]{2})',
+    'yyyy': r'(?P<yyyy>[0-9]{4})',
+    'test_name': r'(?P<test_name>.*)_',
+    'compiler': r'.*?_(?P<compiler>[^_]*)\Z',
+}
+
+# Attributes' output column & token patterns (in priority order).
+# Ocean resolutions w/o a symbol are checked against the whole token instead of a pattern.
+ATTRIBUTE_SPECS = {
+    'cres': ('Resolution (C)', ['cres', 'cres_data']),
+    'first_res': ('Resolution (C)', ['first_res']),
+    'mx_res': ('Ocean Resolution (mx)', ['mx_res']),
+    'o_res': ('Ocean Resolution (o)', ['o_res']),
+    'nosym_res': ('Ocean Resolution (w/o symbol)', ['nosym_res']),
+    'dataset_type': ('Dataset Type', ['develop', 'input_data']),
+    'version': ('YYYY', ['yyyy_mm', 'yyyy']),
+    'test_name': ('Test Name', ['test_name']),
+    'compiler': ('Compiler', ['compiler']),
+}
+
+
+@lru_cache(maxsize=None)
+def fused_token_matcher(groups):
+    """
+    Compile a set of token patterns into a single matcher.
+
+    Each pattern is wrapped within an optional lookahead anchored at the start
+    of the token, so one match per token captures the first match of every
+    pattern.
+
+    Args:
+        groups (tuple): Names of the token patterns to compile (keys of TOKEN_PATTERNS).
+
+    Return (re.Pattern): Compiled matcher w/ a named group per token pattern.
+
+    """
+    lookaheads = ''.join(f'(?:(?=.*?{TOKEN_PATTERNS[group]}))?' for group in groups)
+    return re.compile('^' + lookaheads, re.DOTALL)
+
+
+class TokenScanCache():
+    """
+    Bounded memo of the attribute matches found per path token.
+
+    Folder names (e.g. FV3_fix_tiled, C96, develop-20231122) repeat across files,
+    columns & data maps, so each token is scanned for all token patterns once &
+    the least recently used tokens are evicted once the cache is full.
+    
+    """
+    def __init__(self, maxsize=2**18):
+        """
+        Args:
+            maxsize (int): Maximum number of tokens memoized.
+
+        """
+        self.maxsize = maxsize
+        self.groups = tuple(TOKEN_PATTERNS) + ('nosym_res',)
+        self.matcher = fused_token_matcher(tuple(TOKEN_PATTERNS))
+        self.memo = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+    def scan(self, tokens):
+        """
+        Look up the attribute matches per token, scanning only the tokens not memoized.
+
+        Args:
+            tokens (iterable): Path tokens.
+
+        Return (list): Tuple of first matches per token, ordered as self.groups
+        (None if the token does not feature a match).
+
+        """
+        no_match = (None,) * len(self.groups)
+        records = []
+        with self.lock:
+            for token in tokens:
+                if not isinstance(token, str):
+                    records.append(no_match)
+                    continue
+                record = self.memo.get(token)
+                if record is None:
+                    self.misses += 1
+                    is_res = token.isnumeric() and 2 <= len(token) <= 3
+                    record = self.matcher.match(token).groups() + (token if is_res else None,)
+                    self.memo[token] = record
+                    if len(self.memo) > self.maxsize:
+                        self.memo.popitem(last=False)
+                else:
+                    self.hits += 1
+                    self.memo.move_to_end(token)
+                records.append(record)
+                
+        return records
+
+
+# Leading bytes of a gzip stream.
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Data map columns stored as integers when saved in a columnar format (resolutions
+# are nullable, as not every data file features one).
+MAP_SIZE_COLUMNS = ['File Size (Bytes)']
+MAP_RES_COLUMNS = ['Resolution (C)', 'Ocean Resolution (mx)', 'Ocean Resolution (o)', 'Ocean Resolution (w/o symbol)']
+
+# Data map columns featuring the TAR members' payload digests (mostly distinct, so kept as strings).
+MAP_DIGEST_COLUMNS = {'crc32': 'CRC32', 'sha256': 'SHA-256'}
+
+# Data map column featuring the TAR members' directories w/in their TAR-based object (distinct,
+# so kept as strings), by which the members of a data map are selected for extraction.
+MAP_MEMBER_COLUMN = 'TAR Member'
+
+# Extensions of the data files whose headers are introspected & the data map columns
+# featuring the headers' details.
+NC_EXTENSIONS = ('.nc', '.nc4')
+NC_HEADER_COLUMNS = ['File Format', 'Dimensions', 'Variables']
+
+# Data map column used to partition large maps saved as Parquet (one folder per dataset).
+MAP_PARTITION_COLUMN = 'Dataset'
+
+# Operators of the (column, operator, value) filters applied to data maps.
+FILTER_OPS = {'==': lambda col, val: col == val, 
+              '!=': lambda col, val: col != val, 
+              '<': lambda col, val: col < val, 
+              '<=': lambda col, val: col <= val, 
+              '>': lambda col, val: col > val, 
+              '>=': lambda col, val: col >= val, 
+              'in': lambda col, val: col.isin(val), 
+              'not in': lambda col, val: ~col.isin(val), 
+              'startswith': lambda col, val: col.astype(str).str.startswith(val)}
+
+# Data map columns w/ a hash index when data maps are queried (refer to MapIndex).
+MAP_INDEX_COLUMNS = ['Dataset', 'UFS Component', 'Sub-Category', 'Test Name', 'Compiler', 'Resolution (C)']
+
+# Data required by the Land DA v1.1.0 & v1.2.0 test cases from the UFS-WM RT data maps, declared per
+# consolidated sheet as (sheet name, data map, filters). Filter values are formatted w/ the
+# test case's {bl_date} & {input_date}.
+LAND_DA_TEST_CASE_SELECTIONS = [
+    # "DATM" & "NOAHMP Initial Condition" data.
+    ('DATM_NOAHMP_IC', 'input', [('Dataset', '==', 'input-data-{input_date}'),
+                                 ('UFS Component', 'in', ['DATM_GSWP3_input_data', 'NOAHMP_IC'])]),
+    
+    # "Non-Fixed FV3" data.
+    ('NonFixed_FV3', 'input', [('Dataset', '==', 'input-data-{input_date}'),
+                               ('UFS Component', '==', 'FV3_input_data'),
+                               ('Sub-Category', '==', 'INPUT'),
+                               ('Data File', '==', 'grid_spec.nc')]),
+    ('NonFixed_FV3', 'input', [('Dataset', '==', 'input-data-{input_date}'),
+                               ('UFS Component', '==', 'FV3_input_data'),
+                               ('Sub-Category', '==', 'INPUT'),
+                               ('Data File', 'startswith', 'C96_grid.tile')]),
+    
+    # "Fixed FV3" data.
+    ('Fixed_FV3', 'input', [('Dataset', '==', 'input-data-{input_date}'),
+                            ('UFS Component', '==', 'FV3_fix_tiled'),
+                            ('Resolution (C)', '==', 96)]),
+    
+    # "DATM CDEPS LAND GSWP3" baseline data.
+    ('Baseline', 'bl', [('Dataset', '==', 'develop-{bl_date}'),
+                        ('Compiler', '==', 'intel'),
+                        ('Test Name', '==', 'datm_cdeps_lnd_gswp3')]),
+]
+
+# Member types whose payload is stored contiguously w/in the archive (regular files).
+FILE_MEMBER_TYPES = [mtype.decode('ascii') for mtype in (tarfile.REGTYPE, tarfile.AREGTYPE, tarfile.CONTTYPE)]
+
+# Memo of attribute matches shared by all data maps generated w/in the session.
+TOKEN_SCAN_CACHE = TokenScanCache()
+
+
+class TarIndexCache():
+    """
+    Persistent cache of TAR member indexes saved as Parquet files on local disk.
+
+    Each index is keyed by the object's (bucket, key, ETag, size), so an index
+    is only reused while the object in cloud remains unchanged. The inflate
+    checkpoints of gzip-compressed objects are cached alongside their index.
+    The least recently used entries are evicted once the cache exceeds its size limit.
+    
+    """
+    def __init__(self, cache_dir, max_bytes=256 * 1024**2):
+        """
+        Args:
+            cache_dir (str): Folder directory of the cached indexes.
+
+            max_bytes (int): Maximum total size of the cached indexes on disk.
+
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_fn(self, bucket, key, etag, size, ext='.parquet'):
+        """
+        Compose the filename of an object's cached index (or checkpoints).
+
+        Args:
+            bucket (str): Object's bucket name.
+
+            key (str): Object's key in cloud.
+
+            etag (str): Object's ETag.
+
+            size (int): Object's size in bytes.
+
+            ext (str): Entry's file extension.
+                       Options: '.parquet' (member index), '.gzidx' (inflate checkpoints)
+
+        Return (str): Filename prefixed by the object's identity & suffixed by its version.
+
+        """
+        object_id = hashlib.sha1(f'{bucket}/{key}'.encode()).hexdigest()[:20]
+        version_id = hashlib.sha1(f'{etag}:{size}'.encode()).hexdigest()[:20]
+        return os.path.join(self.cache_dir, f'{object_id}-{version_id}{ext}')
+
+    def get(self, bucket, key, etag, size):
+        """
+        Read an object's cached index.
+
+        Args:
+            bucket (str): Object's bucket name.
+
+            key (str): Object's key in cloud.
+
+            etag (str): Object's current ETag.
+
+            size (int): Object's current size in bytes.
+
+        Return (pd.DataFrame): Cached TAR member index or None if the object's
+        current version has not been indexed (or its entry is corrupt, in which
+        case the entry is removed).
+
+        """
+        entry_fn = self._entry_fn(bucket, key, etag, size)
+        try:
+            tar_index = pd.read_parquet(entry_fn)
+            os.utime(entry_fn)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, ArrowException) as e:
+            print(f"Cached index of {key} is unreadable & will be re-read: {e}")
+            self._remove(entry_fn)
+            return None
+        return tar_index
+
+    def get_checkpoints(self, bucket, key, etag, size):
+        """
+        Read the cached inflate checkpoints of a gzip-compressed object.
+
+        Args:
+            bucket (str): Object's bucket name.
+
+            key (str): Object's key in cloud.
+
+            etag (str): Object's current ETag.
+
+            size (int): Object's current size in bytes.
+
+        Return (bytes): Exported gzip index or None if the object's current version
+        has no saved checkpoints.
+
+        """
+        entry_fn = self._entry_fn(bucket, key, etag, size, ext='.gzidx')
+        try:
+            with open(entry_fn, 'rb') as f_handle:
+                checkpoints = f_handle.read()
+            os.utime(entry_fn)
+        except OSError:
+            return None
+        return checkpoints
+
+    def _write(self, entry_fn, write):
+        """
+        Write an entry to a temporary file first, so concurrent readers never see
+        a partial entry.
+
+        Args:
+            entry_fn (str): Entry's filename.
+
+            write (callable): Function w/ signature write(fn) saving the entry.
+
+        """
+        tmp_fn = f'{entry_fn}.{threading.get_ident()}.tmp'
+        write(tmp_fn)
+        os.replace(tmp_fn, entry_fn)
+
+    def _remove_versions(self, entry_fn):
+        """
+        Remove the entries of an object's previous versions.
+
+        Args:
+            entry_fn (str): Filename of an entry of the object's current version.
+
+        """
+        object_id, version_id = os.path.splitext(os.path.basename(entry_fn))[0].split('-')
+        for fn in os.listdir(self.cache_dir):
+            if fn.startswith(object_id + '-') and not fn.startswith(f'{object_id}-{version_id}'):
+                self._remove(os.path.join(self.cache_dir, fn))
+
+    def put(self, bucket, key, etag, size, tar_index, checkpoints=None):
+        """
+        Save an object's index, replacing the entries of its previous versions.
+
+        Args:
+            bucket (str): Object's bucket name.
+
+            key (str): Object's key in cloud.
+
+            etag (str): Object's ETag.
+
+            size (int): Object's size in bytes.
+
+            tar_index (pd.DataFrame): TAR member index.
+
+            checkpoints (bytes): Exported gzip index of a gzip-compressed object. If
+                                 not applicable, set as default value.
+
+        """
+        entry_fn = self._entry_fn(bucket, key, etag, size)
+        self._remove_versions(entry_fn)
+        self._write(entry_fn, lambda fn: tar_index.to_parquet(fn, index=False))
+        if checkpoints is not None:
+            self.put_checkpoints(bucket, key, etag, size, checkpoints)
+        self.evict()
+
+    def put_checkpoints(self, bucket, key, etag, size, checkpoints):
+        """
+        Save the inflate checkpoints of a gzip-compressed object.
+
+        Args:
+            bucket (str): Object's bucket name.
+
+            key (str): Object's key in cloud.
+
+            etag (str): Object's ETag.
+
+            size (int): Object's size in bytes.
+
+            checkpoints (bytes): Exported gzip index.
+
+        """
+        def write(fn):
+            with open(fn, 'wb') as f_handle:
+                f_handle.write(checkpoints)
+
+        entry_fn = self._entry_fn(bucket, key, etag, size, ext='.gzidx')
+        self._remove_versions(entry_fn)
+        self._write(entry_fn, write)
+        self.evict()
+
+    def _remove(self, fn):
+        """
+        Remove a cached entry (if not already removed by another worker).
+
+        Args:
+            fn (str): Cached entry's filename.
+
+        """
+        try:
+            os.remove(fn)
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache fits w/in its size limit.
+
+        """
+        entries = []
+        for fn in os.listdir(self.cache_dir):
+            if fn.endswith(('.parquet', '.gzidx')):
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, fn))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, fn))
+        total = sum(size for _, size, _ in entries)
+        for _, size, fn in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(os.path.join(self.cache_dir, fn))
+            total -= size
+
+
+class MapIndex():
+    """
+    Data map w/ hash indexes mapping each value of its selection columns to
+    the positions of the rows featuring the value.
+
+    A selection is resolved by looking up its most selective indexed filter,
+    so the remaining filters are only checked against the rows returned by the
+    lookup rather than scanned across the entire data map.
+    
+    """
+    def __init__(self, df, index_cols=MAP_INDEX_COLUMNS):
+        """
+        Args:
+            df (pd.DataFrame): Data map.
+
+            index_cols (list): Columns to index (columns missing from the data map
+                               are skipped).
+
+        """
+        self.df = df.reset_index(drop=True)
+        self.index = {col: self.df.groupby(col, observed=True, sort=False).indices 
+                      for col in index_cols if col in self.df.columns}
+
+    def _positions(self, col, values):
+        """
+        Look up the rows featuring any of the values w/in an indexed column.
+
+        Args:
+            col (str): Indexed column.
+
+            values (list): Values to look up.
+
+        Return (np.ndarray): Sorted positions of the matching rows.
+
+        """
+        hits = [self.index[col][val] for val in values if val in self.index[col]]
+        if not hits:
+            return np.array([], dtype=np.intp)
+        return np.unique(np.concatenate(hits))
+
+    def select(self, filters):
+        """
+        Select the rows of the data map satisfying all filters.
+
+        Args:
+            filters (list): Filters as (column, operator, value) tuples (refer to FILTER_OPS).
+
+        Return (pd.DataFrame): Selected rows in the data map's order.
+
+        """
+        lookups = [(col, [val] if op == '==' else list(val)) for col, op, val in filters 
+                   if col in self.index and op in ('==', 'in')]
+        if lookups:
+            col, values = min(lookups, key=lambda lookup: sum(len(self.index[lookup[0]].get(val, ())) 
+                                                              for val in lookup[1]))
+            rows = self.df.iloc[self._positions(col, values)]
+        else:
+            rows = self.df
+        
+        for col, op, val in filters:
+            rows = rows[FILTER_OPS[op](rows[col], val).fillna(False).to_numpy(dtype=bool)]
+        
+        return rows
+
+
+# Byte budget of the batch mapped or extracted by the current call (set per call & carried
+# onto its worker threads, so concurrent batches on the same generator keep their own budgets).
+BATCH_BUDGET = contextvars.ContextVar('batch_budget', default=None)
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    Thread pool running each task w/in a copy of the submitting thread's context (e.g.
+    the batch's byte budget).
+
+    """
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class ByteBudget():
+    """
+    Cap on the number of bytes requested from cloud storage at the same time
+    across the workers of a batch.
+
+    """
+    def __init__(self, limit):
+        """
+        Args:
+            limit (int): Maximum number of bytes in flight.
+
+        """
+        self.limit = limit
+        self.in_flight = 0
+        self.peak = 0
+        self.cond = threading.Condition()
+
+    @contextmanager
+    def reserve(self, nbytes):
+        """
+        Block until the requested bytes fit w/in the budget & hold them until
+        the context exits.
+
+        Args:
+            nbytes (int): Number of bytes requested (capped at the budget's limit,
+                          so a single large request cannot stall the batch).
+
+        """
+        nbytes = min(max(nbytes, 0), self.limit)
+        with self.cond:
+            self.cond.wait_for(lambda: self.in_flight + nbytes <= self.limit)
+            self.in_flight += nbytes
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.in_flight -= nbytes
+                self.cond.notify_all()
+
+
+class BudgetedStream():
+    """
+    File-like wrapper reserving each read of a streaming body against a ByteBudget.
+
+    """
+    def __init__(self, body, budget):
+        """
+        Args:
+            body (file-like): Object's streaming body.
+
+            budget (ByteBudget): Budget shared by the batch's workers.
+
+        """
+        self.body = body
+        self.budget = budget
+
+    def read(self, size=-1):
+        with self.budget.reserve(size if size > 0 else self.budget.limit):
+            return self.body.read(size)
+
+    def close(self):
+        self.body.close()
+
+
+class StageCounter():
+    """
+    Throughput counters of a pipeline stage, w/ the time spent blocked on the
+    neighbouring stages' queues kept apart from the time spent working.
+
+    """
+    def __init__(self, name):
+        """
+        Args:
+            name (str): Stage name.
+
+        """
+        self.name = name
+        self.nbytes = 0
+        self.busy = 0.0
+        self.waited = 0.0
+
+    def summary(self):
+        """
+        Summarize the stage's counters.
+
+        Return (dict): Bytes output, seconds spent working & blocked, & throughput
+        while working (MB/s).
+
+        """
+        return {'stage': self.name,
+                'bytes': self.nbytes,
+                'busy_s': round(self.busy, 3),
+                'wait_s': round(self.waited, 3),
+                'MBps': round(self.nbytes / 1024**2 / self.busy, 1) if self.busy else None}
+
+
 class DataMapGenerator():
     """
     Map data from cloud service provider's data storage.
     
     """
-    def __init__(self, use_bucket):
+    def __init__(self, use_bucket, use_snapshot=True, snapshot_ttl=24 * 3600, use_index_cache=True, index_cache_bytes=256 * 1024**2, backend='s3', mirror_dir=None, checkpoint_spacing=4 * 1024**2, max_pool_connections=64, download_concurrency=16, download_chunksize=8 * 1024**2, spool_bytes=64 * 1024**2, profiler=None):
         """
         Args:                          
             use_bucket (str): If set to 'rt', data will be read from the cloud data
@@ -32,6 +627,56 @@ class DataMapGenerator():
                               bucket designated for the UFS Land DA datasets. 
                               Options: 'srw', 'land-da', 'rt'
                               
+            use_snapshot (bool): If set to True, bucket listings will be served from the
+                                 bucket's listing snapshot saved under ../results (the
+                                 snapshot is generated on first use). If set to False,
+                                 the bucket will be listed from cloud storage on every request.
+                                 
+            snapshot_ttl (float): Maximum age in seconds of a top-level prefix's listing w/in
+                                  the snapshot. Prefixes listed longer ago are re-listed (so
+                                  keys added to or deleted from a prefix are picked up) once
+                                  served or refreshed. If set to None, prefixes are only
+                                  re-listed if new or requested (refer to refresh_listing_snapshot()).
+                                 
+            use_index_cache (bool): If set to True, the member index of each TAR-based
+                                    object will be cached under ../results/tar_index_cache
+                                    & reused for as long as the object's ETag & size are
+                                    unchanged.
+                                    
+            index_cache_bytes (int): Maximum size of the TAR member index cache on disk
+                                     (least recently used indexes are evicted first).
+                                     
+            backend (str): If set to 's3', the bucket will be read via the S3 API. If set to
+                           'http', the bucket will be read via anonymous HTTPS requests to
+                           the bucket's endpoint. If set to 'local', the bucket will be read
+                           from its mirror on local disk (e.g. a parallel filesystem).
+                           Options: 's3', 'http', 'local'
+                           
+            mirror_dir (str): Root folder of the bucket's mirror on local disk (required if
+                              backend is set to 'local'). If not applicable, set as default value.
+                              
+            checkpoint_spacing (int): Number of uncompressed bytes between the inflate
+                                      checkpoints recorded while indexing a gzip-compressed
+                                      TAR-based object (requires indexed_gzip & the index
+                                      cache). If set to None, no checkpoints are recorded.
+            
+            max_pool_connections (int): Maximum number of connections kept open to S3 by the
+                                        shared client (should cover the worker threads times
+                                        download_concurrency).
+            
+            download_concurrency (int): Number of byte ranges read concurrently when
+                                        downloading a whole object.
+            
+            download_chunksize (int): Size of each byte range read when downloading a
+                                      whole object.
+            
+            spool_bytes (int): Maximum size of a downloaded object held in memory (larger
+                               objects are spooled to a temporary file on disk).
+            
+            profiler (Profiler): Profiler recording the generator's stages & storage 
+                                 requests (refer to profiler.py). If not applicable, set
+                                 as default value.
+                              
         """
         
         # Cloud service provider's data storage options.
@@ -47,422 +692,2331 @@ class DataMapGenerator():
         else:
             print(f"{use_bucket} Bucket Does Not Exist.")
 
-        # Set client session.
-        self.s3 = boto3.client('s3', config=Config(signature_version=UNSIGNED))
+        # Set storage backend serving the bucket's listing & objects.
+        if backend == 's3':
+            self.storage = S3Backend(self.bucket_name, max_pool_connections)
+        elif backend == 'http':
+            self.storage = HTTPBackend(f'https://{self.bucket_name}.s3.amazonaws.com')
+        elif backend == 'local':
+            self.storage = LocalBackend(mirror_dir)
+        else:
+            raise ValueError(f"{backend} is not a valid storage backend.")
+        self.s3 = getattr(self.storage, 'client', None)
+        
+        # Stages & storage requests recorded by the profiler (if attached).
+        self.profiler = profiler
+        if profiler is not None:
+            self.storage.on_request = profiler.on_request
         
         # Create folder directory to save data maps & list of cloud keys.
         if not os.path.exists('../results'):
             os.makedirs('../results')
         sys.path.append( '../results' )
+        
+        # Bucket listing snapshot (loaded on first use).
+        self.use_snapshot = use_snapshot
+        self.snapshot_ttl = snapshot_ttl
+        self.snapshot_fn = f'../results/{self.bucket_name}{"_local" if backend == "local" else ""}_listing_snapshot.parquet'
+        self.snapshot = None
+        
+        # Prefixes w/o any key after a refresh mapped to the time of the lookup (served as
+        # empty w/o re-listing until the snapshot's time to live expires).
+        self.missing_prefixes = {}
+        
+        # TAR member indexes cached per object version.
+        self.index_cache = TarIndexCache('../results/tar_index_cache', index_cache_bytes) if use_index_cache else None
+        
+        # Inflate checkpoints recorded per gzip-compressed TAR-based object.
+        self.checkpoint_spacing = checkpoint_spacing if indexed_gzip is not None else None
+        
+        # Whole objects are downloaded as parallel byte ranges into a spooled temporary file.
+        self.transfer_config = TransferConfig(multipart_threshold=download_chunksize,
+                                              multipart_chunksize=download_chunksize,
+                                              max_concurrency=download_concurrency)
+        self.spool_bytes = spool_bytes
+        
+        # Stage counters of the last pipelined scan per TAR-based object.
+        self.pipeline_stats = {}
     
-    def get_all_s3_keys(self):
+    def _list_objects(self, prefix='', delimiter=None):
         """
-        Extract keys from cloud service provider's storage.
+        Page through the objects residing under a prefix of the bucket's storage backend.
         
         Args:
-            None
+            prefix (str): Prefix of object keys to list.
             
-        Return (list): List of keys residing within the cloud
-        storage of interest.
+            delimiter (str): If set, keys are grouped by their common prefix up to
+                             the first delimiter following the given prefix. If not
+                             applicable, set as default value.
+            
+        Return (list, list): List of objects' details (e.g. Key, Size, ETag, LastModified) 
+        & list of common prefixes residing under the prefix.
 
         """
-        kwargs = {'Bucket': self.bucket_name}
-        key_list = []
-        while True:
-            resp = self.s3.list_objects_v2(**kwargs)
-            for content in resp.get('Contents', []):
-                key_list.append(content['Key'])
-            try:
-                kwargs['ContinuationToken'] = resp['NextContinuationToken']
-            except KeyError:
-                break
-              
-        return key_list
+        return self.storage.list_objects(prefix, delimiter)
     
-    def read_s3_object_dirs(self, tar_object_fn):
+    @profiled
+    def list_s3_objects(self, prefix='', max_workers=10):
         """
-        Extract directories from TAR-based object in cloud.
+        List objects from cloud service provider's storage w/ the listing partitioned
+        by prefix & performed concurrently.
+
+        The top-level prefixes (e.g. develop-YYYYMMDD/, input-data-YYYYMMDD/) are
+        discovered first via a delimited listing & each prefix is then listed on
+        its own worker thread.
+        
+        Args:
+            prefix (str): Prefix of object keys to list. If not applicable, set as
+                          default value.
+            
+            max_workers (int): Number of prefixes listed concurrently.
+            
+        Return (list): List of objects' details (e.g. Key, Size, ETag, LastModified)
+        sorted by key.
+
+        """
+        contents, prefixes = self._list_objects(prefix, delimiter='/')
+        with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+            for part_contents, _ in executor.map(self._list_objects, prefixes):
+                contents.extend(part_contents)
+        contents.sort(key=lambda content: content['Key'])
+        
+        return contents
+    
+    def _contents_to_listing(self, contents):
+        """
+        Convert objects' details returned by cloud storage into a bucket listing.
+        
+        Args:
+            contents (list): List of objects' details (e.g. Key, Size, ETag, LastModified).
+            
+        Return (pd.DataFrame): Bucket listing comprised of each object's key, size, ETag,
+        last modified timestamp & top-level prefix (partition), sorted by key.
+
+        """
+        listing = pd.DataFrame(contents, columns=['Key', 'Size', 'ETag', 'LastModified'])
+        listing['Size'] = listing['Size'].astype('int64')
+        listing['Partition'] = listing['Key'].str.extract(r'^([^/]*/)', expand=False).fillna('')
+        
+        return listing.sort_values('Key', ignore_index=True)
+    
+    @profiled
+    def load_listing_snapshot(self):
+        """
+        Load the bucket's listing snapshot from the local ../results directory.
+        
+        Args:
+            None
+            
+        Return (pd.DataFrame): Bucket listing comprised of each object's key, size, ETag,
+        last modified timestamp & top-level prefix (partition). None if a snapshot has
+        not been saved.
+
+        """
+        if self.snapshot is None and os.path.exists(self.snapshot_fn):
+            self.snapshot = pd.read_parquet(self.snapshot_fn)
+            
+        return self.snapshot
+    
+    def _stale_partitions(self, listing):
+        """
+        Determine the top-level prefixes whose listing w/in the snapshot is older than
+        the snapshot's time to live.
+        
+        Args:
+            listing (pd.DataFrame): Bucket listing (or a slice of one) read from the snapshot.
+            
+        Return (set): Stale top-level prefixes (all prefixes of a snapshot saved w/o
+        listing times).
+
+        """
+        if self.snapshot_ttl is None:
+            return set()
+        if 'Listed' not in listing.columns:
+            return set(listing['Partition'])
+        cutoff = pd.Timestamp.now(tz='UTC') - pd.Timedelta(seconds=self.snapshot_ttl)
+        return set(listing.loc[listing['Listed'] < cutoff, 'Partition'])
+    
+    @profiled
+    def refresh_listing_snapshot(self, relist_prefixes=[], max_workers=10):
+        """
+        Generate or incrementally refresh the bucket's listing snapshot.
+
+        The top-level prefixes (e.g. develop-YYYYMMDD/) are discovered via a delimited
+        listing. Only the prefixes missing from the snapshot, the ones listed longer ago
+        than the snapshot's time to live (refer to DataMapGenerator()) & the ones requested
+        to be re-listed are listed from cloud storage; the remaining prefixes are reused
+        from the snapshot & prefixes no longer residing within the bucket are dropped.
+        The time each prefix was listed is kept as the snapshot's 'Listed' column.
+        
+        Args:
+            relist_prefixes (list): List of top-level prefixes to re-list regardless of 
+                                    whether they are featured within the snapshot.
+            
+            max_workers (int): Number of prefixes listed concurrently.
+            
+        Return (pd.DataFrame): Refreshed bucket listing.
+
+        """
+        snapshot = self.load_listing_snapshot()
+        listed_at = pd.Timestamp.now(tz='UTC')
+        root_contents, prefixes = self._list_objects(delimiter='/')
+        
+        # Determine the prefixes requiring a listing.
+        relist_prefixes = {p if p.endswith('/') else f'{p}/' for p in relist_prefixes}
+        listed = set() if snapshot is None else set(snapshot['Partition'].unique())
+        if snapshot is not None:
+            relist_prefixes |= self._stale_partitions(snapshot)
+        new_prefixes = [p for p in prefixes if p not in listed or p in relist_prefixes]
+        reused_prefixes = set(prefixes) - set(new_prefixes)
+        
+        contents = list(root_contents)
+        with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+            for part_contents, _ in executor.map(self._list_objects, new_prefixes):
+                contents.extend(part_contents)
+        listing = self._contents_to_listing(contents)
+        listing['Listed'] = listed_at
+        if snapshot is not None:
+            listing = pd.concat([snapshot[snapshot['Partition'].isin(reused_prefixes)], listing])
+            listing = listing.sort_values('Key', ignore_index=True)
+        
+        # Save listing snapshot to local ../results directory.
+        listing.to_parquet(self.snapshot_fn, index=False)
+        self.snapshot = listing
+        self.missing_prefixes.clear()
+        print(f"Listing snapshot of {self.bucket_name} saved to {self.snapshot_fn} "
+              f"({len(new_prefixes)} of {len(prefixes)} prefixes listed).")
+        
+        return listing
+    
+    @profiled
+    def get_s3_listing(self, prefix='', max_workers=10):
+        """
+        Extract objects' details from cloud service provider's storage.
+
+        If the listing snapshot is enabled, the objects are served from the local snapshot.
+        The snapshot is refreshed should it not feature any object under the prefix
+        (e.g. a new develop-YYYYMMDD dataset) or should the prefix's listing be older than
+        the snapshot's time to live. A prefix still w/o any object once refreshed (e.g. a
+        misspelled prefix) is served as empty until the time to live expires.
+        
+        Args:
+            prefix (str): Prefix of object keys to extract. If not applicable, set as
+                          default value.
+            
+            max_workers (int): Number of prefixes listed concurrently.
+            
+        Return (pd.DataFrame): Bucket listing comprised of each object's key, size, ETag,
+        last modified timestamp & top-level prefix (partition), sorted by key.
+
+        """
+        if not self.use_snapshot:
+            return self._contents_to_listing(self.list_s3_objects(prefix, max_workers))
+        
+        listing = self.load_listing_snapshot()
+        for attempt in range(2):
+            if listing is not None:
+                # Keys are sorted, so the prefix's keys form a contiguous slice.
+                lo = listing['Key'].searchsorted(prefix, side='left')
+                hi = listing['Key'].searchsorted(prefix + '\U0010ffff', side='left')
+                missed = self.missing_prefixes.get(prefix)
+                if hi == lo and missed is not None and (self.snapshot_ttl is None or time.time() - missed < self.snapshot_ttl):
+                    return listing.iloc[lo:hi].reset_index(drop=True)
+                if (hi > lo and not self._stale_partitions(listing.iloc[lo:hi])) or attempt == 1:
+                    if hi == lo:
+                        self.missing_prefixes[prefix] = time.time()
+                    return listing.iloc[lo:hi].reset_index(drop=True)
+            listing = self.refresh_listing_snapshot(max_workers=max_workers)
+    
+    def get_all_s3_keys(self, prefix='', max_workers=10):
+        """
+        Extract keys from cloud service provider's storage.
+        
+        Args:
+            prefix (str): Prefix of object keys to extract. If not applicable, set as
+                          default value.
+            
+            max_workers (int): Number of prefixes listed concurrently.
+            
+        Return (list): List of keys residing within the cloud
+        storage of interest.
+
+        """
+        return self.get_s3_listing(prefix, max_workers)['Key'].tolist()
+    
+    def _head_object(self, key):
+        """
+        Request an object's metadata from cloud storage.
+        
+        Args:
+            key (str): Object's key in cloud.
+            
+        Return (dict): Object's metadata (e.g. ContentLength, ETag).
+
+        """
+        return self.storage.head_object(key)
+
+    def _stage(self, name):
+        """
+        Record a stage of the generator's profiler (no-op if not attached).
+        
+        Args:
+            name (str): Stage name.
+            
+        Return (context manager): Yields the stage's call record, on which the number
+        of rows processed may be set.
+
+        """
+        if self.profiler is None:
+            return nullcontext({})
+        return self.profiler.stage(name)
+
+    @property
+    def byte_budget(self):
+        """
+        Cap on the bytes requested concurrently by the current call's batch (None outside
+        of a batch, refer to map_tar_objects() & extract_s3_tar_members()).
+
+        """
+        return BATCH_BUDGET.get()
+
+    def _reserve(self, nbytes):
+        """
+        Reserve bytes against the batch's byte budget (no-op outside of a batch).
+        
+        Args:
+            nbytes (int): Number of bytes about to be requested.
+            
+        Return (context manager): Holds the reservation until exited.
+
+        """
+        if self.byte_budget is None:
+            return nullcontext()
+        return self.byte_budget.reserve(nbytes)
+
+    def _get_object_range(self, key, start, end):
+        """
+        Read a byte range of an object from cloud storage.
+        
+        Args:
+            key (str): Object's key in cloud.
+            
+            start (int): Position of the first byte to read.
+            
+            end (int): Position of the last byte to read (inclusive).
+            
+        Return (bytes): Object's bytes within the requested range.
+
+        """
+        with self._reserve(end - start + 1):
+            return self.storage.get_range(key, start, end)
+
+    def _open_object_reader(self, key, readahead=64 * 1024, size=None):
+        """
+        Open a ranged reader over an object in cloud storage.
+        
+        Args:
+            key (str): Object's key in cloud.
+            
+            readahead (int): Minimum number of bytes requested per ranged read.
+            
+            size (int): Object's size in bytes. If not applicable, set as default
+                        value (requested via a HeadObject request).
+            
+        Return (RangeReader): Reader serving the object's bytes by offset.
+
+        """
+        if size is None:
+            size = self._head_object(key)['ContentLength']
+        return RangeReader(lambda start, end: self._get_object_range(key, start, end), 
+                           size, 
+                           readahead=readahead)
+
+    @contextmanager
+    def download_object(self, key, size=None):
+        """
+        Download a whole object from cloud storage as parallel byte range reads
+        (refer to the transfer settings of DataMapGenerator()).
+        
+        Args:
+            key (str): Object's key in cloud.
+            
+            size (int): Object's size in bytes. If not applicable, set as default
+                        value (requested via a HeadObject request w/in a batch).
+            
+        Return (context manager): Spooled temporary file featuring the object's bytes
+        (positioned at its start), removed once the context exits.
+
+        """
+        # Only the spooled part of the object & the parts in flight are held in memory.
+        if size is None:
+            size = self._head_object(key)['ContentLength'] if self.byte_budget else 0
+        in_memory = self.spool_bytes + self.transfer_config.max_request_concurrency * self.transfer_config.multipart_chunksize
+        with self._reserve(min(size, in_memory)):
+            with tempfile.SpooledTemporaryFile(max_size=self.spool_bytes) as fileobj:
+                self.storage.download(key, fileobj, self.transfer_config)
+                fileobj.seek(0)
+                yield fileobj
+
+    @profiled
+    def read_s3_tar_headers(self, tar_object_fn, readahead=64 * 1024, size=None):
+        """
+        Extract member details from an uncompressed TAR-based object in cloud
+        by reading only its header blocks.
+
+        Each 512-byte header is requested via a HTTP Range request & the position
+        of the next header is computed from the member's size, so the members'
+        data payloads are never transferred.
+        
+        Args:
+            tar_object_fn (str): TAR-based object's key in cloud.
+            
+            readahead (int): Minimum number of bytes requested per ranged read. Headers
+                             of small consecutive members are served by the same request.
+            
+            size (int): Object's size in bytes. If not applicable, set as default
+                        value (requested via a HeadObject request).
+            
+        Return (pd.DataFrame): TAR member index comprised of each member's name, size,
+        type, header offset & data offset.
+
+        """
+        reader = self._open_object_reader(tar_object_fn, readahead=readahead, size=size)
+        if not is_tar_header(reader.read(0, BLOCKSIZE)):
+            raise ValueError(f"{tar_object_fn} is not an uncompressed TAR-based object.")
+        
+        # Objects mirrored on local disk are scanned via a memory mapping instead.
+        if isinstance(self.storage, LocalBackend):
+            return pd.DataFrame(scan_tar_mmap(self.storage.path(tar_object_fn)))
+        
+        return pd.DataFrame(list(walk_tar_headers(reader.read)), columns=TAR_INDEX_COLUMNS)
+    
+    def _open_object_stream(self, key):
+        """
+        Open a streaming body over an object in cloud storage.
+        
+        Args:
+            key (str): Object's key in cloud.
+            
+        Return (file-like): Object's body, read on demand.
+
+        """
+        body = self.storage.open_stream(key)
+        if self.byte_budget is not None:
+            body = BudgetedStream(body, self.byte_budget)
+        return body
+
+    @profiled
+    def read_s3_tar_stream(self, tar_object_fn, bufsize=1024 * 1024):
+        """
+        Extract member details from a TAR-based object in cloud (compressed or
+        uncompressed) w/in a single streaming pass.
+
+        The object's body is fed directly into a stream-mode TAR reader w/ a fixed-size
+        read buffer, so memory usage stays constant regardless of the object's size.
+        
+        Args:
+            tar_object_fn (str): TAR-based object's key in cloud.
+            
+            bufsize (int): Number of bytes read from the object's body at a time.
+            
+        Return (pd.DataFrame): TAR member index comprised of each member's name, size,
+        type, header offset & data offset (offsets refer to the uncompressed archive).
+
+        """
+        body = self._open_object_stream(tar_object_fn)
+        tar_index = self._read_tar_members(body, mode='r|*', bufsize=bufsize)
+        body.close()
+        
+        return tar_index
+    
+    def _run_pipeline(self, tar_object_fn, size, inflate, chunk_bytes=4 * 1024**2, prefetch_depth=2, queue_depth=4, drain=False, hasher=None, out_bytes=1024 * 1024, held_bytes=0):
+        """
+        Walk the TAR headers of an object in cloud w/ the network reads, the inflation &
+        the header parsing overlapped as a three-stage pipeline.
+
+        A prefetch thread requests the object as consecutive byte ranges (w/ up to
+        prefetch_depth ranges in flight), an inflate thread decompresses them (the
+        decompressors release the GIL while inflating) & the calling thread walks the TAR
+        headers over the inflated chunks. The stages are linked by bounded queues, so
+        memory stays bounded & the scan time approaches the slowest stage's time rather
+        than the sum of the stages' times. The stages' counters are kept in pipeline_stats
+        (the stage w/ the highest busy time is the bottleneck).
+        
+        If a member hasher is set, the inflated chunks are passed on to the hasher as the
+        headers are walked past them, so the members' payloads are hashed w/in the same
+        pass (w/ the hashing spread across the hasher's threads).
+        
+        W/in a batch, the chunks in flight, queued between the stages & held by the stages
+        are reserved against the batch's byte budget for the whole scan (w/ the queues
+        shortened to fit w/in the budget), so the budget caps the scan's memory rather
+        than only its requests.
+        
+        Args:
+            tar_object_fn (str): TAR-based object's key in cloud.
+            
+            size (int): Object's size in bytes.
+            
+            inflate (callable): Inflate stage w/ signature inflate(next_chunk, emit), where
+                                next_chunk() returns the next fetched chunk (or None at the
+                                end of the object) & emit(chunk) passes an inflated chunk on
+                                (returning False once the pipeline is stopped).
+            
+            chunk_bytes (int): Number of bytes requested per ranged read.
+            
+            prefetch_depth (int): Number of ranged reads in flight.
+            
+            queue_depth (int): Number of chunks buffered between consecutive stages.
+            
+            drain (bool): If set to True, the object is inflated to its end (rather than
+                          stopped at the end of the archive).
+            
+            hasher (MemberHasher): Hasher of the members' payloads. If not applicable, set 
+                                   as default value.
+            
+            out_bytes (int): Maximum size of the chunks emitted by the inflate stage.
+            
+            held_bytes (int): Number of bytes held by the inflate stage besides its
+                              current chunk (e.g. a cache of the object's blocks).
+            
+        Return (list): Member details (name, size, type, offset & offset_data) per member.
+
+        """
+        def resident_bytes():
+            return (prefetch_depth + queue_depth + 1) * chunk_bytes + (queue_depth + 2) * out_bytes + held_bytes
+        
+        if self.byte_budget is not None:
+            while resident_bytes() > self.byte_budget.limit and max(prefetch_depth, queue_depth) > 1:
+                if queue_depth >= prefetch_depth:
+                    queue_depth -= 1
+                else:
+                    prefetch_depth -= 1
+        
+        counters = [StageCounter('prefetch'), StageCounter('inflate'), StageCounter('parse')]
+        fetched, inflated = queue.Queue(queue_depth), queue.Queue(queue_depth)
+        stop = threading.Event()
+        errors = []
+        
+        def put(q, item, counter):
+            start = time.perf_counter()
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            counter.waited += time.perf_counter() - start
+            return not stop.is_set()
+        
+        def get(q, counter):
+            start = time.perf_counter()
+            item = None
+            while not stop.is_set():
+                try:
+                    item = q.get(timeout=0.1)
+                    break
+                except queue.Empty:
+                    pass
+            counter.waited += time.perf_counter() - start
+            return item
+        
+        def prefetch(counter):
+            # The ranged reads are covered by the scan's reservation.
+            fetch = lambda start: self.storage.get_range(tar_object_fn, start, min(start + chunk_bytes, size) - 1)
+            starts = iter(range(0, size, chunk_bytes))
+            with ContextThreadPoolExecutor(max_workers=prefetch_depth) as executor:
+                pending = deque(executor.submit(fetch, start) for _, start in zip(range(prefetch_depth), starts))
+                while pending:
+                    data = pending.popleft().result()
+                    counter.nbytes += len(data)
+                    start = next(starts, None)
+                    if start is not None:
+                        pending.append(executor.submit(fetch, start))
+                    if not put(fetched, data, counter):
+                        return
+            put(fetched, None, counter)
+        
+        def emit(chunk):
+            counters[1].nbytes += len(chunk)
+            return put(inflated, chunk, counters[1])
+        
+        def run(stage, counter, *args):
+            start = time.perf_counter()
+            try:
+                stage(*args)
+                if stage is inflate:
+                    put(inflated, None, counter)
+            except BaseException as e:
+                
+                # Errors raised by a stage once the pipeline is stopped are expected.
+                if not stop.is_set():
+                    errors.append(e)
+                    stop.set()
+            finally:
+                counter.busy = time.perf_counter() - start - counter.waited
+        
+        with self._reserve(resident_bytes()):
+            threads = [threading.Thread(target=contextvars.copy_context().run, args=(run, prefetch, counters[0], counters[0]), daemon=True),
+                       threading.Thread(target=contextvars.copy_context().run, args=(run, inflate, counters[1], lambda: get(fetched, counters[1]), emit), daemon=True)]
+            for thread in threads:
+                thread.start()
+            
+            # Parse the headers as the inflated chunks arrive.
+            parse = counters[2]
+            start = time.perf_counter()
+            try:
+                reader = ChunkReader(lambda: get(inflated, parse), 
+                                     on_release=hasher.consume if hasher is not None else None)
+                members = []
+                for member in walk_tar_headers(reader.read):
+                    
+                    # Register the member before its payload's chunks are released.
+                    if hasher is not None:
+                        hasher.add_member(len(members), member)
+                    members.append(member)
+                reader.release()
+                parse.nbytes = reader.end
+                while drain and reader.next_chunk() is not None:
+                    pass
+            finally:
+                stop.set()
+                for thread in threads:
+                    thread.join()
+                if hasher is not None:
+                    hasher.close()
+        parse.busy = time.perf_counter() - start - parse.waited
+        if errors:
+            raise errors[0]
+        
+        # The hash stage's busy time is averaged across the hasher's threads.
+        if hasher is not None:
+            counters.append(StageCounter('hash'))
+            counters[-1].nbytes = hasher.nbytes
+            counters[-1].busy = hasher.busy / len(hasher.threads)
+        
+        self.pipeline_stats[tar_object_fn] = [counter.summary() for counter in counters]
+        bottleneck = max(counters, key=lambda counter: counter.busy).name
+        print(f"Pipelined scan of {tar_object_fn}: " + 
+              ", ".join(f"{c['stage']} {c['MBps']} MB/s" for c in self.pipeline_stats[tar_object_fn]) +
+              f" (bottleneck: {bottleneck}).")
+        
+        return members
+    
+    @profiled
+    def read_s3_tar_pipeline(self, tar_object_fn, chunk_bytes=4 * 1024**2, prefetch_depth=2, queue_depth=4, digests=(), hash_workers=4, size=None):
+        """
+        Extract member details from a TAR-based object in cloud (gzip, bz2, xz-compressed
+        or uncompressed) w/ the network reads, the inflation & the header parsing 
+        overlapped on separate threads (refer to _run_pipeline()).
+        
+        Args:
+            tar_object_fn (str): TAR-based object's key in cloud.
+            
+            chunk_bytes (int): Number of bytes requested per ranged read.
+            
+            prefetch_depth (int): Number of ranged reads in flight.
+            
+            queue_depth (int): Number of chunks buffered between consecutive stages.
+            
+            digests (tuple): Digests of each file member's payload computed w/in the same
+                             pass, featured as additional index columns (None for non-file
+                             members).
+                             Options: 'crc32', 'sha256'
+            
+            hash_workers (int): Number of threads hashing the members' payloads.
+            
+            size (int): Object's size in bytes. If not applicable, set as default
+                        value (requested via a HeadObject request).
+            
+        Return (pd.DataFrame): TAR member index comprised of each member's name, size,
+        type, header offset & data offset (offsets refer to the uncompressed archive), 
+        along w/ the requested digests.
+
+        """
+        def inflate(next_chunk, emit):
+            data = next_chunk()
+            inflater = StreamInflater(data or b'')
+            while data is not None:
+                for chunk in inflater.feed(data):
+                    if not emit(chunk):
+                        return
+                data = next_chunk()
+        
+        if size is None:
+            size = self._head_object(tar_object_fn)['ContentLength']
+        hasher = MemberHasher(digests, max_workers=hash_workers) if digests else None
+        members = self._run_pipeline(tar_object_fn, size, inflate, 
+                                     chunk_bytes=chunk_bytes, 
+                                     prefetch_depth=prefetch_depth, 
+                                     queue_depth=queue_depth,
+                                     hasher=hasher)
+        
+        return self._tar_index(members, hasher)
+    
+    def _tar_index(self, members, hasher=None):
+        """
+        Arrange member details as a TAR member index.
+        
+        Args:
+            members (list): Member details (name, size, type, offset & offset_data) per member.
+            
+            hasher (MemberHasher): Hasher of the members' payloads (closed). If not applicable,
+                                   set as default value.
+            
+        Return (pd.DataFrame): TAR member index, along w/ a column per digest computed by the hasher.
+
+        """
+        tar_index = pd.DataFrame(members, columns=TAR_INDEX_COLUMNS)
+        if hasher is not None:
+            for digest, values in hasher.columns(len(members)).items():
+                tar_index[digest] = values
+        
+        return tar_index
+    
+    def _read_tar_members(self, fileobj, mode='r|*', bufsize=1024 * 1024):
+        """
+        Read the member details of a TAR archive sequentially.
+        
+        Args:
+            fileobj (file-like): TAR archive's bytes (compressed or uncompressed).
+            
+            mode (str): Stream mode of the TAR reader.
+                        Options: 'r|*' (any compression), 'r|' (uncompressed)
+            
+            bufsize (int): Number of bytes read from the file at a time.
+            
+        Return (pd.DataFrame): TAR member index comprised of each member's name, size,
+        type, header offset & data offset (offsets refer to the uncompressed archive).
+
+        """
+        members = []
+        with tarfile.open(fileobj=fileobj, mode=mode, bufsize=bufsize) as tarf:
+            for tarinfo in tarf:
+                members.append((tarinfo.name, 
+                                tarinfo.size, 
+                                tarinfo.type.decode('ascii'), 
+                                tarinfo.offset, 
+                                tarinfo.offset_data))
+                
+                # Release the TarInfo objects retained by the reader.
+                tarf.members = []
+        
+        return pd.DataFrame(members, columns=TAR_INDEX_COLUMNS)
+
+    def _open_object_file(self, key, blocksize=1024 * 1024, max_blocks=8, size=None):
+        """
+        Open a seekable file view over an object in cloud storage.
+        
+        Args:
+            key (str): Object's key in cloud.
+            
+            blocksize (int): Number of bytes requested per ranged read.
+            
+            max_blocks (int): Number of most recently read blocks kept in memory.
+            
+            size (int): Object's size in bytes. If not applicable, set as default
+                        value (requested via a HeadObject request).
+            
+        Return (RangeFile): Seekable, read-only file over the object's bytes.
+
+        """
+        if size is None:
+            size = self._head_object(key)['ContentLength']
+        return RangeFile(lambda start, end: self._get_object_range(key, start, end), 
+                         size, 
+                         blocksize=blocksize, 
+                         max_blocks=max_blocks)
+
+    @profiled
+    def read_s3_tar_gz_index(self, tar_object_fn, spacing=4 * 1024**2, digests=(), hash_workers=4, size=None):
+        """
+        Extract member details from a gzip-compressed TAR-based object in cloud
+        w/in a single pass, while recording inflate checkpoints.
+
+        Every spacing bytes of uncompressed data, the inflate state (compressed &
+        uncompressed positions along w/ the last 32 KB of uncompressed data) is
+        recorded, so the inflation can later resume from the checkpoint preceding
+        any member rather than from the start of the object. The network reads, the
+        inflation & the header parsing are overlapped (refer to _run_pipeline()).
+        
+        Args:
+            tar_object_fn (str): Gzip-compressed TAR-based object's key in cloud.
+            
+            spacing (int): Number of uncompressed bytes between checkpoints.
+            
+            digests (tuple): Digests of each file member's payload computed w/in the same
+                             pass (refer to read_s3_tar_pipeline()).
+                             Options: 'crc32', 'sha256'
+            
+            hash_workers (int): Number of threads hashing the members' payloads.
+            
+            size (int): Object's size in bytes. If not applicable, set as default
+                        value (requested via a HeadObject request).
+            
+        Return (pd.DataFrame, bytes): TAR member index (offsets refer to the uncompressed
+        archive), along w/ the requested digests, & the checkpoints exported as a gzip index.
+
+        """
+        if indexed_gzip is None:
+            raise ImportError("indexed_gzip is required to record inflate checkpoints.")
+        
+        # The inflater reads the object's blocks in order from the prefetch stage (blocks
+        # requested out of order, if any, are read directly). It reads up to ~3 checkpoint
+        # intervals ahead before seeking back, so the blocks spanning them are kept in memory
+        # & the object is only transferred once.
+        if size is None:
+            size = self._head_object(tar_object_fn)['ContentLength']
+        gzfs = []
+        def inflate(next_chunk, emit):
+            fetched = {'next': 0}
+            def fetch(start, end):
+                if start != fetched['next']:
+                    return self.storage.get_range(tar_object_fn, start, end)
+                data = next_chunk()
+
+                # The prefetch stage ended early (e.g. a failed request) or the pipeline is stopped.
+                if data is None:
+                    raise EOFError(f"{tar_object_fn} ends at byte {start} (expected {size}).")
+                fetched['next'] += len(data)
+                return data
+            
+            fileobj = RangeFile(fetch, size, blocksize=chunk_bytes, max_blocks=4 * spacing // chunk_bytes + 2)
+            gzfs.append(indexed_gzip.IndexedGzipFile(fileobj=fileobj, spacing=spacing, drop_handles=False,
+                                                     readbuf_size=chunk_bytes, buffer_size=chunk_bytes))
+            while True:
+                chunk = gzfs[0].read(chunk_bytes)
+                if not chunk or not emit(chunk):
+                    return
+        
+        # The inflater's cached blocks & read/output buffers are held besides the queued chunks.
+        chunk_bytes = 1024 * 1024
+        held_bytes = (4 * spacing // chunk_bytes + 4) * chunk_bytes
+        hasher = MemberHasher(digests, max_workers=hash_workers) if digests else None
+        members = self._run_pipeline(tar_object_fn, size, inflate, 
+                                     chunk_bytes=chunk_bytes, 
+                                     drain=True, 
+                                     hasher=hasher,
+                                     out_bytes=chunk_bytes, 
+                                     held_bytes=held_bytes)
+        with io.BytesIO() as checkpoints:
+            gzfs[0].export_index(fileobj=checkpoints)
+            gzfs[0].close()
+            return self._tar_index(members, hasher), checkpoints.getvalue()
+
+    def open_s3_tar_gz(self, tar_object_fn, blocksize=256 * 1024):
+        """
+        Open a seekable view of a gzip-compressed TAR-based object's uncompressed
+        archive w/ the object's inflate checkpoints imported.
+
+        Seeking to any position (e.g. a member's data offset) only requests &
+        inflates the compressed bytes following the nearest preceding checkpoint.
+        If the object's current version has no cached checkpoints, they are
+        recorded first w/in a single pass over the object (refer to read_s3_tar_gz_index()).
+        
+        Args:
+            tar_object_fn (str): Gzip-compressed TAR-based object's key in cloud.
+            
+            blocksize (int): Number of compressed bytes requested per ranged read.
+            
+        Return (indexed_gzip.IndexedGzipFile): Seekable, read-only file over the
+        uncompressed archive (positions match the member index's offsets).
+
+        """
+        size, checkpoints = self._get_checkpoints(tar_object_fn)
+        return self._open_tar_gz(tar_object_fn, size, checkpoints, blocksize=blocksize)
+
+    def _get_checkpoints(self, tar_object_fn):
+        """
+        Read the inflate checkpoints of a gzip-compressed TAR-based object's current
+        version from the index cache (recorded first if not cached).
+        
+        Args:
+            tar_object_fn (str): Gzip-compressed TAR-based object's key in cloud.
+            
+        Return (int, bytes): Object's size in bytes & its checkpoints exported as a gzip index.
+
+        """
+        if indexed_gzip is None:
+            raise ImportError("indexed_gzip is required to seek w/in gzip-compressed objects.")
+        
+        head = self._head_object(tar_object_fn)
+        version = (self.bucket_name, tar_object_fn, head['ETag'], head['ContentLength'])
+        checkpoints = self.index_cache.get_checkpoints(*version) if self.index_cache is not None else None
+        if checkpoints is None:
+            tar_index, checkpoints = self.read_s3_tar_gz_index(tar_object_fn, 
+                                                               spacing=self.checkpoint_spacing or 4 * 1024**2,
+                                                               size=head['ContentLength'])
+            if self.index_cache is not None:
+                self.index_cache.put(*version, tar_index, checkpoints)
+        
+        return head['ContentLength'], checkpoints
+
+    def _open_tar_gz(self, tar_object_fn, size, checkpoints, blocksize=256 * 1024):
+        """
+        Open a seekable view of a gzip-compressed TAR-based object's uncompressed
+        archive from its inflate checkpoints.
+        
+        Args:
+            tar_object_fn (str): Gzip-compressed TAR-based object's key in cloud.
+            
+            size (int): Object's size in bytes.
+            
+            checkpoints (bytes): Object's checkpoints exported as a gzip index.
+            
+            blocksize (int): Number of compressed bytes requested per ranged read.
+            
+        Return (indexed_gzip.IndexedGzipFile): Seekable, read-only file over the
+        uncompressed archive.
+
+        """
+        # Reads are buffered per block, so a read only inflates past its checkpoint as needed.
+        # The inflater seeks back towards its checkpoint between reads, so the blocks spanning
+        # two checkpoint intervals are kept in memory.
+        spacing = self.checkpoint_spacing or 4 * 1024**2
+        fileobj = self._open_object_file(tar_object_fn, 
+                                         blocksize=blocksize, 
+                                         max_blocks=2 * spacing // blocksize + 2, 
+                                         size=size)
+        gzf = indexed_gzip.IndexedGzipFile(fileobj=fileobj, 
+                                           spacing=spacing, 
+                                           readbuf_size=blocksize, 
+                                           buffer_size=blocksize, 
+                                           drop_handles=False)
+        with io.BytesIO(checkpoints) as f_handle:
+            gzf.import_index(fileobj=f_handle)
+        return gzf
+    
+    @profiled
+    def read_s3_tar_index(self, tar_object_fn, method='auto', use_cache=True, digests=()):
+        """
+        Extract the member index of a TAR-based object in cloud.
+
+        If the index cache is enabled, the object's ETag & size are requested via a
+        HeadObject request & the object is only read if its current version has not
+        been indexed yet. The object's size is requested once & passed on to the
+        read method.
+        
+        Args:
+            tar_object_fn (str): TAR-based object's key in cloud.
+            
+            method (str): If set to 'ranged', only the header blocks of an uncompressed
+                          TAR-based object will be read via ranged requests. If set to
+                          'stream', the object will be decompressed & read w/in a single
+                          bounded-memory pass. If set to 'pipeline', the object will be read,
+                          decompressed & parsed w/in a single pass by overlapping stages 
+                          (refer to read_s3_tar_pipeline()). If set to 'checkpoint', a gzip-compressed
+                          object will be read w/in a single pass while recording inflate
+                          checkpoints (refer to read_s3_tar_gz_index()). If set to 'download',
+                          the whole object will be downloaded as parallel byte ranges into a
+                          spooled temporary file (refer to download_object()). If set to 'auto', 'ranged'
+                          is applied to uncompressed TAR-based objects, 'checkpoint' to
+                          gzip-compressed TAR-based objects (if checkpoints are enabled &
+                          cached) & 'pipeline' to the remaining gzip, bz2 & xz-compressed 
+                          TAR-based objects (& to uncompressed TAR-based objects if digests
+                          are requested).
+                          Options: 'auto', 'ranged', 'stream', 'pipeline', 'checkpoint', 'download'
+            
+            use_cache (bool): If set to True, the index cache will be checked before & 
+                              updated after reading the object.
+            
+            digests (tuple): Digests of each file member's payload computed w/in the same
+                             pass as the headers (only by the 'pipeline' & 'checkpoint' 
+                             methods). A cached index lacking any of the digests is re-read.
+                             Options: 'crc32', 'sha256'
+            
+        Return (pd.DataFrame): TAR member index comprised of each member's name, size,
+        type, header offset & data offset, along w/ the requested digests.
+
+        """
+        use_cache = use_cache and self.index_cache is not None
+        head = None
+        if use_cache:
+            head = self._head_object(tar_object_fn)
+            version = (self.bucket_name, tar_object_fn, head['ETag'], head['ContentLength'])
+            tar_index = self.index_cache.get(*version)
+            if tar_index is not None and set(digests) <= set(tar_index.columns):
+                return tar_index
+        
+        if head is None and method in ('auto', 'ranged', 'pipeline', 'checkpoint'):
+            head = self._head_object(tar_object_fn)
+        size = head['ContentLength'] if head is not None else None
+        
+        if method == 'auto':
+            reader = self._open_object_reader(tar_object_fn, readahead=BLOCKSIZE, size=size)
+            block = reader.read(0, BLOCKSIZE)
+            if is_tar_header(block):
+                method = 'pipeline' if digests else 'ranged'
+            elif block.startswith(GZIP_MAGIC) and self.checkpoint_spacing and use_cache:
+                method = 'checkpoint'
+            elif block.startswith(tuple(COMPRESSION_MAGICS)):
+                method = 'pipeline'
+            else:
+                method = 'stream'
+        if digests and method not in ('pipeline', 'checkpoint'):
+            raise ValueError(f"Member digests are not computed by the {method} TAR read method.")
+        
+        # Extract all members featured within TAR-based cloud object.
+        checkpoints = None
+        if method == 'ranged':
+            tar_index = self.read_s3_tar_headers(tar_object_fn, size=size)
+        elif method == 'stream':
+            tar_index = self.read_s3_tar_stream(tar_object_fn)
+        elif method == 'pipeline':
+            tar_index = self.read_s3_tar_pipeline(tar_object_fn, digests=digests, size=size)
+        elif method == 'checkpoint':
+            tar_index, checkpoints = self.read_s3_tar_gz_index(tar_object_fn, 
+                                                               spacing=self.checkpoint_spacing or 4 * 1024**2,
+                                                               digests=digests,
+                                                               size=size)
+        elif method == 'download':
+            with self.download_object(tar_object_fn, size=size) as fileobj:
+                with tarfile.open(fileobj=fileobj) as tarf:
+                    members = [(tarinfo.name, 
+                                tarinfo.size, 
+                                tarinfo.type.decode('ascii'), 
+                                tarinfo.offset, 
+                                tarinfo.offset_data) for tarinfo in tarf]
+            tar_index = pd.DataFrame(members, columns=TAR_INDEX_COLUMNS)
+        else:
+            raise ValueError(f"{method} is not a valid TAR read method.")
+        
+        if use_cache:
+            self.index_cache.put(*version, tar_index, checkpoints)
+        if self.profiler is not None:
+            self.profiler.add_keys(len(tar_index))
+        
+        return tar_index
+
+    @profiled
+    def read_s3_object_dirs(self, tar_object_fn, method='auto', save_keys=True, use_cache=True, digests=(), tar_index=None):
+        """
+        Extract directories from TAR-based object in cloud.
+        
+        Args:
+            tar_object_fn (str): TAR-based object's key in cloud.
+            
+            method (str): TAR read method (refer to read_s3_tar_index()).
+                          Options: 'auto', 'ranged', 'stream', 'pipeline', 'checkpoint', 'download'
+            
+            save_keys (bool): If set to True, the list of directories will be saved to
+                              ../results/{bucket}_all_keys.csv.
+            
+            use_cache (bool): If set to True, the TAR member index cached for the object's
+                              current version will be reused (refer to read_s3_tar_index()).
+            
+            digests (tuple): Digests of each file member's payload computed w/in the same
+                             pass as the directories (refer to read_s3_tar_index()).
+                             Options: 'crc32', 'sha256'
+            
+            tar_index (pd.DataFrame): Object's member index already read (refer to 
+                                      read_s3_tar_index()). If not applicable, set as 
+                                      default value.
+            
+        Return (list, list): List of directories & their corresponding size in bytes
+        featured within the TAR-based object in cloud. If digests are requested, a 
+        dictionary of each digest's data map column mapped to its list of digests (in
+        the same order) is returned as well.
+
+        """
+        # Extract all directories & file sizes featured within TAR-based cloud object.
+        if tar_index is None:
+            tar_index = self.read_s3_tar_index(tar_object_fn, method=method, use_cache=use_cache, digests=digests)
+        dir_list = [name.replace('./', '', 1) for name in tar_index['name']]
+        sz_list = tar_index['size'].tolist()
+        
+        # Save list of directories to local ../results directory.
+        if save_keys:
+            with open(f'../results/{self.bucket_name}_all_keys.csv', 'w+', newline ='') as f_handle:
+                for item in dir_list:
+                    f_handle.write(item + '\n')
+            print(f"List of {self.bucket_name} keys saved to ../results.")
+        
+        if digests:
+            return dir_list, sz_list, {MAP_DIGEST_COLUMNS[digest]: tar_index[digest].tolist() for digest in digests}
+        return dir_list, sz_list
+        
+    @profiled
+    def extract_object_details(self, dir_list, tar_file_sz_list=[], feats_dict=None, filter2prefix='', filter_mode='prefix', compact=False, tar_file_feats={}, introspect=False):
+        """
+        Extract key per object from s3 storage w/ filtering option.
+        
+        Args:
+            dir_list (list): List of directories featured within the TAR-based 
+                             object or list of objects' keys within cloud storage.
+            
+            tar_file_sz_list (list): If providing list of directories 
+                                     featured within a TAR-based object, then set as
+                                     list of file sizes featured within TAR-based object 
+                                     (list can be obtained from read_s3_object_dirs()).
+                                     If providing list of objects' keys within cloud storage, 
+                                     then set as an empty list.
+            
+            feats_dict (dict): Dictionary of feature names to be set for a given dataframe's
+                               column (each hierarchical folder/level presented within list 
+                               of directories/keys).  If not applicable, set as None.
+            
+            filter2prefix (str): Prefix of object keys to extract
+                                 from cloud storage. If not applicable, set as default value.
+            
+            filter_mode (str): If set to 'prefix', only the objects whose keys start w/
+                               filter2prefix will be listed from cloud storage (the filter is
+                               pushed down to the listing request). If set to 'substring',
+                               the entire cloud storage will be listed & filtered to the
+                               objects whose keys contain filter2prefix.
+                               Options: 'prefix', 'substring'
+            
+            compact (bool): If set to True, the folder tokens, file formats & (if
+                            repeated) data filenames are dictionary-encoded as categoricals
+                            (each distinct directory is split once), rather than held as
+                            one string per row (refer to memory_report()).
+            
+            tar_file_feats (dict): If providing list of directories featured within a 
+                                   TAR-based object, additional data map columns mapped to
+                                   their list of values per directory (e.g. the payload
+                                   digests obtained from read_s3_object_dirs()). If not 
+                                   applicable, set as default value.
+            
+            introspect (bool): If set to True, the headers of the NetCDF objects listed from
+                               cloud storage are introspected via ranged reads & their file
+                               format, dimensions & variable names are added as data map
+                               columns (refer to read_s3_nc_headers()). TAR members are
+                               introspected via map_tar_object().
+            
+        Return (pd.DataFrame): Dataframe comprised of object names or filenames, 
+        file format, & file size (& the additional details, if provided) with the dataframe's
+        columns set to the desired feature names listed within feats_dict.
+
+        """
+        # For extracting detail of each object stored within cloud storage
+        if filter2prefix != '':
+            if filter_mode == 'prefix':
+                listing = self.get_s3_listing(prefix=filter2prefix)
+            elif filter_mode == 'substring':
+                listing = self.get_s3_listing()
+            else:
+                raise ValueError(f"{filter_mode} is not a valid filter mode.")
+            keys = listing['Key'].astype(object)
+            sizes = listing['Size']
+            is_file = keys.str.contains(filter2prefix, regex=False) & keys.str.contains('.', regex=False)
+
+        # For extracting detail of each file from TAR stored within cloud storage
+        else:
+            n_files = min(len(dir_list), len(tar_file_sz_list))
+            keys = pd.Series(dir_list[:n_files], dtype=object)
+            sizes = pd.Series(tar_file_sz_list[:n_files], dtype='int64')
+            
+            # Factor only files & their respective file size.
+            is_file = keys.str.contains('.', regex=False)
+        keys = keys[is_file.to_numpy(dtype=bool)].reset_index(drop=True)
+        sizes = sizes[is_file.to_numpy(dtype=bool)].reset_index(drop=True)
+        feats = {col: np.asarray(values[:len(is_file)], dtype=object)[is_file.to_numpy(dtype=bool)]
+                 for col, values in tar_file_feats.items()}
+        
+        # Introspect the headers of the NetCDF objects (other files' details are left empty).
+        if introspect and filter2prefix != '':
+            is_nc = keys.str.lower().str.endswith(NC_EXTENSIONS).to_numpy(dtype=bool)
+            headers = self.read_s3_nc_headers(keys[is_nc], sizes[is_nc])
+            for col in NC_HEADER_COLUMNS:
+                feats[col] = np.full(len(keys), '', dtype=object)
+                feats[col][is_nc] = headers[col].to_numpy(dtype=object)
+
+        # Split each file/object's directory/key into its folder tokens & its data filename
+        # (drops the first data file duplicate across column per row).
+        dir_parts = keys.str.rpartition('/')
+        if compact:
+            return self._compact_object_details(dir_parts, sizes, feats_dict).assign(**feats)
+        if (dir_parts[1] == '').all():
+            df = pd.DataFrame(index=keys.index)
+        else:
+            df = dir_parts[0].str.split('/', expand=True)
+            df.columns = range(df.shape[1])
+        df['File Size (Bytes)'] = sizes
+
+        # Feature names to be set for a given dataframe's column 
+        df = df.rename(columns=feats_dict)
+        df.fillna("", inplace=True) 
+
+        # Create a column comprised of the data filenames
+        df['Data File'] = dir_parts[2]
+
+        # Create a column comprised of the data file formats (as per os.path.splitext).
+        df['File Extension'] = df['Data File'].str.extract(r'^\.*[^.].*(\.[^.]*)$', expand=False).fillna('')
+        
+        # Create a column per additional detail of the data files (e.g. payload digests)
+        for col, values in feats.items():
+            df[col] = values
+
+        return df   
+        
+    def _compact_object_details(self, dir_parts, sizes, feats_dict):
+        """
+        Compose the dictionary-encoded counterpart of extract_object_details()'s dataframe.
+        
+        Args:
+            dir_parts (pd.DataFrame): Directory, separator & data filename per file/object.
+            
+            sizes (pd.Series): File size per file/object.
+            
+            feats_dict (dict): Dictionary of feature names to be set for a given dataframe's
+                               column (each hierarchical folder/level).
+            
+        Return (pd.DataFrame): Dataframe w/ categorical folder tokens, data filenames &
+        file formats, & int64 file sizes.
+
+        """
+        # Files share few distinct directories (e.g. every tile file under FV3_fix_tiled/C96),
+        # so only the distinct directories are split & each token column's categories are 
+        # broadcast back to the rows via the directories' codes.
+        dir_codes, dirs = pd.factorize(dir_parts[0])
+        file_codes, files = pd.factorize(dir_parts[2])
+        df = pd.DataFrame(index=dir_parts.index)
+        if not (dir_parts[1] == '').all():
+            dir_tokens = pd.Series(dirs, dtype=object).str.split('/', expand=True).fillna('')
+            for col in dir_tokens.columns:
+                token_codes, tokens = pd.factorize(dir_tokens[col])
+                df[col] = pd.Categorical.from_codes(token_codes[dir_codes], tokens)
+        df['File Size (Bytes)'] = sizes.to_numpy(dtype='int64')
+        df = df.rename(columns=feats_dict)
+        
+        # Data file formats are extracted per distinct data filename (as per os.path.splitext).
+        if len(files) <= len(file_codes) // 2:
+            df['Data File'] = pd.Categorical.from_codes(file_codes, files)
+        else:
+            df['Data File'] = np.asarray(files, dtype=object)[file_codes]
+        exts = pd.Series(files, dtype=object).str.extract(r'^\.*[^.].*(\.[^.]*)$', expand=False).fillna('')
+        ext_codes, exts = pd.factorize(exts)
+        df['File Extension'] = pd.Categorical.from_codes(ext_codes[file_codes], exts)
+        
+        return df
+        
+    def _scan_tokens(self, col, groups):
+        """
+        Scan each distinct token of a column once for a set of token patterns.
+        
+        Args:
+            col (pd.Series): Column featuring path tokens.
+            
+            groups (tuple): Names of the token patterns to scan for (keys of 
+                            TOKEN_PATTERNS, or 'nosym_res').
+            
+        Return (pd.DataFrame): First match per token for each token pattern
+        (NaN if the token does not feature a match).
+
+        """
+        # Tokens repeat across rows (e.g. every tile file under FV3_fix_tiled/C96), so the
+        # distinct tokens are scanned (or served from the memo) & broadcast back to the rows
+        # via their categorical codes.
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            codes, tokens = col.cat.codes.to_numpy(), col.cat.categories
+        else:
+            codes, tokens = pd.factorize(col)
+        scan = pd.DataFrame(TOKEN_SCAN_CACHE.scan(tokens), columns=list(TOKEN_SCAN_CACHE.groups), dtype=object)
+        scan = scan[list(groups)]
+        
+        # Append a row of NaN for missing tokens (categorical code of -1).
+        scan.loc[len(scan)] = None
+        scan = scan.take(np.where(codes == -1, len(scan) - 1, codes))
+        scan.index = col.index
+            
+        return scan.where(scan.notna(), np.nan)
+    
+    @profiled
+    def extract_attributes(self, df, attributes):
+        """
+        Extract multiple attributes w/in a single pass over the dataframe.
+
+        Every column referenced by the attributes is scanned exactly once w/ a single
+        pre-compiled matcher featuring all of the required token patterns. Each attribute
+        is then resolved as the first match seen per row, where each of its token patterns
+        is searched across all of its columns (in priority order) before the next pattern.
+        
+        Args:
+            df (pd.DataFrame): Dataframe to preprocess.
+            
+            attributes (dict): Attributes to extract (keys of ATTRIBUTE_SPECS, e.g. 'cres',
+                               'mx_res', 'version') mapped to the list of columns featuring
+                               details on the attribute, in priority order.
+            
+        Return (pd.DataFrame): Dataframe with each attribute extracted & appended
+        as a new feature column.
+
+        """
+        # Token patterns required per column.
+        col_groups = {}
+        for attr, cols in attributes.items():
+            for col in cols:
+                groups = col_groups.setdefault(col, [])
+                groups.extend(g for g in ATTRIBUTE_SPECS[attr][1] if g not in groups)
+        # Each column's scan (shared by its attributes) & each attribute's extraction are
+        # recorded as stages of the profiler (if attached), w/ the rows featuring a match.
+        scans = {}
+        for col, groups in col_groups.items():
+            with self._stage(f'extract_attributes:scan:{col}') as call:
+                scans[col] = self._scan_tokens(df[col], tuple(groups))
+                call['rows'] = int(scans[col].notna().any(axis=1).sum())
+        
+        for attr, cols in attributes.items():
+            with self._stage(f'extract_attributes:{attr}') as call:
+                feat_col, groups = ATTRIBUTE_SPECS[attr]
+                result = pd.Series(np.nan, index=df.index, dtype=object)
+                for group in groups:
+                    for col in cols:
+                        result = result.where(result.notna(), scans[col][group])
+                df[feat_col] = result
+                call['rows'] = int(result.notna().sum())
+            
+        return df
+    
+    def extract_cres(self, df, res_col_1, res_col_2, res_col_3):
+        """
+        Extract "C" resolution from each file's directory if applicable.
+
+        Applicable to UFS-WM RT input datasets in cloud storage.
+        Currently, the "C" resolutions are featured within multiple foldernames
+        across the keys/directories of the UFS-WM RT input datasets residing in
+        cloud storage, noaa-ufs-regtests-pds. The reason is the due to the current
+        way the data has been strucutured for the UFS-WM RT framework.
+        
+        Args:
+            df (pd.DataFrame): Dataframe to preprocess.
+            
+            res_col_1 (str): Priority column featuring details on
+                             the "C" resolutions.
+            
+            res_col_2 (str): Secondary column featuring details on
+                             the "C" resolutions.
+
+            res_col_3 (str): Tertiary column featuring details on
+                             the "C" resolutions.
+
+        Return (pd.DataFrame): Dataframe with "C" resolutions extracted 
+        & appended as a new feature column.
+
+        """
+        return self.extract_attributes(df, {'cres': [res_col_1, res_col_2, res_col_3]})
+        
+    def extract_first_res(self, df, res_col_1, res_col_2):
+        """
+        Extract first "C" resolution seen per row with priority & secondary feature column set.
+        
+        Applicable to Land DA app's TAR-based object in cloud storage. Currently, 
+        the "C" resolutions are featured within multiple foldernames across the keys/directories
+        of the Land DA app's TAR-based object residing in cloud storage, 
+        noaa-ufs-land-da-pds.
+        
+        Args:
+            df (pd.DataFrame): Dataframe to preprocess
+            
+            res_col_1 (str): Priority column featuring details on
+                             the "C" resolutions.
+            
+            res_col_2 (str): Secondary column featuring details on
+                             the "C" resolutions.
+
+        Return (pd.DataFrame): Dataframe with "C" resolutions extracted 
+        & appended as a new feature column.
+
+        """
+        return self.extract_attributes(df, {'first_res': [res_col_1, res_col_2]})
+        
+    def extract_mx_res(self, df, mx_res_col, mx_res_col2):
+        """
+        Extract "mx" ocean resolution seen per row with priority & secondary feature column set.
+        
+        Args:
+            df (pd.DataFrame): Dataframe to preprocess
+
+            mx_res_col (str): Priority column featuring details on
+                              the "mx" ocean resolutions.
+
+            mx_res_col2 (str): Secondary column featuring details on
+                               the "mx" ocean resolutions.
+            
+        Return (pd.DataFrame): Dataframe with "mx" ocean resolutions extracted 
+        & appended as a new feature column.
+
+        """
+        return self.extract_attributes(df, {'mx_res': [mx_res_col, mx_res_col2]})
+
+    def extract_o_res(self, df, o_res_col):
+        """
+        Extract "o" ocean resolution per row with feature column set.
+        
+        Args:
+            df (pd.DataFrame): Dataframe to preprocess
+            
+            o_res_col (str): Column featuring details on
+                             the "o" ocean resolutions.
+            
+        Return (pd.DataFrame): Dataframe with "o" ocean resolutions extracted 
+        & appended as a new feature column.
+
+        """
+        return self.extract_attributes(df, {'o_res': [o_res_col]})
+
+    def extract_dataset_type(self, df, dataset_type_col):
+        """
+        Extract dataset type per row with feature column set.
+        
+        Args:
+            df (pd.DataFrame): Dataframe to preprocess
+            
+            dataset_type_col (str): Column featuring details on
+                             the dataset type (e.g. baseline & input
+                             UFS-WM RT data).
+            
+        Return (pd.DataFrame): Dataframe with dataset type extracted 
+        & appended as a new feature column.
+
+        """
+        return self.extract_attributes(df, {'dataset_type': [dataset_type_col]})
+
+    def extract_nosym_res(self, df, nosym_res_col):
+        """
+        Extract ocean resolution for which are featured without a symbol declared.
+        
+        Args:
+            df (pd.DataFrame): Dataframe to preprocess.
+            
+            nosym_res_col (str): Column featuring details on the ocean resolution 
+                                 for which does not have a symbol declared.
+            
+        Return (pd.DataFrame): Dataframe with ocean resolutions without 
+        a symbol (e.g. mx, o) extracted & appended as a new feature column.
+
+        """
+        return self.extract_attributes(df, {'nosym_res': [nosym_res_col]})
+        
+    def extract_test_name(self, df, feat_col):
+        """
+        Extract test name from each file's directory if applicable.
+        
+        Args:
+            df (pd.DataFrame): Dataframe to preprocess.
+            
+            feat_col (str): Column featuring details on the data's 
+                            associated test names.
+            
+        Return (pd.DataFrame): Dataframe with test names extracted & 
+        appended as a new feature column.
+
+        """
+        return self.extract_attributes(df, {'test_name': [feat_col]})
+        
+    def extract_compiler(self, df, feat_col):
+        """
+        Extract compiler from each file's directory if applicable.
+        
+        Args:
+            df (pd.DataFrame): Dataframe to preprocess.
+            
+            feat_col (str): Column featuring details on the data's
+                            associated compiler.
+            
+        Return (pd.DataFrame): Dataframe with compiler names extracted &
+        appended as a new feature column.
+
+        """
+        return self.extract_attributes(df, {'compiler': [feat_col]})
+
+    def extract_version(self, df, ver_col_1, ver_col_2):
+        """
+        Extract version seen per row with priority & secondary feature column set.
+        
+        Args:
+            df (pd.DataFrame): Dataframe to preprocess.
+            
+            ver_col_1 (str): Priority column featuring details on
+                             the data's version.
+            
+            ver_col_2 (str): Secondary column featuring details on
+                             the data's version.
+            
+        Return (pd.DataFrame): Dataframe with version dates extracted &
+        appended as a new feature column.
+
+        """
+        return self.extract_attributes(df, {'version': [ver_col_1, ver_col_2]})
+
+    @profiled
+    def map_tar_object(self, tar_object_fn, feats_dict, attributes={}, drop_cols=[], col_order=[], save_keys=True, compact=False, digests=(), introspect=False):
+        """
+        Generate the data map of a TAR-based object in cloud per a mapping spec.
+        
+        Args:
+            tar_object_fn (str): TAR-based object's key in cloud.
+            
+            feats_dict (dict): Dictionary of feature names to be set for a given dataframe's
+                               column (each hierarchical folder/level presented within list 
+                               of directories).
+            
+            attributes (dict): Attributes to extract (keys of ATTRIBUTE_SPECS) mapped to
+                               the list of columns featuring details on the attribute, in
+                               priority order (refer to extract_attributes()).
+            
+            drop_cols (list): Redundant columns to filter out.
+            
+            col_order (list): Columns to re-arrange to the front of the data map, in order.
+            
+            save_keys (bool): If set to True, the TAR-based object's list of directories
+                              will be saved to ../results (refer to read_s3_object_dirs()).
+            
+            compact (bool): If set to True, the data map's text columns are held as
+                            categoricals (refer to compact_map()).
+            
+            digests (tuple): Digests of each data file's payload to add as data map columns,
+                             computed w/in the same pass as the directories (refer to 
+                             read_s3_tar_index()).
+                             Options: 'crc32', 'sha256'
+            
+            introspect (bool): If set to True, the headers of the NetCDF members are
+                               introspected & their file format, dimensions & variable
+                               names are added as data map columns (refer to 
+                               read_s3_tar_nc_headers()).
+            
+        Return (pd.DataFrame): Data map of the TAR-based object.
+
+        """
+        # The member index is read once for both the directories & the introspected headers.
+        tar_index = self.read_s3_tar_index(tar_object_fn, digests=digests)
+        dir_list, sz_list, *dir_digests = self.read_s3_object_dirs(tar_object_fn=tar_object_fn, save_keys=save_keys, digests=digests, tar_index=tar_index)
+        feats = dir_digests[0] if dir_digests else {}
+        feats[MAP_MEMBER_COLUMN] = dir_list
+        if introspect:
+            headers = self.read_s3_tar_nc_headers(tar_object_fn, tar_index=tar_index)
+            details = dict(zip(headers['name'].map(lambda name: name.replace('./', '', 1)), 
+                               headers[NC_HEADER_COLUMNS].values.tolist()))
+            for idx, col in enumerate(NC_HEADER_COLUMNS):
+                feats[col] = [details[name][idx] if name in details else '' for name in dir_list]
+        df = self.extract_object_details(dir_list, sz_list, feats_dict=feats_dict, compact=compact, tar_file_feats=feats)
+        df = self.extract_attributes(df, attributes)
+        if compact:
+            df = self.compact_map(df)
+        df = df.drop(drop_cols, axis=1)
+        for idx, col in enumerate(col_order):
+            df.insert(idx, col, df.pop(col))
+            
+        return df
+
+    @profiled
+    def map_tar_objects(self, tar_object_specs, max_workers=4, max_inflight_bytes=256 * 1024**2, compact=False, digests=(), introspect=False):
+        """
+        Generate the data maps of multiple TAR-based objects in cloud concurrently.
+
+        Each object is mapped by a worker thread, while the bytes requested from cloud
+        storage at the same time by all workers are capped by a shared byte budget.
+        Since every read method holds at most a bounded read buffer per worker (or, for
+        'download', the spooled part of the object), memory stays bounded as well.
+        
+        Args:
+            tar_object_specs (dict): TAR-based objects' keys in cloud mapped to their
+                                     mapping spec (keyword arguments of map_tar_object(),
+                                     e.g. feats_dict, attributes, drop_cols & col_order).
+            
+            max_workers (int): Number of TAR-based objects mapped concurrently.
+            
+            max_inflight_bytes (int): Maximum number of bytes requested from cloud
+                                      storage at the same time across all workers.
+            
+            compact (bool): If set to True, the data maps' text columns are held as
+                            categoricals (refer to compact_map()).
+            
+            digests (tuple): Digests of each data file's payload to add as data map columns
+                             (refer to map_tar_object()), unless set per mapping spec.
+                             Options: 'crc32', 'sha256'
+            
+            introspect (bool): If set to True, the headers of the NetCDF members are added
+                               as data map columns (refer to map_tar_object()), unless set
+                               per mapping spec.
+            
+        Return (dict, pd.DataFrame): Data map per TAR-based object's key & the combined
+        data map of all objects w/ the source object's key set as the 'TAR Object' column.
+
+        """
+        budget = ByteBudget(max_inflight_bytes)
+        token = BATCH_BUDGET.set(budget)
+        try:
+            with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {key: executor.submit(self.map_tar_object, key, save_keys=False, compact=compact, 
+                                                **{'digests': digests, 'introspect': introspect, **spec}) 
+                           for key, spec in tar_object_specs.items()}
+                data_maps = {key: future.result() for key, future in futures.items()}
+        finally:
+            print(f"Peak bytes in flight: {budget.peak} (limit: {max_inflight_bytes}).")
+            BATCH_BUDGET.reset(token)
+        
+        # Combine the data maps in the order of the requested keys.
+        if not data_maps:
+            return data_maps, pd.DataFrame(columns=['TAR Object'])
+        combined_df = pd.concat([df.assign(**{'TAR Object': key}) for key, df in data_maps.items()], 
+                                ignore_index=True)
+        combined_df.insert(0, 'TAR Object', combined_df.pop('TAR Object'))
+        
+        # Categoricals w/ differing categories are concatenated as strings.
+        if compact:
+            combined_df = self.compact_map(combined_df)
+        
+        return data_maps, combined_df
+
+    def select_tar_members(self, tar_index, data_map=None, names=None):
+        """
+        Select file members of a TAR-based object's member index by data map and/or by name.
+        
+        Args:
+            tar_index (pd.DataFrame): TAR member index (refer to read_s3_tar_index()).
+            
+            data_map (pd.DataFrame): Data map (or a filtered subset of one) of the TAR-based
+                                     object. Members are matched on their directories w/in the
+                                     object (refer to MAP_MEMBER_COLUMN, set by map_tar_object()).
+                                     Rows of data maps lacking the members' directories are
+                                     matched on their data filename & file size instead (all
+                                     members sharing both are selected & reported). If not
+                                     applicable, set as None.
+            
+            names (list): Members' directories w/in the TAR-based object (w/ or w/o the
+                          leading './'). If not applicable, set as None.
+            
+        Return (pd.DataFrame): Selected members' index sorted by data offset.
+
+        """
+        files = tar_index[tar_index['type'].isin(FILE_MEMBER_TYPES)]
+        dirs = files['name'].map(lambda name: name.replace('./', '', 1))
+        is_selected = np.zeros(len(files), dtype=bool)
+        if data_map is not None:
+            if MAP_MEMBER_COLUMN in data_map.columns:
+                member_dirs = data_map[MAP_MEMBER_COLUMN].astype(object).fillna('').astype(str)
+            else:
+                member_dirs = pd.Series('', index=data_map.index, dtype=object)
+            is_selected |= dirs.isin(member_dirs[member_dirs != ''].tolist()).to_numpy()
+            
+            # Fall back on the data filename & file size for rows w/o the members' directories.
+            fallback = data_map[(member_dirs == '').to_numpy()]
+            if len(fallback):
+                requested = pd.MultiIndex.from_arrays([fallback['Data File'].astype(str), 
+                                                       fallback['File Size (Bytes)'].astype('int64')])
+                available = pd.MultiIndex.from_arrays([dirs.str.split('/').str[-1], 
+                                                       files['size'].astype('int64')])
+                is_matched = available.isin(requested)
+                n_matches = available[is_matched].value_counts()
+                for (data_file, size), count in n_matches[n_matches > 1].items():
+                    print(f"{data_file} ({size} bytes) is ambiguous w/o its {MAP_MEMBER_COLUMN} "
+                          f"column & matches {count} members: "
+                          f"{', '.join(dirs[is_matched & (available == (data_file, size))])}.")
+                is_selected |= is_matched
+        if names is not None:
+            is_selected |= dirs.isin([name.replace('./', '', 1) for name in names]).to_numpy()
+        
+        return files[is_selected].sort_values('offset_data').reset_index(drop=True)
+
+    def _member_path(self, save_dir, name):
+        """
+        Compose the path an extracted member is saved to (& create its folder).
+        
+        Args:
+            save_dir (str): Folder directory of the extracted members.
+            
+            name (str): Member's directory w/in the TAR-based object.
+            
+        Return (str): Member's path under save_dir.
+
+        """
+        rel_path = os.path.normpath(name)
+        if os.path.isabs(rel_path) or rel_path.split(os.sep)[0] == '..':
+            raise ValueError(f"{name} resolves outside of {save_dir}.")
+        path = os.path.join(save_dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def _member_ranges(self, members, max_gap=4 * BLOCKSIZE, max_range_bytes=64 * 1024**2):
+        """
+        Coalesce the payload byte ranges of members lying close to one another w/in
+        an uncompressed archive.
+        
+        Args:
+            members (pd.DataFrame): Selected members' index sorted by data offset.
+            
+            max_gap (int): Maximum number of unrequested bytes between two payloads
+                           for both payloads to be read via the same ranged request
+                           (by default, adjacent members only, whose payloads are
+                           separated by their padding & header blocks).
+            
+            max_range_bytes (int): Maximum number of bytes of a coalesced range (a
+                                   single member exceeding it is read in pieces).
+            
+        Return (list): List of [start, end, members] per ranged request, where end is
+        inclusive & members is a list of (name, offset_data, size) tuples.
+
+        """
+        ranges = []
+        for name, offset_data, size in zip(members['name'], members['offset_data'], members['size']):
+            end = offset_data + size - 1
+            if ranges and offset_data - ranges[-1][1] - 1 <= max_gap and end - ranges[-1][0] < max_range_bytes:
+                ranges[-1][1] = max(ranges[-1][1], end)
+                ranges[-1][2].append((name, offset_data, size))
+            else:
+                ranges.append([offset_data, end, [(name, offset_data, size)]])
+        return ranges
+
+    def _extract_range(self, tar_object_fn, start, end, members, paths, max_range_bytes):
+        """
+        Extract the members featured w/in a byte range of an uncompressed TAR-based object.
+        
+        Args:
+            tar_object_fn (str): TAR-based object's key in cloud.
+            
+            start (int): Position of the range's first byte.
+            
+            end (int): Position of the range's last byte (inclusive).
+            
+            members (list): Members' (name, offset_data, size) w/in the range.
+            
+            paths (dict): Members' names mapped to their saved paths.
+            
+            max_range_bytes (int): Maximum number of bytes read per ranged request.
+
+        """
+        # A single member exceeding the range limit is copied in pieces.
+        if end - start + 1 > max_range_bytes:
+            name, _, _ = members[0]
+            with open(paths[name], 'wb') as f_handle:
+                for pos in range(start, end + 1, max_range_bytes):
+                    f_handle.write(self._get_object_range(tar_object_fn, pos, min(pos + max_range_bytes, end + 1) - 1))
+            return
+        
+        buf = memoryview(self._get_object_range(tar_object_fn, start, end) if end >= start else b'')
+        for name, offset_data, size in members:
+            with open(paths[name], 'wb') as f_handle:
+                f_handle.write(buf[offset_data - start:offset_data - start + size])
+
+    def _seek_tar_gz(self, gzf, offset, chunk_bytes=1024 * 1024):
+        """
+        Seek w/in the uncompressed archive of a gzip-compressed TAR-based object.
         
         Args:
-            tar_object_fn (str): TAR-based object's key in cloud.
+            gzf (indexed_gzip.IndexedGzipFile): Seekable view of the uncompressed archive
+                                                (refer to _open_tar_gz()).
             
-        Return (list, list): List of directories & their corresponding size in bytes
-        featured within the TAR-based object in cloud.
+            offset (int): Position w/in the uncompressed archive.
+            
+            chunk_bytes (int): Number of uncompressed bytes skipped at a time.
 
         """
-        # Extract all directories & file sizes featured within TAR-based cloud object.
-        s3_object = self.s3.get_object(Bucket=self.bucket_name, Key=tar_object_fn)
-        wholefile = s3_object['Body'].read()
-        fileobj = io.BytesIO(wholefile)
-        tarf = tarfile.open(fileobj=fileobj)
-        dir_list = [tarinfo.name.replace('./', '', 1) for tarinfo in tarf]
-        sz_list = [tarinfo.size for tarinfo in tarf]
-        
-        # Save list of directories to local ../results directory.
-        with open(f'../results/{self.bucket_name}_all_keys.csv', 'w+', newline ='') as f_handle:
-            for item in dir_list:
-                f_handle.write(item + '\n')
-        print(f"List of {self.bucket_name} keys saved to ../results.")
-              
-        return dir_list, sz_list
-        
-    def extract_object_details(self, dir_list, tar_file_sz_list=[], feats_dict=None, filter2prefix=''):
+        # Positions following closely are reached by inflating forward rather than
+        # seeking (a seek resumes the inflation from the preceding checkpoint).
+        gap = offset - gzf.tell()
+        if 0 <= gap < (self.checkpoint_spacing or 4 * 1024**2):
+            while gap > 0:
+                gap -= len(gzf.read(min(gap, chunk_bytes)))
+        else:
+            gzf.seek(offset)
+
+    def _extract_gz_members(self, tar_object_fn, size, checkpoints, members, paths, chunk_bytes=1024 * 1024):
         """
-        Extract key per object from s3 storage w/ filtering option.
+        Extract members of a gzip-compressed TAR-based object by inflating from the
+        checkpoint nearest to each member.
         
         Args:
-            dir_list (list): List of directories featured within the TAR-based 
-                             object or list of objects' keys within cloud storage.
+            tar_object_fn (str): Gzip-compressed TAR-based object's key in cloud.
             
-            tar_file_sz_list (list): If providing list of directories 
-                                     featured within a TAR-based object, then set as
-                                     list of file sizes featured within TAR-based object 
-                                     (list can be obtained from read_s3_object_dirs()).
-                                     If providing list of objects' keys within cloud storage, 
-                                     then set as an empty list.
+            size (int): Object's size in bytes.
             
-            feats_dict (dict): Dictionary of feature names to be set for a given dataframe's
-                               column (each hierarchical folder/level presented within list 
-                               of directories/keys).  If not applicable, set as None.
+            checkpoints (bytes): Object's checkpoints exported as a gzip index.
             
-            filter2prefix (str): Prefix of object keys to extract
-                                 from cloud storage. If not applicable, set as default value.
+            members (list): Members' (name, offset_data, size) sorted by data offset.
             
-        Return (pd.DataFrame): Dataframe comprised of object names or filenames, 
-        file format, & file size with the dataframe's columns set to the desired 
-        feature names listed within feats_dict.
+            paths (dict): Members' names mapped to their saved paths.
+            
+            chunk_bytes (int): Number of uncompressed bytes copied at a time.
 
         """
-        # Create a page iterator
-        paginator = self.s3.get_paginator('list_objects')
-        page_iterator = paginator.paginate(Bucket=self.bucket_name)
+        gzf = self._open_tar_gz(tar_object_fn, size, checkpoints)
+        try:
+            for name, offset_data, member_size in members:
+                self._seek_tar_gz(gzf, offset_data, chunk_bytes=chunk_bytes)
+                with open(paths[name], 'wb') as f_handle:
+                    remaining = member_size
+                    while remaining > 0:
+                        buf = gzf.read(min(remaining, chunk_bytes))
+                        if not buf:
+                            raise EOFError(f"{tar_object_fn} ends w/in member {name}.")
+                        f_handle.write(buf)
+                        remaining -= len(buf)
+        finally:
+            gzf.close()
 
-        # Extract & parse each file/object's directory/key & their corresponding file format & file size
-        key_list=[]
-        sz_list=[]
+    def _extract_stream_members(self, tar_object_fn, paths):
+        """
+        Extract members of a compressed TAR-based object w/in a single streaming pass
+        (stops once all of the members have been extracted).
         
-        # For extracting detail of each object stored within cloud storage
-        if filter2prefix != '':
-            for page in page_iterator:
-                for rc in page['Contents']:
-                    if filter2prefix != '' and filter2prefix in rc.get('Key') and rc.get('Key').count(".") >= 1:
-                        a_tokens =  rc.get('Key').split('/')
-                        key_list.append(a_tokens)
-                        sz_list.append(rc.get('Size'))
-
-        # For extracting detail of each file from TAR stored within cloud storage
-        else:
-            # Factor only files & their respective file size.
-            for idx, (path_dir, file_sz) in enumerate(zip(dir_list, tar_file_sz_list)):
-                if path_dir.count(".") >= 1:
-                    a_tokens = path_dir.split('/')
-                    key_list.append(a_tokens)
-                    sz_list.append(file_sz)
-
-        # Drop first data file duplicate across column per row
-        tokens_drop_list = []
-        for element in key_list:
-            tokens_drop_list.append(element[:-1])
-
-        # Generate a dataframe comprised of the data details
-        df = pd.DataFrame(tokens_drop_list)
-        df['File Size (Bytes)'] = sz_list
-
-        # Feature names to be set for a given dataframe's column 
-        df = df.rename(columns=feats_dict)
-        df.fillna("", inplace=True) 
-
-        # Create a column comprised of the data filenames
-        for idx, token in enumerate(key_list):
-            df.loc[idx, 'Data File'] = token[-1]
+        Args:
+            tar_object_fn (str): TAR-based object's key in cloud.
+            
+            paths (dict): Members' names mapped to their saved paths.
 
-        # Create a column comprised of the data file formats
-        for idx, val in df['Data File'].items():
-            df.loc[idx, 'File Extension'] = os.path.splitext(val)[-1]
+        """
+        pending = set(paths)
+        body = self._open_object_stream(tar_object_fn)
+        try:
+            with tarfile.open(fileobj=body, mode='r|*') as tarf:
+                for tarinfo in tarf:
+                    if tarinfo.name in pending:
+                        with open(paths[tarinfo.name], 'wb') as f_handle:
+                            shutil.copyfileobj(tarf.extractfile(tarinfo), f_handle)
+                        pending.discard(tarinfo.name)
+                    tarf.members = []
+                    if not pending:
+                        break
+        finally:
+            body.close()
 
-        return df   
-        
-    def extract_cres(self, df, res_col_1, res_col_2, res_col_3):
+    @profiled
+    def extract_s3_tar_members(self, tar_object_fn, data_map=None, names=None, save_dir=None, max_workers=8, max_gap=4 * BLOCKSIZE, max_range_bytes=64 * 1024**2, max_inflight_bytes=256 * 1024**2):
         """
-        Extract "C" resolution from each file's directory if applicable.
+        Extract selected members of a TAR-based object in cloud w/o reading the whole object.
 
-        Applicable to UFS-WM RT input datasets in cloud storage.
-        Currently, the "C" resolutions are featured within multiple foldernames
-        across the keys/directories of the UFS-WM RT input datasets residing in
-        cloud storage, noaa-ufs-regtests-pds. The reason is the due to the current
-        way the data has been strucutured for the UFS-WM RT framework.
+        Members of an uncompressed object are read via ranged requests spanning their
+        payloads (the ranges of nearby members are coalesced into a single request).
+        Members of a gzip-compressed object are inflated from their nearest preceding
+        checkpoint (refer to open_s3_tar_gz()). Members of other compressed objects are
+        extracted w/in a single streaming pass. The requests are issued concurrently.
         
         Args:
-            df (pd.DataFrame): Dataframe to preprocess.
+            tar_object_fn (str): TAR-based object's key in cloud.
             
-            res_col_1 (str): Priority column featuring details on
-                             the "C" resolutions.
+            data_map (pd.DataFrame): Data map (or a filtered subset of one) of the members to
+                                     extract (refer to select_tar_members()). Rows of a combined
+                                     data map are limited to those of the object's 'TAR Object'.
+                                     If not applicable, set as None.
             
-            res_col_2 (str): Secondary column featuring details on
-                             the "C" resolutions.
-
-            res_col_3 (str): Tertiary column featuring details on
-                             the "C" resolutions.
-
-        Return (pd.DataFrame): Dataframe with "C" resolutions extracted 
-        & appended as a new feature column.
+            names (list): Members' directories w/in the TAR-based object. If not applicable,
+                          set as None.
+            
+            save_dir (str): Folder directory the members are saved to (w/ their directories
+                            w/in the TAR-based object preserved). If not applicable, set as
+                            default value (../results/extracted/{object's filename}).
+            
+            max_workers (int): Number of concurrent requests.
+            
+            max_gap (int): Maximum number of unrequested bytes between the payloads read via
+                           the same ranged request (uncompressed objects only).
+            
+            max_range_bytes (int): Maximum number of bytes read per ranged request
+                                   (uncompressed objects only).
+            
+            max_inflight_bytes (int): Maximum number of bytes requested from cloud storage
+                                      at the same time across all requests.
+            
+        Return (pd.DataFrame): Extracted members' index w/ their saved path set as the
+        'Saved Path' column.
 
         """
-        for idx, row in df[[res_col_1, res_col_2, res_col_3]].iterrows():
-            res = [x for x in row if re.search(r'C\d{2,4}', x)]
-            res2 = [x for x in row if re.search(r'data\d{2,4}', x)]
-            res3 = [x for x in row if re.search(r'C\d{2,4}(.*?)\.', x)]
-            if res:
-                df.loc[idx, 'Resolution (C)']= re.findall(r'C\d{2,4}', res[0])[0].replace('C','')
-            elif res2:
-                df.loc[idx, 'Resolution (C)']= re.findall(r'data\d{2,4}', res2[0])[0].replace('data','')
-            elif res3:
-                df.loc[idx, 'Resolution (C)']= re.findall(r'C\d{2,4}', res3[0])[0].replace('C','')
-            else:
-                df.loc[idx, 'Resolution (C)']= np.nan
-              
-        return df
+        if data_map is not None and 'TAR Object' in data_map.columns:
+            data_map = data_map[data_map['TAR Object'] == tar_object_fn]
+        members = self.select_tar_members(self.read_s3_tar_index(tar_object_fn), data_map, names)
+        if save_dir is None:
+            save_dir = f'../results/extracted/{os.path.basename(tar_object_fn)}'
+        paths = {name: self._member_path(save_dir, name) for name in members['name']}
+        member_list = list(zip(members['name'], members['offset_data'], members['size']))
         
-    def extract_first_res(self, df, res_col_1, res_col_2):
-        """
-        Extract first "C" resolution seen per row with priority & secondary feature column set.
+        token = BATCH_BUDGET.set(ByteBudget(max_inflight_bytes))
+        try:
+            block = self._get_object_range(tar_object_fn, 0, BLOCKSIZE - 1)
+            with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+                if not member_list:
+                    futures = []
+                elif is_tar_header(block):
+                    futures = [executor.submit(self._extract_range, tar_object_fn, start, end, group, paths, max_range_bytes) 
+                               for start, end, group in self._member_ranges(members, max_gap, max_range_bytes)]
+                elif block.startswith(GZIP_MAGIC) and indexed_gzip is not None:
+                    
+                    # Each worker inflates a contiguous run of members w/ its own inflater.
+                    size, checkpoints = self._get_checkpoints(tar_object_fn)
+                    futures = [executor.submit(self._extract_gz_members, tar_object_fn, size, checkpoints, 
+                                               [member_list[idx] for idx in run], paths) 
+                               for run in np.array_split(np.arange(len(member_list)), max_workers) if len(run)]
+                else:
+                    futures = [executor.submit(self._extract_stream_members, tar_object_fn, paths)]
+                for future in futures:
+                    future.result()
+        finally:
+            BATCH_BUDGET.reset(token)
         
-        Applicable to Land DA app's TAR-based object in cloud storage. Currently, 
-        the "C" resolutions are featured within multiple foldernames across the keys/directories
-        of the Land DA app's TAR-based object residing in cloud storage, 
-        noaa-ufs-land-da-pds.
+        members['Saved Path'] = members['name'].map(paths)
+        print(f"{len(members)} members ({members['size'].sum()} bytes) of {tar_object_fn} extracted to {save_dir}.")
+        
+        return members
+
+    def _open_header_reader(self, fetch, size, head_bytes=16 * 1024, max_blocks=64):
+        """
+        Open a reader of a data file's header w/ the file's bytes read as blocks of
+        head_bytes (the header of most data files is served by the first block).
         
         Args:
-            df (pd.DataFrame): Dataframe to preprocess
+            fetch (callable): Function w/ signature fetch(start, end) returning the
+                              file's bytes within the inclusive range.
             
-            res_col_1 (str): Priority column featuring details on
-                             the "C" resolutions.
+            size (int): File's size in bytes.
             
-            res_col_2 (str): Secondary column featuring details on
-                             the "C" resolutions.
-
-        Return (pd.DataFrame): Dataframe with "C" resolutions extracted 
-        & appended as a new feature column.
+            head_bytes (int): Number of bytes requested per ranged read.
+            
+            max_blocks (int): Number of most recently read blocks kept in memory.
+            
+        Return (callable): Function w/ signature read(offset, length) returning the
+        file's bytes (truncated at the end of the file).
 
         """
-        for idx, row in df[[res_col_1, res_col_2]].iterrows():
-            res = [x for x in row if re.search(r'C\d{2,3}', x)]
-            if res:
-                df.loc[idx, 'Resolution (C)']= re.findall(r'C\d{2,3}', res[0])[0].replace('C','')
-            else:
-                df.loc[idx, 'Resolution (C)']= np.nan
-              
-        return df
+        fileobj = RangeFile(fetch, size, blocksize=head_bytes, max_blocks=max_blocks)
+        def read(offset, length):
+            
+            # Lengths decoded from a corrupt header are bounded by the file's size.
+            fileobj.seek(offset)
+            return fileobj.read(max(min(length, size - offset), 0))
         
-    def extract_mx_res(self, df, mx_res_col, mx_res_col2):
+        return read
+
+    def _nc_header_details(self, read, name):
         """
-        Extract "mx" ocean resolution seen per row with priority & secondary feature column set.
+        Introspect a data file's header as data map details.
         
         Args:
-            df (pd.DataFrame): Dataframe to preprocess
-
-            mx_res_col (str): Priority column featuring details on
-                              the "mx" ocean resolutions.
-
-            mx_res_col2 (str): Secondary column featuring details on
-                               the "mx" ocean resolutions.
+            read (callable): Function w/ signature read(offset, length) returning the
+                             file's bytes.
             
-        Return (pd.DataFrame): Dataframe with "mx" ocean resolutions extracted 
-        & appended as a new feature column.
+            name (str): Data file's key or directory (reported if the header cannot be parsed).
+            
+        Return (list): File format ('Unknown' if neither NetCDF nor HDF5), dimensions
+        (name=length) & variable names, in order of definition (empty if the header 
+        cannot be parsed or read).
 
         """
-        for idx, row in df.iterrows():
-            mx_res = re.findall('mx\d{2,3}', row[mx_res_col])
-            mx_res2 = re.findall('mx\d{2,3}', row[mx_res_col2])
-            if mx_res:
-                df.loc[idx, 'Ocean Resolution (mx)']= mx_res[0].replace('mx','')
-            elif mx_res2:
-                df.loc[idx, 'Ocean Resolution (mx)']= mx_res2[0].replace('mx','')
-            else:
-                df.loc[idx, 'Ocean Resolution (mx)']= np.nan
-                
-        return df
+        try:
+            header = read_netcdf_header(read)
+        except (ValueError, EOFError) as e:
+            print(f"Header of {name} could not be parsed: {e}")
+            return ['', '', '']
+        except REQUEST_ERRORS as e:
+            print(f"Header of {name} could not be read: {e}")
+            return ['', '', '']
+        
+        return [header['format'] or 'Unknown',
+                ', '.join(f'{dim}={length}' for dim, length in header['dimensions'].items()),
+                ', '.join(header['variables'])]
 
-    def extract_o_res(self, df, o_res_col):
+    @profiled
+    def read_s3_nc_headers(self, keys, sizes=None, max_workers=32, head_bytes=16 * 1024):
         """
-        Extract "o" ocean resolution per row with feature column set.
+        Introspect the headers of NetCDF/HDF5 objects in cloud w/o downloading them.
+
+        Only the first head_bytes of each object are requested (further blocks are
+        requested only for headers extending past them, e.g. HDF5 files featuring many
+        variables), w/ the objects introspected concurrently.
         
         Args:
-            df (pd.DataFrame): Dataframe to preprocess
+            keys (list): Objects' keys in cloud.
             
-            o_res_col (str): Column featuring details on
-                             the "o" ocean resolutions.
+            sizes (list): Objects' sizes in bytes (e.g. from get_s3_listing()). If not 
+                          applicable, set as default value (requested via HeadObject requests).
             
-        Return (pd.DataFrame): Dataframe with "o" ocean resolutions extracted 
-        & appended as a new feature column.
+            max_workers (int): Number of objects introspected concurrently.
+            
+            head_bytes (int): Number of bytes requested per ranged read.
+            
+        Return (pd.DataFrame): File format, dimensions & variable names (refer to
+        NC_HEADER_COLUMNS) per object's key (as the 'Key' column).
 
         """
-        for idx, row in df.iterrows():
-            res = re.findall('o\d{2,3}', row[o_res_col])
-            if res:
-                df.loc[idx, 'Ocean Resolution (o)']= res[0].replace('o','')
-            else:
-                df.loc[idx, 'Ocean Resolution (o)']= np.nan
-                
+        # Objects failing to be read (e.g. deleted since listed) are reported & left empty.
+        def introspect(key, size):
+            if size is None:
+                try:
+                    size = self._head_object(key)['ContentLength']
+                except REQUEST_ERRORS as e:
+                    print(f"Header of {key} could not be read: {e}")
+                    return ['', '', '']
+            read = self._open_header_reader(lambda start, end: self._get_object_range(key, start, end), 
+                                            size, 
+                                            head_bytes=head_bytes)
+            return self._nc_header_details(read, key)
+        
+        keys = list(keys)
+        sizes = [None] * len(keys) if sizes is None else list(sizes)
+        with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+            details = list(executor.map(introspect, keys, sizes))
+        
+        df = pd.DataFrame(details, columns=NC_HEADER_COLUMNS)
+        df.insert(0, 'Key', keys)
+        
         return df
 
-    def extract_dataset_type(self, df, dataset_type_col):
+    def _read_gz_nc_headers(self, tar_object_fn, size, checkpoints, members, head_bytes=16 * 1024):
         """
-        Extract dataset type per row with feature column set.
+        Introspect the headers of members of a gzip-compressed TAR-based object by
+        inflating from the checkpoint nearest to each member.
         
         Args:
-            df (pd.DataFrame): Dataframe to preprocess
+            tar_object_fn (str): Gzip-compressed TAR-based object's key in cloud.
             
-            dataset_type_col (str): Column featuring details on
-                             the dataset type (e.g. baseline & input
-                             UFS-WM RT data).
+            size (int): Object's size in bytes.
             
-        Return (pd.DataFrame): Dataframe with dataset type extracted 
-        & appended as a new feature column.
+            checkpoints (bytes): Object's checkpoints exported as a gzip index.
+            
+            members (list): Members' (name, offset_data, size) sorted by data offset.
+            
+            head_bytes (int): Number of uncompressed bytes read per block of a member.
+            
+        Return (list): Header details per member (refer to _nc_header_details()).
 
         """
-        for idx, row in df.iterrows():
-            data_type1 = re.findall('develop-\d{8}', row[dataset_type_col])
-            data_type2 = re.findall('input-data-\d{8}', row[dataset_type_col])
-            if data_type1:
-                df.loc[idx, 'Dataset Type']= re.findall(r'develop-\d{8}', data_type1[0])[0]
-            elif data_type2:
-                df.loc[idx, 'Dataset Type']= re.findall(r'input-data-\d{8}', data_type2[0])[0]
-            else:
-                df.loc[idx, 'Dataset Type']= np.nan
+        gzf = self._open_tar_gz(tar_object_fn, size, checkpoints)
+        details = []
+        try:
+            for name, offset_data, member_size in members:
+                def fetch(start, end):
+                    self._seek_tar_gz(gzf, offset_data + start)
+                    return gzf.read(end - start + 1)
                 
-        return df
+                details.append(self._nc_header_details(self._open_header_reader(fetch, member_size, head_bytes=head_bytes), name))
+        finally:
+            gzf.close()
+        
+        return details
 
-    def extract_nosym_res(self, df, nosym_res_col):
+    def _read_stream_nc_headers(self, tar_object_fn, members, max_header_bytes=64 * 1024**2):
         """
-        Extract ocean resolution for which are featured without a symbol declared.
+        Introspect the headers of members of a compressed TAR-based object w/in a single
+        streaming pass (stops once all of the members have been introspected).
+
+        Each member's payload is buffered only as far as its header is read, since the
+        stream cannot be read backwards.
         
         Args:
-            df (pd.DataFrame): Dataframe to preprocess.
+            tar_object_fn (str): Compressed TAR-based object's key in cloud.
             
-            nosym_res_col (str): Column featuring details on the ocean resolution 
-                                 for which does not have a symbol declared.
+            members (list): Members' (name, offset_data, size) sorted by data offset.
             
-        Return (pd.DataFrame): Dataframe with ocean resolutions without 
-        a symbol (e.g. mx, o) extracted & appended as a new feature column.
+            max_header_bytes (int): Maximum number of bytes buffered per member (headers
+                                    extending past them are left empty).
+            
+        Return (list): Header details per member (refer to _nc_header_details()). Members
+        the stream fails to reach are left empty.
 
         """
-        for idx, row in df.iterrows():
-            if row[nosym_res_col].isnumeric() and len(row[nosym_res_col])<=3 and len(row[nosym_res_col])>=2:
-                df.loc[idx, 'Ocean Resolution (w/o symbol)']= row[nosym_res_col]
-            else:
-                df.loc[idx, 'Ocean Resolution (w/o symbol)']= np.nan
-                
-        return df
+        details = dict.fromkeys((name for name, _, _ in members), ['', '', ''])
+        pending = set(details)
+        body = self._open_object_stream(tar_object_fn)
+        try:
+            with tarfile.open(fileobj=body, mode='r|*') as tarf:
+                for tarinfo in tarf:
+                    if tarinfo.name in pending:
+                        fileobj = tarf.extractfile(tarinfo)
+                        payload = bytearray()
+                        def read(offset, length):
+                            end = min(offset + length, tarinfo.size)
+                            if end > max_header_bytes:
+                                raise EOFError(f"header extends past the first {max_header_bytes} bytes buffered")
+                            if end > len(payload):
+                                payload.extend(fileobj.read(end - len(payload)))
+                            return bytes(payload[offset:end])
+                        
+                        details[tarinfo.name] = self._nc_header_details(read, tarinfo.name)
+                        pending.discard(tarinfo.name)
+                    tarf.members = []
+                    if not pending:
+                        break
+        except (tarfile.TarError, EOFError) + REQUEST_ERRORS as e:
+            print(f"Headers of {len(pending)} members of {tar_object_fn} could not be read: {e}")
+        finally:
+            body.close()
         
-    def extract_test_name(self, df, feat_col):
+        return [details[name] for name, _, _ in members]
+
+    @profiled
+    def read_s3_tar_nc_headers(self, tar_object_fn, data_map=None, names=None, max_workers=32, head_bytes=16 * 1024, tar_index=None):
         """
-        Extract test name from each file's directory if applicable.
+        Introspect the headers of NetCDF/HDF5 members of a TAR-based object in cloud 
+        w/o extracting the members.
+
+        Members of an uncompressed object are read via ranged requests w/in their
+        payloads (only the first head_bytes of each member, unless its header extends
+        past them). Members of a gzip-compressed object are inflated from their nearest
+        preceding checkpoint (refer to open_s3_tar_gz()). The members are introspected
+        concurrently. Members of other compressed objects (or of gzip-compressed objects
+        w/o indexed_gzip) are introspected w/in a single streaming pass.
         
         Args:
-            df (pd.DataFrame): Dataframe to preprocess.
+            tar_object_fn (str): TAR-based object's key in cloud.
             
-            feat_col (str): Column featuring details on the data's 
-                            associated test names.
+            data_map (pd.DataFrame): Data map (or a filtered subset of one) of the members to
+                                     introspect (refer to select_tar_members()). If not 
+                                     applicable, set as None.
             
-        Return (pd.DataFrame): Dataframe with test names extracted & 
-        appended as a new feature column.
+            names (list): Members' directories w/in the TAR-based object. If not applicable,
+                          set as None.
+            
+            max_workers (int): Number of members (or, for gzip-compressed objects, runs of 
+                               members) introspected concurrently.
+            
+            head_bytes (int): Number of bytes read per block of a member.
+            
+            tar_index (pd.DataFrame): Object's member index already read (refer to 
+                                      read_s3_tar_index()). If not applicable, set as 
+                                      default value.
+            
+        Return (pd.DataFrame): Introspected members' index w/ their file format, dimensions
+        & variable names (refer to NC_HEADER_COLUMNS). If neither a data map nor names are
+        set, all members w/ a NetCDF extension (refer to NC_EXTENSIONS) are introspected.
 
         """
-        for idx, row in df.iterrows():
-            if row[feat_col].count("_") >= 1:
-                df.loc[idx, 'Test Name'] = row[feat_col].rpartition('_')[0]
-            else:
-                df.loc[idx, 'Test Name'] = np.nan
+        if tar_index is None:
+            tar_index = self.read_s3_tar_index(tar_object_fn)
+        if data_map is None and names is None:
+            names = tar_index['name'][tar_index['name'].str.lower().str.endswith(NC_EXTENSIONS)].tolist()
+        members = self.select_tar_members(tar_index, data_map, names)
+        member_list = list(zip(members['name'], members['offset_data'], members['size']))
+        
+        block = self._get_object_range(tar_object_fn, 0, BLOCKSIZE - 1)
+        with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+            if not member_list:
+                details = []
+            elif is_tar_header(block):
+                def introspect(name, offset_data, member_size):
+                    fetch = lambda start, end: self._get_object_range(tar_object_fn, offset_data + start, offset_data + end)
+                    return self._nc_header_details(self._open_header_reader(fetch, member_size, head_bytes=head_bytes), name)
                 
-        return df
+                details = list(executor.map(lambda member: introspect(*member), member_list))
+            elif block.startswith(GZIP_MAGIC) and indexed_gzip is not None:
+                
+                # Each worker inflates a contiguous run of members w/ its own inflater.
+                size, checkpoints = self._get_checkpoints(tar_object_fn)
+                futures = [executor.submit(self._read_gz_nc_headers, tar_object_fn, size, checkpoints, 
+                                           [member_list[idx] for idx in run], head_bytes) 
+                           for run in np.array_split(np.arange(len(member_list)), max_workers) if len(run)]
+                details = [detail for future in futures for detail in future.result()]
+            else:
+                details = self._read_stream_nc_headers(tar_object_fn, member_list)
         
-    def extract_compiler(self, df, feat_col):
+        members = pd.concat([members, pd.DataFrame(details, columns=NC_HEADER_COLUMNS, index=members.index)], axis=1)
+        print(f"Headers of {len(members)} members of {tar_object_fn} introspected.")
+        
+        return members
+
+    def read_local_tar_dirs(self, tar_fn):
         """
-        Extract compiler from each file's directory if applicable.
+        [Optional] Extract directories featured within a TAR saved on local disk.
+
+        Uncompressed TARs are scanned via a memory mapping (refer to tar_scanner.scan_tar_mmap()),
+        compressed TARs w/in a single streaming pass.
         
         Args:
-            df (pd.DataFrame): Dataframe to preprocess.
-            
-            feat_col (str): Column featuring details on the data's
-                            associated compiler.
+            tar_fn (str): Name of TAR (include file extension).
             
-        Return (pd.DataFrame): Dataframe with compiler names extracted &
-        appended as a new feature column.
+        Return (list, list): List of directories & their corresponding size in bytes
+        featured within TAR saved on local disk.
 
         """
-        for idx, row in df.iterrows():
-            if row[feat_col].count("_") >= 1:
-                df.loc[idx, 'Compiler'] = row[feat_col].split('_')[-1]
-            else:
-                df.loc[idx, 'Compiler'] = np.nan
-        
-        return df
+        tar_index = scan_local_tar(tar_fn)
+        dir_list = [name.replace('./', '', 1) for name in tar_index['name']]
+        sz_list = tar_index['size'].tolist()
+              
+        return dir_list, sz_list
 
-    def extract_version(self, df, ver_col_1, ver_col_2):
+    @profiled
+    def read_local_tar_dir(self, tar_dir, pattern='*.tar*', max_workers=None):
         """
-        Extract version seen per row with priority & secondary feature column set.
+        [Optional] Extract directories featured within all TARs saved under a folder on
+        local disk, scanning the TARs in parallel w/ a pool of processes.
         
         Args:
-            df (pd.DataFrame): Dataframe to preprocess.
+            tar_dir (str): Folder directory of the TARs (searched recursively).
             
-            ver_col_1 (str): Priority column featuring details on
-                             the data's version.
+            pattern (str): Filename pattern of the TARs.
             
-            ver_col_2 (str): Secondary column featuring details on
-                             the data's version.
+            max_workers (int): Number of processes (defaults to the number of CPUs).
             
-        Return (pd.DataFrame): Dataframe with version dates extracted &
-        appended as a new feature column.
+        Return (dict): TARs' paths relative to tar_dir mapped to their list of directories
+        & their corresponding size in bytes.
 
         """
-        for idx, row in df[[ver_col_1, ver_col_2]].iterrows():
-            ver = [x for x in row if re.search(r'[0-9]{4}-[0-9]{2}', x)]
-            ver2 = [x for x in row if re.search(r'[0-9]{4}', x)]
-            if ver:
-                df.loc[idx, 'YYYY']= re.findall(r'[0-9]{4}-[0-9]{2}', ver[0])[0]
-            elif ver2:
-                df.loc[idx, 'YYYY']= re.findall(r'[0-9]{4}', ver2[0])[0]
-            else:
-                df.loc[idx, 'YYYY']= np.nan
+        tar_fns = sorted(str(fn) for fn in Path(tar_dir).rglob(pattern) if fn.is_file())
+        dirs = {}
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for tar_fn, tar_index in zip(tar_fns, executor.map(scan_local_tar, tar_fns)):
+                key = os.path.relpath(tar_fn, tar_dir).replace(os.sep, '/')
+                dirs[key] = ([name.replace('./', '', 1) for name in tar_index['name']], 
+                             tar_index['size'].tolist())
+              
+        return dirs
+
+    def compact_map(self, df):
+        """
+        Dictionary-encode a data map's text columns as categoricals & hold its file
+        sizes as int64, so each distinct value (e.g. 'FV3_fix_tiled', 'develop-20231122')
+        is stored once rather than once per row. Columns w/ mostly distinct values (e.g.
+        the data filenames of time series outputs) are kept as strings.
+
+        Args:
+            df (pd.DataFrame): Data map.
+
+        Return (pd.DataFrame): Compact data map (the values are unchanged).
+
+        """
+        for col in df.columns:
+            if col in MAP_SIZE_COLUMNS:
+                df[col] = df[col].astype('int64')
+            elif df[col].dtype == object and df[col].nunique() <= len(df) // 2:
+                df[col] = df[col].astype('category')
+        
         return df
 
-    def read_local_tar_dirs(self, tar_fn):
+    def memory_report(self, df):
         """
-        [Optional] Extract directories featured within a TAR saved on local disk.
+        Report the memory held by each of a data map's columns.
+
+        Args:
+            df (pd.DataFrame): Data map.
+
+        Return (pd.DataFrame): Dtype, number of distinct values & bytes held (incl. the
+        strings referenced) per column, w/ the data map's number of rows & total bytes
+        as the last row.
+
+        """
+        report = pd.DataFrame({'Dtype': df.dtypes.astype(str),
+                               'Distinct Values': df.nunique(),
+                               'Bytes': df.memory_usage(index=False, deep=True)})
+        report.loc['Total'] = ['', len(df), report['Bytes'].sum() + df.index.memory_usage(deep=True)]
+        report.index.name = 'Column'
         
+        return report
+
+    def apply_map_dtypes(self, df):
+        """
+        Convert a data map's columns to compact dtypes: file sizes as int64,
+        resolutions as nullable integers & the remaining text columns (other
+        than the data filenames, TAR members' directories & digests) as categoricals.
+
         Args:
-            tar_fn (str): Name of TAR (include file extension).
-            
-        Return (list): List of directories featured within TAR saved on 
-        local disk.
+            df (pd.DataFrame): Data map.
+
+        Return (pd.DataFrame): Data map w/ converted dtypes & string column names.
 
         """
-        with tarfile.open(tar_fn) as tar:
-            dir_list= [str(tarinfo) for tarinfo in tar.getmembers()]
-              
-        return dir_list
+        df = df.copy()
+        df.columns = [str(col) for col in df.columns]
+        for col in df.columns:
+            if col in MAP_SIZE_COLUMNS:
+                df[col] = df[col].astype('int64')
+            elif col in MAP_RES_COLUMNS:
+                values = df[col].astype(object).replace('', np.nan)
+                numbers = pd.to_numeric(values, errors='coerce')
+                
+                # Resolutions featuring non-numeric values are kept as categories.
+                if numbers.notna().sum() == values.notna().sum():
+                    df[col] = numbers.astype('Int64')
+                else:
+                    df[col] = values.astype('category')
+            elif col not in ['Data File', MAP_MEMBER_COLUMN] and col not in MAP_DIGEST_COLUMNS.values() and df[col].dtype == object:
+                df[col] = df[col].astype('category')
+        
+        return df
 
-    def save_data(self, df, save_fn):
+    @profiled
+    def save_data(self, df, save_fn, partition_rows=1000000):
         """
-        Save dataframe as csv file.
+        Save dataframe as a csv, xlsx, Parquet or Feather file (as per the filename's
+        extension).
+
+        Parquet & Feather files are saved w/ compact dtypes (refer to apply_map_dtypes()).
+        Parquet maps w/ at least partition_rows rows featuring a 'Dataset' column are
+        saved as a folder hive-partitioned by dataset (e.g. Dataset=develop-20231122/), so
+        a single dataset can be loaded w/o reading the others (refer to load_data()).
 
         Args:
-            df (pd.DataFrame): Dataframe to save as csv file.
+            df (pd.DataFrame): Dataframe to save.
             
-            save_fn (str): Filename to save as csv.
+            save_fn (str): Filename to save as.
+                           Options: '*.csv', '*.xlsx', '*.parquet', '*.feather'
+            
+            partition_rows (int): Minimum number of rows of a Parquet map partitioned by
+                                  dataset. If set to None, maps are never partitioned.
 
         Return: None
 
         """
-        df.to_csv(save_fn,
-                  index=False)
+        file_format = os.path.splitext(save_fn)[1]
+        if file_format == '.csv':
+            df.to_csv(save_fn,
+                      index=False)
+        elif file_format == '.xlsx':
+            df.to_excel(save_fn, 
+                        index=False, 
+                        engine='xlsxwriter')
+        elif file_format == '.parquet':
+            df = self.apply_map_dtypes(df)
+            if partition_rows is not None and len(df) >= partition_rows and MAP_PARTITION_COLUMN in df.columns:
+                
+                # Replace any previous map (a folder of partitions or a single file).
+                if os.path.isdir(save_fn):
+                    shutil.rmtree(save_fn)
+                elif os.path.exists(save_fn):
+                    os.remove(save_fn)
+                df.to_parquet(save_fn, 
+                              index=False, 
+                              partition_cols=[MAP_PARTITION_COLUMN])
+            else:
+                df.to_parquet(save_fn, 
+                              index=False)
+        elif file_format == '.feather':
+            self.apply_map_dtypes(df).reset_index(drop=True).to_feather(save_fn)
+        else:
+            raise ValueError(f"{file_format} is not a supported data map format.")
 
         print(f"Data map saved to {save_fn}.")
 
         return
 
-    def consolidate_maps(self, rt_bl_date, rt_input_date, tar_fn, land_da_version):
+    @profiled
+    def load_data(self, save_fn, filters=None, columns=None):
+        """
+        Load a data map saved via save_data() as a csv, Parquet or Feather file.
+
+        Args:
+            save_fn (str): Filename (or partitioned folder) of the data map.
+                           Options: '*.csv', '*.parquet', '*.feather'
+            
+            filters (list): Filters as (column, operator, value) tuples, all of which must
+                            hold (e.g. [('Dataset', '==', 'develop-20231122')]). For Parquet
+                            maps, the filters are pushed down to the reader, so only the
+                            matching partitions & row groups are read. If not applicable, 
+                            set as None.
+                            Operators: '==', '!=', '<', '<=', '>', '>=', 'in', 'not in'
+                            (& 'startswith' for csv & Feather maps)
+            
+            columns (list): Columns to load. If not applicable, set as None (all columns).
+
+        Return (pd.DataFrame): Data map.
+
+        """
+        file_format = os.path.splitext(save_fn)[1]
+        if file_format == '.parquet':
+            return pd.read_parquet(save_fn, 
+                                   columns=columns, 
+                                   filters=[tuple(f) for f in filters] if filters else None)
+        
+        if file_format == '.csv':
+            df = pd.read_csv(save_fn, usecols=columns)
+        elif file_format == '.feather':
+            df = pd.read_feather(save_fn, columns=columns)
+        else:
+            raise ValueError(f"{file_format} is not a supported data map format.")
+        
+        for col, op, val in (filters or []):
+            df = df[FILTER_OPS[op](df[col], val).fillna(False).to_numpy(dtype=bool)]
+        
+        return df.reset_index(drop=True)
+
+    @profiled
+    def consolidate_maps(self, rt_bl_date, rt_input_date, tar_fn, land_da_version, selections=LAND_DA_TEST_CASE_SELECTIONS):
         """
         Save dataframe as .xlsx file.
 
@@ -482,46 +3036,35 @@ class DataMapGenerator():
                           (e.g. Landdav{version}_input_data.tar.gz_land-da_data_map.csv')
             
             land_da_version (str): Version of the Land DA to save within filename of the consolidated mapped .xlsx file.
+            
+            selections (list): Data required by the test case from the UFS-WM RT data maps,
+                               declared as (sheet name, data map, filters) per selection, where
+                               data map is 'bl' or 'input' (refer to LAND_DA_TEST_CASE_SELECTIONS).
+                               Selections sharing a sheet name are concatenated.
 
         Return: None
 
         """
-        # Read files featuring the data maps of UFS-WM RT baseline datasets required for Land DA's v1.2.0
-        ufs_bl_df = pd.read_csv(f'../results/rt_baseline_{rt_bl_date}_data_map.csv')
-        
-        # Read files featuring the data maps of UFS-WM RT input datasets required for Land DA's v1.2.0
-        ufs_input_df = pd.read_csv(f'../results/rt_input_{rt_input_date}_data_map.csv')
+        # Read files featuring the data maps of UFS-WM RT baseline & input datasets required for Land DA's v1.2.0
+        # & index them by their selection columns.
+        maps = {'bl': MapIndex(self.load_data(f'../results/rt_baseline_{rt_bl_date}_data_map.csv')),
+                'input': MapIndex(self.load_data(f'../results/rt_input_{rt_input_date}_data_map.csv'))}
         
         # Read files featuring the data maps of the Land DA's TAR-based dataset required for Land DA's v1.2.0
         
         # Read referenced files featuring data maps
-        land_da_input_df = pd.read_csv(f'../results/{tar_fn}')
+        land_da_input_df = self.load_data(f'../results/{tar_fn}')
 
-        # Filter to the "DATM" & "NOAHMP Initial Condition" data required from the UFS-WM RT S3
-        ic_input_df = ufs_input_df[(ufs_input_df['Dataset']==f'input-data-{rt_input_date}') & (ufs_input_df['UFS Component'].isin(['DATM_GSWP3_input_data', 'NOAHMP_IC']))]
-        
-        # Filter to the "Non-Fixed FV3" data required from the UFS-WM RT S3
-        ufs_input_filtered_df2 = ufs_input_df[(ufs_input_df['Dataset']==f'input-data-{rt_input_date}') & (ufs_input_df['UFS Component'].isin(['FV3_input_data'])) & (ufs_input_df['Data File'].isin(['grid_spec.nc'])) & (ufs_input_df['Sub-Category'].isin(['INPUT']))]
-        ufs_input_filtered_df3 = ufs_input_df[(ufs_input_df['Dataset']==f'input-data-{rt_input_date}') & (ufs_input_df['UFS Component'].isin(['FV3_input_data'])) & (ufs_input_df['Data File'].str.startswith('C96_grid.tile')) & (ufs_input_df['Sub-Category'].isin(['INPUT']))]
-        nonfixed_input_df = pd.concat([ufs_input_filtered_df2, ufs_input_filtered_df3])
-        
-        # Filter to the "Fixed FV3" data required from the UFS-WM RT S3
-        fixed_input_df = ufs_input_df[(ufs_input_df['Dataset']==f'input-data-{rt_input_date}') & (ufs_input_df['UFS Component'].isin(['FV3_fix_tiled'])) & (ufs_input_df['Resolution (C)']==96)]
-        
-        # Filter to the "DATM CDEPS LAND GSWP3" data required from the UFS-WM RT S3
-        bl_filtered_df = ufs_bl_df[(ufs_bl_df['Dataset']==f'develop-{rt_bl_date}') & (ufs_bl_df['Compiler'].isin(['intel'])) & (ufs_bl_df['Test Name'].isin(['datm_cdeps_lnd_gswp3']))]
+        # Filter to the data required from the UFS-WM RT S3 per selection.
+        sheets = {}
+        for sheet, map_name, filters in selections:
+            filters = [(col, op, val.format(bl_date=rt_bl_date, input_date=rt_input_date) if isinstance(val, str) else val) 
+                       for col, op, val in filters]
+            sheets.setdefault(sheet, []).append(maps[map_name].select(filters))
         
         # Consolidate all generated data maps required for the specified version of the Land DA application's test case.
-        list_dfs = [ic_input_df,
-                    nonfixed_input_df, 
-                    fixed_input_df, 
-                    bl_filtered_df, 
-                    land_da_input_df]
-        names = ["DATM_NOAHMP_IC", 
-                 "NonFixed_FV3", 
-                 "Fixed_FV3", 
-                 "Baseline", 
-                 "Land_DA_TAR"]
+        list_dfs = [pd.concat(dfs) for dfs in sheets.values()] + [land_da_input_df]
+        names = list(sheets) + ["Land_DA_TAR"]
         save_fn = f'land_da_test_case_{land_da_version}_data_maps.xlsx'
         with ExcelWriter(f'../results/{save_fn}') as writer:
             for i, df in enumerate(list_dfs):
@@ -0,0 +1,697 @@
+import struct
+
+'''
+Low-level helpers for introspecting the headers of NetCDF & HDF5 data files
+without reading their data.
+
+The file format is sniffed from the file's magic bytes. The headers of the NetCDF
+classic formats (CDF-1, CDF-2 & CDF-5) are parsed sequentially from the start of
+the file. HDF5 files (incl. NetCDF-4) are parsed from the superblock by following
+the root group's object header to each dataset's object header, w/ group links
+held as symbol tables (v1 B-trees & local heaps), compact link messages or dense
+link storage (v2 B-trees & fractal heaps). NetCDF-4 dimensions are recognized as
+the datasets featuring a dimension scale's CLASS attribute.
+
+Every read is issued through a read(offset, length) callable, so the headers can
+be read via ranged requests against an object in cloud (or against a TAR member's
+payload w/in an uncompressed or checkpointed TAR-based object).
+
+'''
+
+# Magic bytes of the NetCDF classic formats mapped to the format's name.
+CLASSIC_MAGICS = {b'CDF\x01': 'NetCDF-3 classic',
+                  b'CDF\x02': 'NetCDF-3 64-bit offset',
+                  b'CDF\x05': 'NetCDF-3 64-bit data'}
+
+# Magic bytes of an HDF5 superblock & the positions searched for it (a file may
+# begin w/ a user block of 512 bytes times a power of two).
+HDF5_MAGIC = b'\x89HDF\r\n\x1a\n'
+HDF5_SUPERBLOCK_OFFSETS = (0, 512, 1024, 2048, 4096, 8192)
+
+# Number of bytes to read for sniffing a file's format.
+SNIFF_BYTES = HDF5_SUPERBLOCK_OFFSETS[-1] + len(HDF5_MAGIC)
+
+# Tags & value sizes (per nc_type) of the NetCDF classic header.
+NC_DIMENSION = 10
+NC_VARIABLE = 11
+NC_ATTRIBUTE = 12
+NC_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 4, 6: 8, 7: 1, 8: 2, 9: 4, 10: 8, 11: 8}
+
+# HDF5 object header message types.
+MSG_DATASPACE = 0x0001
+MSG_LINK_INFO = 0x0002
+MSG_LAYOUT = 0x0008
+MSG_LINK = 0x0006
+MSG_ATTRIBUTE = 0x000C
+MSG_CONTINUATION = 0x0010
+MSG_SYMBOL_TABLE = 0x0011
+MSG_ATTRIBUTE_INFO = 0x0015
+
+# Attributes marking an HDF5 dataset as a NetCDF-4 dimension (& not a variable) &
+# an HDF5 file as written by the NetCDF-4 library.
+DIMENSION_SCALE = b'DIMENSION_SCALE'
+NC4_DIM_ONLY = b'This is a netCDF dimension but not a netCDF variable'
+NC4_FILE_ATTRIBUTES = ('_NCProperties', '_Netcdf4Dimid', '_Netcdf4Coordinates')
+
+# Maximum depth of nested groups followed.
+MAX_GROUP_DEPTH = 16
+
+
+def sniff_format(head):
+    """
+    Sniff the format of a data file from its leading bytes.
+
+    Args:
+        head (bytes): Leading bytes of the file (SNIFF_BYTES for HDF5 files
+                      featuring a user block).
+
+    Return (str): NetCDF classic format's name, 'HDF5', or None if neither.
+
+    """
+    if head[:4] in CLASSIC_MAGICS:
+        return CLASSIC_MAGICS[head[:4]]
+    for offset in HDF5_SUPERBLOCK_OFFSETS:
+        if head[offset:offset + len(HDF5_MAGIC)] == HDF5_MAGIC:
+            return 'HDF5'
+    return None
+
+
+def read_exact(read, offset, length):
+    """
+    Read an exact number of bytes.
+
+    Args:
+        read (callable): Function w/ signature read(offset, length) returning the
+                         file's bytes (truncated at the end of the file).
+
+        offset (int): Position of the first byte to read.
+
+        length (int): Number of bytes to read.
+
+    Return (bytes): Requested bytes.
+
+    """
+    data = read(offset, length)
+    if len(data) < length:
+        raise EOFError(f"Header ends at byte {offset + len(data)} (expected {offset + length}).")
+    return data
+
+
+class ClassicHeader():
+    """
+    Sequential parser of a NetCDF classic (CDF-1, CDF-2 or CDF-5) header.
+
+    """
+    def __init__(self, read, version):
+        """
+        Args:
+            read (callable): Function w/ signature read(offset, length).
+
+            version (int): Format version (1, 2 or 5).
+
+        """
+        self.read = read
+        self.pos = 4
+        self.count_fmt = '>Q' if version == 5 else '>I'
+        self.offset_fmt = '>I' if version == 1 else '>Q'
+
+    def unpack(self, fmt):
+        size = struct.calcsize(fmt)
+        value, = struct.unpack(fmt, read_exact(self.read, self.pos, size))
+        self.pos += size
+        return value
+
+    def name(self):
+        length = self.unpack(self.count_fmt)
+        name = read_exact(self.read, self.pos, length).decode('utf-8', 'replace')
+        self.pos += -(-length // 4) * 4
+        return name
+
+    def tagged_count(self, tag):
+        """
+        Read a list's tag & number of elements (an absent list is tagged as zero).
+
+        """
+        found = self.unpack('>I')
+        count = self.unpack(self.count_fmt)
+        if found not in (0, tag):
+            raise ValueError(f"Unexpected header tag {found} at byte {self.pos}.")
+        return count
+
+    def skip_attributes(self):
+        for _ in range(self.tagged_count(NC_ATTRIBUTE)):
+            self.name()
+            nc_type = self.unpack('>I')
+            nelems = self.unpack(self.count_fmt)
+            self.pos += -(-nelems * NC_TYPE_SIZES.get(nc_type, 1) // 4) * 4
+
+    def parse(self):
+        """
+        Parse the header's dimensions & variables.
+
+        Return (dict, dict): Dimensions' lengths (the unlimited dimension's length is
+        its number of records) & variables' shapes, in order of definition.
+
+        """
+        numrecs = self.unpack(self.count_fmt)
+        dims = []
+        for _ in range(self.tagged_count(NC_DIMENSION)):
+            name = self.name()
+            length = self.unpack(self.count_fmt)
+            dims.append((name, length or numrecs))
+        self.skip_attributes()
+        variables = {}
+        for _ in range(self.tagged_count(NC_VARIABLE)):
+            name = self.name()
+            dimids = [self.unpack(self.count_fmt) for _ in range(self.unpack(self.count_fmt))]
+            self.skip_attributes()
+            self.unpack('>I')
+            self.unpack(self.count_fmt)
+            self.unpack(self.offset_fmt)
+            variables[name] = tuple(dims[dimid][1] for dimid in dimids)
+
+        return dict(dims), variables
+
+
+class HDF5Header():
+    """
+    Parser of the groups & datasets of an HDF5 file (incl. NetCDF-4) from its
+    superblock & object headers.
+
+    """
+    def __init__(self, read, superblock):
+        """
+        Args:
+            read (callable): Function w/ signature read(offset, length).
+
+            superblock (int): Position of the HDF5 superblock w/in the file.
+
+        """
+        self.read = read
+        head = read_exact(read, superblock, 48)
+        version = head[8]
+        if version in (0, 1):
+            self.osize, self.lsize = head[13], head[14]
+            pos = superblock + (24 if version == 0 else 28)
+            self.base = self.uint(read_exact(read, pos, self.osize))
+
+            # The root group's symbol table entry follows the base, free-space, EOF &
+            # driver information addresses.
+            entry = read_exact(read, pos + 4 * self.osize, 2 * self.osize)
+            self.root = self.uint(entry[self.osize:])
+        elif version in (2, 3):
+            self.osize, self.lsize = head[9], head[10]
+            addrs = read_exact(read, superblock + 12, 4 * self.osize)
+            self.base = self.uint(addrs[:self.osize])
+            self.root = self.uint(addrs[3 * self.osize:])
+        else:
+            raise ValueError(f"HDF5 superblock version {version} is not supported.")
+        self.undefined = (1 << (8 * self.osize)) - 1
+
+    @staticmethod
+    def uint(buf):
+        return int.from_bytes(buf, 'little')
+
+    def fetch(self, addr, length):
+        return read_exact(self.read, self.base + addr, length)
+
+    def cstring(self, addr, chunk=256):
+        """
+        Read a null-terminated string.
+
+        """
+        data = b''
+        while b'\x00' not in data:
+            buf = self.read(self.base + addr + len(data), chunk)
+            if not buf:
+                raise EOFError(f"String at {addr} is not terminated.")
+            data += buf
+        return data[:data.index(b'\x00')].decode('utf-8', 'replace')
+
+    def messages(self, addr):
+        """
+        Read the messages of an object header (v1 or v2), following continuation blocks.
+
+        Args:
+            addr (int): Object header's address.
+
+        Return (list): Messages' (type, flags, data).
+
+        """
+        prefix = self.fetch(addr, 16)
+        blocks, messages, seen = [], [], set()
+        if prefix[:4] == b'OHDR':
+            flags = prefix[5]
+            pos = 6 + (16 if flags & 0x20 else 0) + (4 if flags & 0x10 else 0)
+            size_len = 1 << (flags & 0x03)
+            chunk0 = self.uint(self.fetch(addr + pos, size_len))
+            blocks.append((addr + pos + size_len, chunk0))
+            msg_header = 6 if flags & 0x04 else 4
+            while blocks:
+                start, length = blocks.pop(0)
+                data = self.fetch(start, length)
+                pos = 0
+                while pos + msg_header <= len(data):
+                    mtype, msize, mflags = data[pos], self.uint(data[pos + 1:pos + 3]), data[pos + 3]
+                    body = data[pos + msg_header:pos + msg_header + msize]
+                    pos += msg_header + msize
+                    if mtype == MSG_CONTINUATION:
+                        cont = self.uint(body[:self.osize])
+                        cont_len = self.uint(body[self.osize:self.osize + self.lsize])
+                        if cont in seen or self.fetch(cont, 4) != b'OCHK':
+                            raise ValueError(f"Invalid object header continuation at {cont}.")
+                        seen.add(cont)
+                        blocks.append((cont + 4, cont_len - 8))
+                    else:
+                        messages.append((mtype, mflags, body))
+        elif prefix[0] == 1:
+            nmessages = self.uint(prefix[2:4])
+            blocks.append((addr + 16, self.uint(prefix[8:12])))
+            while blocks and len(messages) < nmessages:
+                start, length = blocks.pop(0)
+                data = self.fetch(start, length)
+                pos = 0
+                while pos + 8 <= len(data) and len(messages) < nmessages:
+                    mtype, msize, mflags = self.uint(data[pos:pos + 2]), self.uint(data[pos + 2:pos + 4]), data[pos + 4]
+                    body = data[pos + 8:pos + 8 + msize]
+                    pos += 8 + msize
+                    if mtype == MSG_CONTINUATION:
+                        cont = self.uint(body[:self.osize])
+                        if cont in seen:
+                            raise ValueError(f"Invalid object header continuation at {cont}.")
+                        seen.add(cont)
+                        blocks.append((cont, self.uint(body[self.osize:self.osize + self.lsize])))
+                    messages.append((mtype, mflags, body))
+        else:
+            raise ValueError(f"Invalid HDF5 object header at {addr}.")
+
+        # Shared messages only reference the message stored elsewhere.
+        return [(mtype, mflags, body) for mtype, mflags, body in messages if not mflags & 0x02]
+
+    def dataspace(self, body):
+        """
+        Decode a dataspace message.
+
+        Return (tuple): Current dimension sizes.
+
+        """
+        version, ndims = body[0], body[1]
+        pos = 8 if version == 1 else 4
+        return tuple(self.uint(body[pos + idx * self.lsize:pos + (idx + 1) * self.lsize]) for idx in range(ndims))
+
+    def attribute(self, body):
+        """
+        Decode an attribute message's name & (for fixed-length strings) value.
+
+        Return (str, bytes): Attribute's name & value (None if not a fixed-length string).
+
+        """
+        version = body[0]
+        name_len, type_len, space_len = struct.unpack_from('<HHH', body, 2)
+        pad = (lambda n: -(-n // 8) * 8) if version == 1 else (lambda n: n)
+        pos = 9 if version == 3 else 8
+        name = body[pos:pos + name_len].split(b'\x00', 1)[0].decode('utf-8', 'replace')
+        pos += pad(name_len)
+        dtype = body[pos:pos + type_len]
+        pos += pad(type_len)
+        shape = self.dataspace(body[pos:pos + space_len])
+        pos += pad(space_len)
+        value = None
+        if dtype and dtype[0] & 0x0F == 3:
+            count = 1
+            for size in shape:
+                count *= size
+            value = body[pos:pos + count * self.uint(dtype[4:8])].rstrip(b'\x00 ')
+        return name, value
+
+    def attributes(self, messages):
+        """
+        Decode the attributes of an object (compact or dense attribute storage).
+
+        Args:
+            messages (list): Messages of the object's header.
+
+        Return (dict): Attributes' names mapped to their values (fixed-length strings only).
+
+        """
+        attributes = {}
+        for mtype, _, body in messages:
+            if mtype == MSG_ATTRIBUTE:
+                name, value = self.attribute(body)
+                attributes[name] = value
+            elif mtype == MSG_ATTRIBUTE_INFO:
+                pos = 2 + (2 if body[1] & 0x01 else 0)
+                heap = self.uint(body[pos:pos + self.osize])
+                name_index = self.uint(body[pos + self.osize:pos + 2 * self.osize])
+                if heap != self.undefined:
+                    heap_objects = FractalHeap(self, heap)
+                    for record in self.btree2_records(name_index):
+                        name, value = self.attribute(heap_objects.get(record[:8]))
+                        attributes[name] = value
+
+        return attributes
+
+    def links(self, messages):
+        """
+        List the hard links of a group (symbol table, compact or dense link storage).
+
+        Args:
+            messages (list): Messages of the group's object header.
+
+        Return (list): Links' (name, object header address), in order of creation (if
+        tracked) or name.
+
+        """
+        links = []
+        for mtype, _, body in messages:
+            if mtype == MSG_SYMBOL_TABLE:
+                links.extend(self.symbol_table_links(self.uint(body[:self.osize]),
+                                                     self.uint(body[self.osize:2 * self.osize])))
+            elif mtype == MSG_LINK:
+                links.append(self.link(body))
+            elif mtype == MSG_LINK_INFO:
+                pos = 2 + (8 if body[1] & 0x01 else 0)
+                heap = self.uint(body[pos:pos + self.osize])
+                name_index = self.uint(body[pos + self.osize:pos + 2 * self.osize])
+                if heap != self.undefined:
+                    links.extend(self.dense_links(heap, name_index))
+        links = [link for link in links if link[2] is not None]
+
+        return [(name, addr) for _, name, addr in sorted(links, key=lambda link: (link[0], link[1]))]
+
+    def link(self, body):
+        """
+        Decode a link message.
+
+        Return (int, str, int): Link's creation order (0 if not tracked), name & object
+        header address (None for soft & external links).
+
+        """
+        flags = body[1]
+        pos = 2
+        link_type = 0
+        if flags & 0x08:
+            link_type = body[pos]
+            pos += 1
+        order = 0
+        if flags & 0x04:
+            order = self.uint(body[pos:pos + 8])
+            pos += 8
+        if flags & 0x10:
+            pos += 1
+        len_size = 1 << (flags & 0x03)
+        name_len = self.uint(body[pos:pos + len_size])
+        pos += len_size
+        name = body[pos:pos + name_len].decode('utf-8', 'replace')
+        pos += name_len
+        addr = self.uint(body[pos:pos + self.osize]) if link_type == 0 else None
+
+        return order, name, addr
+
+    def symbol_table_links(self, btree, heap):
+        """
+        List the links of a group held as a symbol table (v1 B-tree of symbol table
+        nodes, w/ the link names held in a local heap).
+
+        """
+        heap_head = self.fetch(heap, 8 + 2 * self.lsize + self.osize)
+        if heap_head[:4] != b'HEAP':
+            raise ValueError(f"Invalid local heap at {heap}.")
+        names = self.uint(heap_head[8 + 2 * self.lsize:])
+        entry_size = 2 * self.osize + 24
+        links, nodes, seen = [], [btree], set()
+        while nodes:
+            node = nodes.pop(0)
+            if node in seen:
+                raise ValueError(f"Group B-tree node {node} is referenced twice.")
+            seen.add(node)
+            head = self.fetch(node, 8 + 2 * self.osize)
+            if head[:4] != b'TREE':
+                raise ValueError(f"Invalid group B-tree node at {node}.")
+            level, nentries = head[5], self.uint(head[6:8])
+            body = self.fetch(node + 8 + 2 * self.osize, nentries * (self.lsize + self.osize) + self.lsize)
+            children = [self.uint(body[idx * (self.lsize + self.osize) + self.lsize:(idx + 1) * (self.lsize + self.osize)])
+                        for idx in range(nentries)]
+            if level > 0:
+                nodes.extend(children)
+                continue
+            for snod in children:
+                head = self.fetch(snod, 8)
+                if head[:4] != b'SNOD':
+                    raise ValueError(f"Invalid symbol table node at {snod}.")
+                entries = self.fetch(snod + 8, self.uint(head[6:8]) * entry_size)
+                for pos in range(0, len(entries), entry_size):
+                    name_offset = self.uint(entries[pos:pos + self.osize])
+                    addr = self.uint(entries[pos + self.osize:pos + 2 * self.osize])
+                    links.append((0, self.cstring(names + name_offset), addr))
+
+        return links
+
+    def dense_links(self, heap, name_index):
+        """
+        List the links of a group held in dense storage (link messages held in a
+        fractal heap, indexed by name via a v2 B-tree).
+
+        """
+        heap_objects = FractalHeap(self, heap)
+        return [self.link(heap_objects.get(record[4:])) for record in self.btree2_records(name_index)]
+
+    def btree2_records(self, addr):
+        """
+        List the records of a v2 B-tree.
+
+        Args:
+            addr (int): B-tree header's address.
+
+        Return (list): Records' raw bytes.
+
+        """
+        head = self.fetch(addr, 16 + self.osize + 2 + self.lsize)
+        if head[:4] != b'BTHD':
+            raise ValueError(f"Invalid v2 B-tree header at {addr}.")
+        node_size, record_size, depth = self.uint(head[6:10]), self.uint(head[10:12]), self.uint(head[12:14])
+        root = self.uint(head[16:16 + self.osize])
+        root_nrec = self.uint(head[16 + self.osize:18 + self.osize])
+        if root == self.undefined:
+            return []
+
+        # Number of bytes encoding a node's (& its subtree's) number of records
+        # (refer to the HDF5 library's H5B2__hdr_init()).
+        enc_size = lambda n: (n.bit_length() - 1) // 8 + 1
+        max_nrec = [(node_size - 10) // record_size]
+        cum_max_nrec, cum_size = [max_nrec[0]], [0]
+        nrec_size = enc_size(max_nrec[0])
+        for level in range(1, depth + 1):
+            pointer = self.osize + nrec_size + (cum_size[level - 1] if level > 1 else 0)
+            max_nrec.append((node_size - (10 + pointer)) // (record_size + pointer))
+            cum_max_nrec.append((max_nrec[level] + 1) * cum_max_nrec[level - 1] + max_nrec[level])
+            cum_size.append(enc_size(cum_max_nrec[level]))
+
+        records = []
+        def walk(node, nrec, level):
+            data = self.fetch(node, node_size)
+            if data[:4] not in (b'BTIN', b'BTLF'):
+                raise ValueError(f"Invalid v2 B-tree node at {node}.")
+            node_records = [data[6 + idx * record_size:6 + (idx + 1) * record_size] for idx in range(nrec)]
+            if level == 0:
+                records.extend(node_records)
+                return
+            pos = 6 + nrec * record_size
+            pointer = self.osize + nrec_size + (cum_size[level - 1] if level > 1 else 0)
+            for idx in range(nrec + 1):
+                child = self.uint(data[pos:pos + self.osize])
+                child_nrec = self.uint(data[pos + self.osize:pos + self.osize + nrec_size])
+                walk(child, child_nrec, level - 1)
+                if idx < nrec:
+                    records.append(node_records[idx])
+                pos += pointer
+
+        walk(root, root_nrec, depth)
+        return records
+
+    def walk(self, addr, path='', depth=0, visited=None):
+        """
+        Walk the datasets of a group & its nested groups.
+
+        Args:
+            addr (int): Group's object header address.
+
+            path (str): Group's path (prefix of its members' names).
+
+            depth (int): Group's nesting depth.
+
+            visited (set): Object header addresses already walked.
+
+        Return (generator): Datasets' (path, shape, attributes), where attributes maps
+        the dataset's attribute names to their values (fixed-length strings only).
+
+        """
+        visited = set() if visited is None else visited
+        visited.add(addr)
+        for name, child in self.links(self.messages(addr)):
+            if child in visited:
+                continue
+            visited.add(child)
+            messages = self.messages(child)
+            mtypes = {mtype for mtype, _, _ in messages}
+            if MSG_LAYOUT in mtypes:
+                shape = next((self.dataspace(body) for mtype, _, body in messages if mtype == MSG_DATASPACE), ())
+                yield path + name, shape, self.attributes(messages)
+            elif mtypes & {MSG_SYMBOL_TABLE, MSG_LINK, MSG_LINK_INFO} and depth < MAX_GROUP_DEPTH:
+                yield from self.walk(child, f'{path}{name}/', depth + 1, visited)
+
+
+
+class FractalHeap():
+    """
+    Reader of the managed & tiny objects of an HDF5 fractal heap.
+
+    """
+    def __init__(self, hdf5, addr):
+        """
+        Args:
+            hdf5 (HDF5Header): File's header parser.
+
+            addr (int): Fractal heap header's address.
+
+        """
+        o, l = hdf5.osize, hdf5.lsize
+        head = hdf5.fetch(addr, 22 + 12 * l + 3 * o)
+        if head[:4] != b'FRHP':
+            raise ValueError(f"Invalid fractal heap header at {addr}.")
+        self.hdf5 = hdf5
+        filters_len = hdf5.uint(head[7:9])
+        max_managed = hdf5.uint(head[10:14])
+        pos = 14 + 10 * l + 2 * o
+        self.width = hdf5.uint(head[pos:pos + 2])
+        start_size = hdf5.uint(head[pos + 2:pos + 2 + l])
+        max_direct = hdf5.uint(head[pos + 2 + l:pos + 2 + 2 * l])
+        max_heap_bits = hdf5.uint(head[pos + 2 + 2 * l:pos + 4 + 2 * l])
+        pos += 6 + 2 * l
+        root = hdf5.uint(head[pos:pos + o])
+        root_rows = hdf5.uint(head[pos + o:pos + o + 2])
+        if filters_len:
+            raise ValueError("Filtered fractal heaps are not supported.")
+
+        # Heap IDs encode the object's offset w/in the heap & its length (refer to the
+        # HDF5 library's H5HF__hdr_finish_init_phase1()).
+        self.offset_size = -(-max_heap_bits // 8)
+        self.length_size = min(-(-(max_direct.bit_length() - 1) // 8), (max_managed.bit_length() - 1) // 8 + 1)
+
+        # Doubling table: rows 0 & 1 hold blocks of the starting size, each later row
+        # doubles the block size.
+        self.start_bits = start_size.bit_length() - 1
+        self.first_row_bits = self.start_bits + self.width.bit_length() - 1
+        self.max_direct_rows = (max_direct.bit_length() - 1) - self.start_bits + 2
+        self.row_sizes = [start_size] + [start_size << max(row - 1, 0) for row in range(1, max_heap_bits - self.first_row_bits + 2)]
+        self.row_offsets = [0] + [(start_size * self.width) << (row - 1) for row in range(1, len(self.row_sizes))]
+
+        # Direct blocks' (heap offset, size, address).
+        self.blocks = []
+        if root != hdf5.undefined:
+            if root_rows == 0:
+                self.blocks.append((0, start_size, root))
+            else:
+                self.indirect(root, 0, root_rows)
+
+    def indirect(self, addr, block_offset, nrows):
+        """
+        Record the direct blocks reachable from an indirect block.
+
+        """
+        o = self.hdf5.osize
+        nentries = nrows * self.width
+        data = self.hdf5.fetch(addr + 5 + o + self.offset_size, nentries * o)
+        if self.hdf5.fetch(addr, 4) != b'FHIB':
+            raise ValueError(f"Invalid fractal heap indirect block at {addr}.")
+        for idx in range(nentries):
+            child = self.hdf5.uint(data[idx * o:(idx + 1) * o])
+            if child == self.hdf5.undefined:
+                continue
+            row, col = divmod(idx, self.width)
+            size = self.row_sizes[row]
+            child_offset = block_offset + self.row_offsets[row] + col * size
+            if row < self.max_direct_rows:
+                self.blocks.append((child_offset, size, child))
+            else:
+                self.indirect(child, child_offset, (size.bit_length() - 1) - self.first_row_bits + 1)
+
+    def get(self, heap_id):
+        """
+        Read a heap object.
+
+        Args:
+            heap_id (bytes): Object's heap ID.
+
+        Return (bytes): Object's bytes.
+
+        """
+        id_type = (heap_id[0] >> 4) & 0x03
+        if id_type == 2:
+            return heap_id[1:1 + (heap_id[0] & 0x0F) + 1]
+        if id_type != 0:
+            raise ValueError("Huge fractal heap objects are not supported.")
+        offset = self.hdf5.uint(heap_id[1:1 + self.offset_size])
+        length = self.hdf5.uint(heap_id[1 + self.offset_size:1 + self.offset_size + self.length_size])
+        for block_offset, size, addr in self.blocks:
+            if block_offset <= offset < block_offset + size:
+                return self.hdf5.fetch(addr + offset - block_offset, length)
+        raise ValueError(f"Fractal heap offset {offset} is not w/in a direct block.")
+
+
+def read_hdf5_header(read, superblock=0):
+    """
+    Parse the dimensions & variables of an HDF5 file (incl. NetCDF-4).
+
+    Args:
+        read (callable): Function w/ signature read(offset, length) returning the
+                         file's bytes.
+
+        superblock (int): Position of the HDF5 superblock w/in the file.
+
+    Return (str, dict, dict): File format ('NetCDF-4' if written by the NetCDF-4
+    library, else 'HDF5'), dimensions' lengths & variables' shapes. For files not
+    written by the NetCDF-4 library, every dataset is listed as a variable.
+
+    """
+    hdf5 = HDF5Header(read, superblock)
+    is_nc4 = any(name in NC4_FILE_ATTRIBUTES for name in hdf5.attributes(hdf5.messages(hdf5.root)))
+    dims, variables = {}, {}
+    for path, shape, attributes in hdf5.walk(hdf5.root):
+        is_nc4 = is_nc4 or any(name in NC4_FILE_ATTRIBUTES for name in attributes)
+        if attributes.get('CLASS') == DIMENSION_SCALE:
+            dims[path] = shape[0] if shape else 0
+            if (attributes.get('NAME') or b'').startswith(NC4_DIM_ONLY):
+                continue
+        variables[path] = shape
+
+    return ('NetCDF-4' if is_nc4 else 'HDF5'), dims, variables
+
+
+def read_netcdf_header(read):
+    """
+    Sniff the format of a data file & parse its header's dimensions & variables.
+
+    Args:
+        read (callable): Function w/ signature read(offset, length) returning the
+                         file's bytes (truncated at the end of the file).
+
+    Return (dict): File's format (None if neither NetCDF nor HDF5), dimensions' lengths
+    & variables' shapes, in order of definition. A truncated header raises EOFError &
+    a malformed or unsupported one raises ValueError.
+
+    """
+    head = read(0, SNIFF_BYTES)
+    file_format = sniff_format(head)
+    dims, variables = {}, {}
+    try:
+        if file_format in CLASSIC_MAGICS.values():
+            dims, variables = ClassicHeader(read, head[3]).parse()
+        elif file_format == 'HDF5':
+            superblock = next(offset for offset in HDF5_SUPERBLOCK_OFFSETS
+                              if head[offset:offset + len(HDF5_MAGIC)] == HDF5_MAGIC)
+            file_format, dims, variables = read_hdf5_header(read, superblock)
+    except (IndexError, KeyError, struct.error) as exc:
+        raise ValueError(f"Malformed {file_format} header ({exc}).") from exc
+
+    return {'format': file_format, 'dimensions': dims, 'variables': variables}
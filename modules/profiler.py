@@ -0,0 +1,267 @@
+import os
+import sys
+import json
+import time
+import threading
+import functools
+import tracemalloc
+from contextlib import contextmanager
+import pandas as pd
+
+'''
+Opt-in instrumentation of the DataMapGenerator's stages & storage requests.
+
+When a Profiler is attached to a DataMapGenerator, every profiled method (e.g. listing, TAR
+scanning, extraction, saving) is recorded as a stage w/ its calls, inclusive wall time, rows
+returned & (optionally) the peak of traced memory allocated while it ran. The storage backend's
+requests are counted per S3 operation (e.g. ListObjectsV2, HeadObject, GetObject) along w/ the
+bytes transferred & keys listed. The report can be saved as JSON & followed live via a progress
+line featuring the keys & MB processed per second.
+
+'''
+
+
+class Profiler():
+    """
+    Record the stages & storage requests of one or more DataMapGenerators.
+
+    """
+    def __init__(self, trace_memory=False, progress_interval=None, stream=sys.stderr):
+        """
+        Args:
+            trace_memory (bool): If set to True, the peak of memory allocated per stage is
+                                 traced via tracemalloc (slows down allocation-heavy stages).
+
+            progress_interval (float): Seconds between progress line updates. If not
+                                       applicable, set as default value (no progress line).
+
+            stream (file-like): Stream the progress line is written to.
+
+        """
+        self.trace_memory = trace_memory
+        self.progress_interval = progress_interval
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.requests = {}
+        self.bytes = {}
+        self.keys = 0
+        self.open_stages = []
+        self.start_time = time.perf_counter()
+        self.progress_thread = None
+        self.stop_progress = threading.Event()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def on_request(self, operation, nbytes=0, nkeys=0, requests=1):
+        """
+        Count storage requests (hook of the storage backends).
+
+        Args:
+            operation (str): S3 operation name.
+
+            nbytes (int): Number of bytes transferred.
+
+            nkeys (int): Number of keys listed.
+
+            requests (int): Number of requests issued.
+
+        """
+        with self.lock:
+            self.requests[operation] = self.requests.get(operation, 0) + requests
+            self.bytes[operation] = self.bytes.get(operation, 0) + nbytes
+            self.keys += nkeys
+
+    def add_keys(self, nkeys):
+        """
+        Count keys processed outside of a listing (e.g. TAR members indexed).
+
+        Args:
+            nkeys (int): Number of keys processed.
+
+        """
+        with self.lock:
+            self.keys += nkeys
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Record a stage's call, inclusive wall time & memory peak (stages running
+        concurrently on other threads are included in the memory peak).
+
+        Args:
+            name (str): Stage name.
+
+        Return (context manager): Yields the stage's call record, on which the number
+        of rows processed may be set.
+
+        """
+        call = {'rows': 0, 'mem_peak': 0}
+        if self.trace_memory:
+            with self.lock:
+                self._carry_peak()
+                call['mem_start'] = tracemalloc.get_traced_memory()[0]
+                self.open_stages.append(call)
+        start = time.perf_counter()
+        try:
+            yield call
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                if self.trace_memory:
+                    self._carry_peak()
+                    self.open_stages.remove(call)
+                record = self.stages.setdefault(name, {'calls': 0, 'wall_s': 0.0, 'rows': 0, 'mem_peak_mb': 0.0})
+                record['calls'] += 1
+                record['wall_s'] += elapsed
+                record['rows'] += call['rows']
+                record['mem_peak_mb'] = max(record['mem_peak_mb'],
+                                            (call['mem_peak'] - call.get('mem_start', 0)) / 1024**2)
+
+    def _carry_peak(self):
+        """
+        Carry the traced memory peak since the last reset over to every open stage &
+        reset the peak (called w/ the lock held).
+
+        """
+        peak = tracemalloc.get_traced_memory()[1]
+        for call in self.open_stages:
+            call['mem_peak'] = max(call['mem_peak'], peak)
+        tracemalloc.reset_peak()
+
+    def report(self):
+        """
+        Compose the profiling report.
+
+        Return (dict): Elapsed time, keys processed, requests & bytes per operation &
+        calls, wall time (summed across threads), rows & memory peak per stage.
+
+        """
+        with self.lock:
+            elapsed = time.perf_counter() - self.start_time
+            total_bytes = sum(self.bytes.values())
+            return {'elapsed_s': round(elapsed, 3),
+                    'keys': self.keys,
+                    'keys_per_s': round(self.keys / elapsed, 1) if elapsed else None,
+                    'bytes': total_bytes,
+                    'MBps': round(total_bytes / 1024**2 / elapsed, 2) if elapsed else None,
+                    'requests': dict(sorted(self.requests.items())),
+                    'bytes_per_operation': dict(sorted(self.bytes.items())),
+                    'stages': {name: {key: round(val, 3) if isinstance(val, float) else val
+                                      for key, val in record.items()}
+                               for name, record in self.stages.items()}}
+
+    def stage_table(self):
+        """
+        Tabulate the stages, slowest first.
+
+        Return (pd.DataFrame): Calls, wall time, rows & memory peak per stage.
+
+        """
+        return pd.DataFrame.from_dict(self.report()['stages'], orient='index').sort_values('wall_s', ascending=False)
+
+    def save(self, save_fn):
+        """
+        Save the profiling report as JSON.
+
+        Args:
+            save_fn (str): Filename of the report.
+
+        """
+        if os.path.dirname(save_fn):
+            os.makedirs(os.path.dirname(save_fn), exist_ok=True)
+        with open(save_fn, 'w') as f_handle:
+            json.dump(self.report(), f_handle, indent=2)
+        print(f"Profiling report saved to {save_fn}.")
+
+    def progress_line(self):
+        """
+        Compose the progress line.
+
+        Return (str): Elapsed time, keys & MB processed (& their rates) & requests issued.
+
+        """
+        report = self.report()
+        requests = ', '.join(f'{op} {count}' for op, count in report['requests'].items())
+        return (f"[{report['elapsed_s']:.0f} s] {report['keys']} keys ({report['keys_per_s']} keys/s), "
+                f"{report['bytes'] / 1024**2:.1f} MB ({report['MBps']} MB/s) | {requests}")
+
+    def start(self):
+        """
+        Start updating the progress line (if a progress interval is set).
+
+        """
+        if self.progress_interval and self.progress_thread is None:
+            def update():
+                while not self.stop_progress.wait(self.progress_interval):
+                    self._write_progress()
+
+            self.stop_progress.clear()
+            self.progress_thread = threading.Thread(target=update, daemon=True)
+            self.progress_thread.start()
+
+    def stop(self):
+        """
+        Stop updating the progress line (the final line is written once more).
+
+        """
+        if self.progress_thread is not None:
+            self.stop_progress.set()
+            self.progress_thread.join()
+            self.progress_thread = None
+            self._write_progress(final=True)
+
+    def _write_progress(self, final=False):
+        """
+        Write the progress line (updated in place on a terminal, else one line per update
+        so logs of unattended runs stay readable).
+
+        Args:
+            final (bool): If set to True, the line is terminated.
+
+        """
+        if self.stream.isatty():
+            self.stream.write('\r\x1b[K' + self.progress_line() + ('\n' if final else ''))
+        else:
+            self.stream.write(self.progress_line() + '\n')
+        self.stream.flush()
+
+
+def count_rows(result):
+    """
+    Count the rows returned by a stage.
+
+    Args:
+        result (object): Stage's return value.
+
+    Return (int): Number of rows of a dataframe, list or dictionary (or of the first
+    item of a returned tuple), else 0.
+
+    """
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    if isinstance(result, (pd.DataFrame, list, dict)):
+        return len(result)
+    return 0
+
+
+def profiled(method):
+    """
+    Record a DataMapGenerator method as a stage of the generator's profiler (if attached).
+
+    Args:
+        method (callable): DataMapGenerator method.
+
+    Return (callable): Profiled method.
+
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.profiler is None:
+            return method(self, *args, **kwargs)
+        with self.profiler.stage(method.__name__) as call:
+            result = method(self, *args, **kwargs)
+            call['rows'] = count_rows(result)
+        return result
+
+    return wrapper
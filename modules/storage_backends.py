@@ -0,0 +1,481 @@
+import os
+import shutil
+import datetime
+import threading
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore import UNSIGNED
+from botocore.client import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+'''
+Storage backends serving a bucket's listing & objects to the DataMapGenerator.
+
+Each backend exposes the same requests (object listing, object metadata, byte range reads &
+streaming reads), so the listing & TAR reading methods are unchanged whether a bucket is read
+from S3, from an anonymous HTTP endpoint or from a mirror of the bucket on local disk. Every
+request is reported to the backend's on_request hook (if set, e.g. by a profiler) under its
+S3 operation name.
+
+'''
+
+# Namespace of the S3 ListObjectsV2 XML response.
+S3_XML_NS = '{http://s3.amazonaws.com/doc/2006-03-01/}'
+
+# Unsigned S3 clients shared across backends per connection pool size (boto3 clients are
+# thread-safe, so every worker thread of every DataMapGenerator reuses the same pool).
+S3_CLIENTS = {}
+S3_CLIENTS_LOCK = threading.Lock()
+
+# Errors raised by the backends' requests (S3 client & connection errors, HTTP errors
+# & local I/O errors, the latter two being OSErrors).
+REQUEST_ERRORS = (ClientError, BotoCoreError, OSError)
+
+# Parallel multipart settings of whole object downloads.
+DEFAULT_TRANSFER_CONFIG = TransferConfig(multipart_threshold=8 * 1024**2,
+                                         multipart_chunksize=8 * 1024**2,
+                                         max_concurrency=16)
+
+
+def get_s3_client(max_pool_connections=64):
+    """
+    Get the shared unsigned S3 client w/ a connection pool of the requested size.
+
+    Args:
+        max_pool_connections (int): Maximum number of connections kept open
+                                    (& reused via TCP keep-alive).
+
+    Return (botocore.client.S3): Shared S3 client.
+
+    """
+    with S3_CLIENTS_LOCK:
+        if max_pool_connections not in S3_CLIENTS:
+            config = Config(signature_version=UNSIGNED,
+                            max_pool_connections=max_pool_connections,
+                            tcp_keepalive=True,
+                            retries={'max_attempts': 5, 'mode': 'adaptive'})
+            S3_CLIENTS[max_pool_connections] = boto3.client('s3', config=config)
+        return S3_CLIENTS[max_pool_connections]
+
+
+class RecordedStream():
+    """
+    File-like wrapper reporting the bytes read from a streaming body to a backend's hook.
+
+    """
+    def __init__(self, body, on_request):
+        """
+        Args:
+            body (file-like): Object's streaming body.
+
+            on_request (callable): Backend's request hook.
+
+        """
+        self.body = body
+        self.on_request = on_request
+
+    def read(self, size=-1):
+        data = self.body.read(size)
+        self.on_request('GetObject', nbytes=len(data), requests=0)
+        return data
+
+    def close(self):
+        self.body.close()
+
+
+class StorageBackend(ABC):
+    """
+    Interface of a bucket's storage backend (backends missing any of the abstract
+    requests cannot be created).
+
+    """
+    # Hook w/ signature on_request(operation, nbytes=0, nkeys=0, requests=1) called per
+    # request (e.g. 'ListObjectsV2', 'HeadObject', 'GetObject') w/ the bytes & keys served.
+    on_request = None
+
+    def _record(self, operation, nbytes=0, nkeys=0, requests=1):
+        """
+        Report requests to the backend's hook (no-op if not set).
+
+        Args:
+            operation (str): S3 operation name.
+
+            nbytes (int): Number of bytes transferred.
+
+            nkeys (int): Number of keys listed.
+
+            requests (int): Number of requests issued.
+
+        """
+        if self.on_request is not None:
+            self.on_request(operation, nbytes=nbytes, nkeys=nkeys, requests=requests)
+
+    def _recorded(self, body):
+        """
+        Report the bytes read from a streaming body to the backend's hook (if set).
+
+        Args:
+            body (file-like): Object's streaming body.
+
+        Return (file-like): Object's body.
+
+        """
+        self._record('GetObject')
+        return body if self.on_request is None else RecordedStream(body, self.on_request)
+
+    @abstractmethod
+    def list_objects(self, prefix='', delimiter=None):
+        """
+        List the objects residing under a prefix.
+
+        Args:
+            prefix (str): Prefix of object keys to list.
+
+            delimiter (str): If set, keys are grouped by their common prefix up to
+                             the first delimiter following the given prefix. If not
+                             applicable, set as default value.
+
+        Return (list, list): List of objects' details (Key, Size, ETag, LastModified)
+        & list of common prefixes residing under the prefix.
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def head_object(self, key):
+        """
+        Request an object's metadata.
+
+        Args:
+            key (str): Object's key.
+
+        Return (dict): Object's metadata (ContentLength & ETag).
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_range(self, key, start, end):
+        """
+        Read a byte range of an object.
+
+        Args:
+            key (str): Object's key.
+
+            start (int): Position of the first byte to read.
+
+            end (int): Position of the last byte to read (inclusive).
+
+        Return (bytes): Object's bytes within the requested range.
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def open_stream(self, key):
+        """
+        Open a streaming reader over an object.
+
+        Args:
+            key (str): Object's key.
+
+        Return (file-like): Object's body, read on demand.
+
+        """
+        raise NotImplementedError
+
+    def read_object(self, key):
+        """
+        Read a whole object.
+
+        Args:
+            key (str): Object's key.
+
+        Return (bytes): Object's bytes.
+
+        """
+        body = self.open_stream(key)
+        try:
+            return body.read()
+        finally:
+            body.close()
+
+    def download(self, key, fileobj, transfer_config=DEFAULT_TRANSFER_CONFIG):
+        """
+        Download a whole object into a file as parallel byte range reads.
+
+        Args:
+            key (str): Object's key.
+
+            fileobj (file-like): Seekable binary file to write the object's bytes to.
+
+            transfer_config (TransferConfig): Part size, number of parts read
+                                              concurrently & size below which the
+                                              object is read w/ a single request.
+
+        """
+        size = self.head_object(key)['ContentLength']
+        if size < transfer_config.multipart_threshold:
+            fileobj.write(self.get_range(key, 0, size - 1) if size else b'')
+            return
+
+        # Parts are written at their offset as they complete.
+        chunksize = transfer_config.multipart_chunksize
+        lock = threading.Lock()
+        def get_part(start):
+            data = self.get_range(key, start, min(start + chunksize, size) - 1)
+            with lock:
+                fileobj.seek(start)
+                fileobj.write(data)
+
+        with ThreadPoolExecutor(max_workers=transfer_config.max_request_concurrency) as executor:
+            for _ in executor.map(get_part, range(0, size, chunksize)):
+                pass
+        fileobj.seek(size)
+
+
+class S3Backend(StorageBackend):
+    """
+    Bucket served by S3 via a shared unsigned boto3 client (refer to get_s3_client()).
+
+    """
+    def __init__(self, bucket_name, max_pool_connections=64):
+        """
+        Args:
+            bucket_name (str): Bucket's name.
+
+            max_pool_connections (int): Maximum number of connections kept open to S3.
+
+        """
+        self.bucket_name = bucket_name
+        self.client = get_s3_client(max_pool_connections)
+
+    def list_objects(self, prefix='', delimiter=None):
+        kwargs = {'Bucket': self.bucket_name, 'Prefix': prefix}
+        if delimiter is not None:
+            kwargs['Delimiter'] = delimiter
+        contents = []
+        prefixes = []
+        while True:
+            resp = self.client.list_objects_v2(**kwargs)
+            self._record('ListObjectsV2', nkeys=len(resp.get('Contents', [])))
+            contents.extend(resp.get('Contents', []))
+            prefixes.extend(cp['Prefix'] for cp in resp.get('CommonPrefixes', []))
+            try:
+                kwargs['ContinuationToken'] = resp['NextContinuationToken']
+            except KeyError:
+                break
+
+        return contents, prefixes
+
+    def head_object(self, key):
+        self._record('HeadObject')
+        return self.client.head_object(Bucket=self.bucket_name, Key=key)
+
+    def get_range(self, key, start, end):
+        s3_object = self.client.get_object(Bucket=self.bucket_name,
+                                           Key=key,
+                                           Range=f'bytes={start}-{end}')
+        data = s3_object['Body'].read()
+        self._record('GetObject', nbytes=len(data))
+        return data
+
+    def open_stream(self, key):
+        return self._recorded(self.client.get_object(Bucket=self.bucket_name, Key=key)['Body'])
+
+    def download(self, key, fileobj, transfer_config=DEFAULT_TRANSFER_CONFIG):
+        start = fileobj.tell()
+        self.client.download_fileobj(self.bucket_name, key, fileobj, Config=transfer_config)
+        
+        # Managed transfers request the object's size & then each of its parts.
+        size = fileobj.tell() - start
+        parts = -(-size // transfer_config.multipart_chunksize) if size >= transfer_config.multipart_threshold else 1
+        self._record('HeadObject')
+        self._record('GetObject', nbytes=size, requests=parts)
+
+
+class HTTPBackend(StorageBackend):
+    """
+    Bucket served by an anonymous HTTP(S) endpoint supporting S3's ListObjectsV2
+    API & HTTP Range requests (e.g. https://noaa-ufs-land-da-pds.s3.amazonaws.com).
+
+    """
+    def __init__(self, base_url, timeout=60):
+        """
+        Args:
+            base_url (str): Bucket's endpoint.
+
+            timeout (int): Seconds to wait per request.
+
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _object_url(self, key):
+        """
+        Compose the URL of an object.
+
+        Args:
+            key (str): Object's key.
+
+        Return (str): Object's URL.
+
+        """
+        return f'{self.base_url}/{urllib.parse.quote(key, safe="/~")}'
+
+    def list_objects(self, prefix='', delimiter=None):
+        params = {'list-type': '2', 'prefix': prefix}
+        if delimiter is not None:
+            params['delimiter'] = delimiter
+        contents = []
+        prefixes = []
+        while True:
+            url = f'{self.base_url}/?{urllib.parse.urlencode(params)}'
+            with urllib.request.urlopen(url, timeout=self.timeout) as resp:
+                root = ET.fromstring(resp.read())
+            self._record('ListObjectsV2', nkeys=sum(1 for _ in root.iter(f'{S3_XML_NS}Contents')))
+            for item in root.iter(f'{S3_XML_NS}Contents'):
+                modified = item.findtext(f'{S3_XML_NS}LastModified').replace('Z', '+00:00')
+                contents.append({'Key': item.findtext(f'{S3_XML_NS}Key'),
+                                 'Size': int(item.findtext(f'{S3_XML_NS}Size')),
+                                 'ETag': item.findtext(f'{S3_XML_NS}ETag'),
+                                 'LastModified': datetime.datetime.fromisoformat(modified)})
+            prefixes.extend(item.findtext(f'{S3_XML_NS}Prefix') for item in root.iter(f'{S3_XML_NS}CommonPrefixes'))
+            token = root.findtext(f'{S3_XML_NS}NextContinuationToken')
+            if root.findtext(f'{S3_XML_NS}IsTruncated') != 'true' or not token:
+                break
+            params['continuation-token'] = token
+
+        return contents, prefixes
+
+    def head_object(self, key):
+        self._record('HeadObject')
+        request = urllib.request.Request(self._object_url(key), method='HEAD')
+        with urllib.request.urlopen(request, timeout=self.timeout) as resp:
+            return {'ContentLength': int(resp.headers['Content-Length']),
+                    'ETag': resp.headers.get('ETag')}
+
+    def get_range(self, key, start, end):
+        request = urllib.request.Request(self._object_url(key), headers={'Range': f'bytes={start}-{end}'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as resp:
+
+            # Servers ignoring the Range header return the whole object.
+            data = resp.read() if resp.status == 206 else resp.read()[start:end + 1]
+        self._record('GetObject', nbytes=len(data))
+        return data
+
+    def open_stream(self, key):
+        return self._recorded(urllib.request.urlopen(self._object_url(key), timeout=self.timeout))
+
+
+class LocalBackend(StorageBackend):
+    """
+    Bucket mirrored on local disk (e.g. a parallel filesystem), where each object's
+    key is its path relative to the mirror's root folder.
+
+    """
+    def __init__(self, root_dir):
+        """
+        Args:
+            root_dir (str): Root folder of the bucket's mirror.
+
+        """
+        self.root_dir = os.path.abspath(root_dir)
+
+    def path(self, key):
+        """
+        Compose the path of an object w/in the mirror.
+
+        Args:
+            key (str): Object's key.
+
+        Return (str): Object's path on local disk.
+
+        """
+        return os.path.join(self.root_dir, *key.split('/'))
+
+    def _object_details(self, key, stat):
+        """
+        Compose an object's listing details from its file status.
+
+        Args:
+            key (str): Object's key.
+
+            stat (os.stat_result): Object's file status.
+
+        Return (dict): Object's Key, Size, ETag & LastModified (the ETag is derived from
+        the file's size & modification time).
+
+        """
+        return {'Key': key,
+                'Size': stat.st_size,
+                'ETag': f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+                'LastModified': datetime.datetime.fromtimestamp(stat.st_mtime, tz=datetime.timezone.utc)}
+
+    def list_objects(self, prefix='', delimiter=None):
+        # Delimiters other than the folder separator are grouped after listing all keys.
+        if delimiter not in (None, '/'):
+            contents, prefixes = [], set()
+            for obj in self.list_objects(prefix)[0]:
+                pos = obj['Key'].find(delimiter, len(prefix))
+                if pos == -1:
+                    contents.append(obj)
+                else:
+                    prefixes.add(obj['Key'][:pos + len(delimiter)])
+            return contents, sorted(prefixes)
+
+        # Only the folder holding the prefix's last (possibly partial) level needs to be read.
+        folder_key = prefix[:prefix.rfind('/') + 1]
+        folder = self.path(folder_key) if folder_key else self.root_dir
+        contents = []
+        prefixes = []
+        if not os.path.isdir(folder):
+            return contents, prefixes
+
+        pending = [(folder, folder_key)]
+        while pending:
+            folder, folder_key = pending.pop()
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    key = folder_key + entry.name
+                    if entry.is_dir(follow_symlinks=True):
+                        if not (key + '/').startswith(prefix) and not prefix.startswith(key + '/'):
+                            continue
+                        if delimiter == '/' and key.startswith(prefix):
+                            prefixes.append(key + '/')
+                        else:
+                            pending.append((entry.path, key + '/'))
+                    elif key.startswith(prefix):
+                        contents.append(self._object_details(key, entry.stat(follow_symlinks=True)))
+
+        # Keys are listed in lexicographic order (as S3 does).
+        contents.sort(key=lambda obj: obj['Key'])
+        prefixes.sort()
+        self._record('ListObjectsV2', nkeys=len(contents))
+        return contents, prefixes
+
+    def head_object(self, key):
+        self._record('HeadObject')
+        details = self._object_details(key, os.stat(self.path(key)))
+        return {'ContentLength': details['Size'], 'ETag': details['ETag']}
+
+    def get_range(self, key, start, end):
+        with open(self.path(key), 'rb') as f_handle:
+            f_handle.seek(start)
+            data = f_handle.read(end - start + 1)
+        self._record('GetObject', nbytes=len(data))
+        return data
+
+    def open_stream(self, key):
+        return self._recorded(open(self.path(key), 'rb'))
+
+    def download(self, key, fileobj, transfer_config=DEFAULT_TRANSFER_CONFIG):
+        start = fileobj.tell()
+        with open(self.path(key), 'rb') as f_handle:
+            shutil.copyfileobj(f_handle, fileobj, 1024 * 1024)
+        self._record('GetObject', nbytes=fileobj.tell() - start)
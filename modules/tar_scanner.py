@@ -0,0 +1,954 @@
+import io
+import os
+import sys
+import bz2
+import queue
+import hashlib
+import threading
+import time
+import lzma
+import mmap
+import zlib
+import tarfile
+from array import array
+from collections import OrderedDict, deque
+import numpy as np
+
+'''
+Low-level helpers for walking the 512-byte header blocks of a TAR archive
+without reading the member payloads.
+
+The header layout follows the POSIX ustar format w/ the GNU longname/longlink
+& PAX extended header extensions, as handled by Python's tarfile module.
+
+Uncompressed TARs saved on local disk can be scanned via a memory mapping, w/
+the member index returned as compact arrays rather than per-member objects.
+
+Remote objects can be read as seekable files via ranged reads (e.g. to resume the
+inflation of a compressed TAR from a saved checkpoint), or inflated chunk by chunk &
+walked forward as the chunks arrive (e.g. from another thread), w/ the members' payloads
+optionally hashed from the same chunks.
+
+'''
+
+# TAR header block size (bytes).
+BLOCKSIZE = tarfile.BLOCKSIZE
+
+# Columns of a TAR member index.
+TAR_INDEX_COLUMNS = ['name', 'size', 'type', 'offset', 'offset_data']
+
+# Encoding applied to member names (matches tarfile's defaults).
+ENCODING = sys.getfilesystemencoding()
+ERRORS = 'surrogateescape'
+
+# Member types carrying the name/size of the member that follows them.
+GNU_LONG_TYPES = (tarfile.GNUTYPE_LONGNAME, tarfile.GNUTYPE_LONGLINK)
+PAX_TYPES = (tarfile.XHDTYPE, tarfile.SOLARIS_XHDTYPE)
+
+# Extension header types (as integers) & the member types not featuring a ustar prefix field.
+EXT_TYPE_CODES = frozenset(t[0] for t in GNU_LONG_TYPES + PAX_TYPES + (tarfile.XGLTYPE,))
+GNU_TYPE_CODES = np.frombuffer(b''.join(tarfile.GNU_TYPES), dtype=np.uint8)
+
+# Number of header blocks gathered at a time by the memory-mapped scanner.
+SCAN_CHUNK = 16384
+
+# Zero-filled block marking the end of an archive.
+ZERO_BLOCK = bytes(BLOCKSIZE)
+
+# Member types featuring the member's contents as payload.
+FILE_TYPES = frozenset(['0', '\x00', '7'])
+
+# Magic bytes of each compression format mapped to a factory of its decompressor
+# (gzip w/ a 32 KB window & header/trailer checks).
+COMPRESSION_MAGICS = {b'\x1f\x8b': lambda: zlib.decompressobj(zlib.MAX_WBITS | 16),
+                      b'BZh': bz2.BZ2Decompressor,
+                      b'\xfd7zXZ\x00': lzma.LZMADecompressor}
+
+
+def _nts(buf):
+    """
+    Convert a null-terminated header field into a string.
+
+    Args:
+        buf (bytes): Header field.
+
+    Return (str): Decoded header field.
+
+    """
+    p = buf.find(b'\0')
+    if p != -1:
+        buf = buf[:p]
+    return buf.decode(ENCODING, ERRORS)
+
+
+def _nti(buf):
+    """
+    Convert a numeric header field into an integer.
+
+    Args:
+        buf (bytes): Header field in octal or GNU base-256 notation.
+
+    Return (int): Numeric value of the header field.
+
+    """
+    # GNU base-256 notation is used for sizes exceeding 8 GB.
+    if buf[0] in (0o200, 0o377):
+        n = 0
+        for i in range(len(buf) - 1):
+            n <<= 8
+            n += buf[i + 1]
+        if buf[0] == 0o377:
+            n = -(256 ** (len(buf) - 1) - n)
+        return n
+    s = _nts(buf).strip(' \0')
+    return int(s, 8) if s else 0
+
+
+def is_tar_header(block):
+    """
+    Check whether a block is a valid TAR header.
+
+    Args:
+        block (bytes): First 512 bytes of a candidate header.
+
+    Return (bool): True if the block's checksum is valid.
+
+    """
+    if len(block) < BLOCKSIZE or block.count(b'\0') == BLOCKSIZE:
+        return False
+    try:
+        chksum = _nti(block[148:156])
+    except ValueError:
+        return False
+    return chksum in tarfile.calc_chksums(block[:BLOCKSIZE])
+
+
+def parse_tar_header(block):
+    """
+    Parse the name, size & type from a TAR header block.
+
+    Args:
+        block (bytes): 512-byte TAR header block.
+
+    Return (tuple): Member's (name, size, type) or None if the block
+    marks the end of the archive.
+
+    """
+    if block.count(b'\0') == BLOCKSIZE:
+        return None
+    if not is_tar_header(block):
+        raise tarfile.InvalidHeaderError("bad checksum")
+
+    name = _nts(block[0:100])
+    size = _nti(block[124:136])
+    mtype = block[156:157]
+    prefix = _nts(block[345:500])
+
+    # Old V7 archives represent a directory as a regular file w/ a trailing slash.
+    if mtype == tarfile.AREGTYPE and name.endswith('/'):
+        mtype = tarfile.DIRTYPE
+    if mtype == tarfile.DIRTYPE:
+        name = name.rstrip('/')
+
+    # Reconstruct a ustar longname from its prefix field.
+    if prefix and mtype not in tarfile.GNU_TYPES:
+        name = prefix + '/' + name
+
+    return name, size, mtype
+
+
+def parse_pax_headers(buf):
+    """
+    Parse the records of a PAX extended header.
+
+    Args:
+        buf (bytes): Payload of a PAX extended header member.
+
+    Return (dict): PAX keywords mapped to their values.
+
+    """
+    headers = {}
+    pos = 0
+    while pos < len(buf) and buf[pos:pos + 1] != b'\0':
+        sp = buf.find(b' ', pos)
+        if sp == -1:
+            break
+        length = int(buf[pos:sp])
+        if length <= 0:
+            break
+        record = buf[sp + 1:pos + length - 1]
+        keyword, _, value = record.partition(b'=')
+        headers[keyword.decode('utf-8', ERRORS)] = value.decode('utf-8', ERRORS)
+        pos += length
+    return headers
+
+
+def padded_size(size):
+    """
+    Round a member's payload size up to a multiple of the block size.
+
+    Args:
+        size (int): Member's payload size in bytes.
+
+    Return (int): Number of bytes the payload occupies within the archive.
+
+    """
+    return -(-size // BLOCKSIZE) * BLOCKSIZE
+
+
+def walk_tar_headers(read):
+    """
+    Walk the headers of a TAR archive, skipping over each member's payload.
+
+    Args:
+        read (callable): Function w/ signature read(offset, length) returning
+                         the archive's bytes at the given offset.
+
+    Return (generator): Yields (name, size, type, offset, offset_data) per
+    member, where offset is the position of the member's first header block
+    (including any extension headers) & offset_data the position of its payload
+    within the archive.
+
+    """
+    offset = 0
+    member_offset = None
+    long_name = None
+    pax = {}
+    while True:
+        block = read(offset, BLOCKSIZE)
+        if len(block) < BLOCKSIZE:
+            break
+        header = parse_tar_header(block)
+        if header is None:
+            break
+        name, size, mtype = header
+        offset_data = offset + BLOCKSIZE
+        if member_offset is None:
+            member_offset = offset
+
+        # Extension headers describe the member that follows them.
+        if mtype in GNU_LONG_TYPES:
+            if mtype == tarfile.GNUTYPE_LONGNAME:
+                long_name = _nts(read(offset_data, size))
+        elif mtype in PAX_TYPES:
+            pax = parse_pax_headers(read(offset_data, size))
+        elif mtype == tarfile.XGLTYPE:
+            pass
+        else:
+            if long_name is not None:
+                name = long_name
+            if 'path' in pax:
+                name = pax['path'].rstrip('/')
+            if 'size' in pax:
+                size = int(pax['size'])
+            if mtype == tarfile.DIRTYPE:
+                name = name.rstrip('/')
+            yield name, size, mtype.decode('ascii'), member_offset, offset_data
+            member_offset = None
+            long_name = None
+            pax = {}
+
+        offset = offset_data + padded_size(size)
+
+
+class RangeReader():
+    """
+    Read byte ranges of a remote object through a read-ahead window.
+
+    """
+    def __init__(self, fetch, size, readahead=64 * 1024):
+        """
+        Args:
+            fetch (callable): Function w/ signature fetch(start, end) returning
+                              the object's bytes within the inclusive range.
+
+            size (int): Object's size in bytes.
+
+            readahead (int): Minimum number of bytes requested per fetch, so
+                             the headers of small consecutive members are
+                             served by a single request.
+
+        """
+        self.fetch = fetch
+        self.size = size
+        self.readahead = readahead
+        self.window_start = 0
+        self.window = b''
+
+    def read(self, offset, length):
+        """
+        Read bytes from the object.
+
+        Args:
+            offset (int): Position of the first byte to read.
+
+            length (int): Number of bytes to read.
+
+        Return (bytes): Requested bytes, truncated at the end of the object.
+
+        """
+        if offset >= self.size or length <= 0:
+            return b''
+        length = min(length, self.size - offset)
+        start = offset - self.window_start
+        if start < 0 or start + length > len(self.window):
+            end = min(offset + max(length, self.readahead), self.size) - 1
+            self.window = self.fetch(offset, end)
+            self.window_start = offset
+            start = 0
+        return self.window[start:start + length]
+
+
+class RangeFile(io.RawIOBase):
+    """
+    Seekable, read-only file view of a remote object, serving reads from a small
+    cache of fixed-size blocks (each block is requested via a single ranged read).
+
+    """
+    def __init__(self, fetch, size, blocksize=1024 * 1024, max_blocks=8):
+        """
+        Args:
+            fetch (callable): Function w/ signature fetch(start, end) returning
+                              the object's bytes within the inclusive range.
+
+            size (int): Object's size in bytes.
+
+            blocksize (int): Number of bytes requested per ranged read.
+
+            max_blocks (int): Number of most recently read blocks kept in memory,
+                              so short backward seeks are served w/o new requests.
+
+        """
+        self.fetch = fetch
+        self.size = size
+        self.blocksize = blocksize
+        self.max_blocks = max_blocks
+        self.blocks = OrderedDict()
+        self.pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}.")
+        self.pos = offset
+        return self.pos
+
+    def _block(self, idx):
+        """
+        Read a block of the object (from the cache if recently read).
+
+        Args:
+            idx (int): Block's position w/in the object (in blocks).
+
+        Return (bytes): Block's bytes.
+
+        """
+        if idx in self.blocks:
+            self.blocks.move_to_end(idx)
+            return self.blocks[idx]
+        start = idx * self.blocksize
+        block = self.fetch(start, min(start + self.blocksize, self.size) - 1)
+        self.blocks[idx] = block
+        if len(self.blocks) > self.max_blocks:
+            self.blocks.popitem(last=False)
+        return block
+
+    def readinto(self, buf):
+        view = memoryview(buf).cast('B')
+        nread = 0
+        while nread < len(view) and self.pos < self.size:
+            idx, start = divmod(self.pos, self.blocksize)
+            block = self._block(idx)
+            if len(block) <= start:
+                # A short block (e.g. the object is smaller than its listed size)
+                # would never advance the position.
+                raise EOFError(f"Object ends at byte {idx * self.blocksize + len(block)} "
+                               f"(expected {self.size}).")
+            length = min(len(view) - nread, len(block) - start)
+            view[nread:nread + length] = block[start:start + length]
+            nread += length
+            self.pos += length
+        return nread
+
+
+class StreamInflater():
+    """
+    Inflate a compressed (gzip, bz2 or xz) or uncompressed TAR archive fed as a
+    sequence of chunks, w/ the output split into chunks of bounded size.
+
+    """
+    def __init__(self, head, out_chunk=1024 * 1024):
+        """
+        Args:
+            head (bytes): First bytes of the archive (to detect its compression).
+
+            out_chunk (int): Maximum number of bytes inflated at a time.
+
+        """
+        self.magic, self.factory = next(((magic, factory) for magic, factory in COMPRESSION_MAGICS.items()
+                                         if head.startswith(magic)), (None, None))
+        self.out_chunk = out_chunk
+        self.decomp = None
+        self.done = False
+
+    def _drain(self, data):
+        """
+        Inflate a chunk w/ the current member's decompressor.
+
+        Args:
+            data (bytes): Compressed bytes.
+
+        Return (generator): Yields the inflated bytes.
+
+        """
+        decomp = self.decomp
+        if isinstance(decomp, (bz2.BZ2Decompressor, lzma.LZMADecompressor)):
+            while not decomp.eof:
+                out = decomp.decompress(data, self.out_chunk)
+                data = b''
+                if out:
+                    yield out
+                if decomp.needs_input:
+                    break
+        else:
+            while True:
+                out = decomp.decompress(data, self.out_chunk)
+                data = decomp.unconsumed_tail
+                if out:
+                    yield out
+                if decomp.eof or (not data and len(out) < self.out_chunk):
+                    break
+
+    def feed(self, data):
+        """
+        Inflate the next chunk of the archive.
+
+        Args:
+            data (bytes): Next chunk of the archive's (compressed) bytes.
+
+        Return (generator): Yields the inflated bytes.
+
+        """
+        if self.factory is None:
+            if data:
+                yield data
+            return
+
+        # Concatenated members (e.g. from parallel compressors) are inflated in turn, while
+        # any trailing bytes not starting a new member are ignored.
+        while data and not self.done:
+            if self.decomp is None:
+                if not data.startswith(self.magic):
+                    self.done = True
+                    break
+                self.decomp = self.factory()
+            yield from self._drain(data)
+            if self.decomp.eof:
+                data = self.decomp.unused_data
+                self.decomp = None
+            else:
+                data = b''
+
+
+class ChunkReader():
+    """
+    Forward-only reader serving byte ranges of a stream delivered as a sequence of
+    chunks, w/ the chunks read past released as soon as they are skipped.
+
+    """
+    def __init__(self, next_chunk, on_release=None):
+        """
+        Args:
+            next_chunk (callable): Function returning the stream's next chunk
+                                   (or None at the end of the stream).
+
+            on_release (callable): Function w/ signature on_release(chunk, start) called
+                                   w/ each chunk (& its position w/in the stream) once
+                                   released, in stream order. If not applicable, set as
+                                   default value.
+
+        """
+        self.next_chunk = next_chunk
+        self.on_release = on_release
+        self.chunks = deque()
+        self.start = 0
+        self.end = 0
+
+    def _release(self):
+        """
+        Release the first chunk held.
+
+        """
+        chunk = self.chunks.popleft()
+        if self.on_release is not None:
+            self.on_release(chunk, self.start)
+        self.start += len(chunk)
+
+    def release(self):
+        """
+        Release all of the chunks held (e.g. once the end of the archive is reached).
+
+        """
+        while self.chunks:
+            self._release()
+
+    def read(self, offset, length):
+        """
+        Read bytes from the stream (offsets may not precede a previous read's offset).
+
+        Args:
+            offset (int): Position of the first byte to read.
+
+            length (int): Number of bytes to read.
+
+        Return (bytes): Requested bytes, truncated at the end of the stream.
+
+        """
+        while True:
+            while self.chunks and self.start + len(self.chunks[0]) <= offset:
+                self._release()
+            if self.end >= offset + length:
+                break
+            chunk = self.next_chunk()
+            if chunk is None:
+                break
+            self.chunks.append(chunk)
+            self.end += len(chunk)
+
+        out = []
+        pos = self.start
+        for chunk in self.chunks:
+            if pos >= offset + length:
+                break
+            lo, hi = max(offset - pos, 0), min(offset + length - pos, len(chunk))
+            if hi > lo:
+                out.append(chunk[lo:hi])
+            pos += len(chunk)
+        return b''.join(out)
+
+
+class Crc32():
+    """
+    CRC-32 hash state w/ the hashlib interface.
+
+    """
+    def __init__(self):
+        self.crc = 0
+
+    def update(self, data):
+        self.crc = zlib.crc32(data, self.crc)
+
+    def hexdigest(self):
+        return f'{self.crc:08x}'
+
+
+# Member digests (computed while streaming) mapped to the factory of their hash state.
+DIGESTS = {'crc32': Crc32,
+           'sha256': hashlib.sha256}
+
+
+class MemberHasher():
+    """
+    Hash the payload of each file member of a TAR archive from the chunks of the
+    (uncompressed) archive, w/ the hashing spread across worker threads.
+
+    Each member is assigned to a single worker, so its chunks are hashed in order,
+    while the members are hashed concurrently (zlib & hashlib release the GIL while
+    hashing large buffers).
+
+    """
+    def __init__(self, digests=('crc32',), max_workers=4, queue_depth=64):
+        """
+        Args:
+            digests (tuple): Digests to compute per member (keys of DIGESTS).
+                             Options: 'crc32', 'sha256'
+
+            max_workers (int): Number of hashing threads.
+
+            queue_depth (int): Number of chunk slices buffered per hashing thread.
+
+        """
+        for digest in digests:
+            if digest not in DIGESTS:
+                raise ValueError(f"{digest} is not a valid member digest.")
+        self.digests = tuple(digests)
+        self.pending = deque()
+        self.results = {}
+        self.nbytes = 0
+        self.busy = 0.0
+        self.lock = threading.Lock()
+        self.queues = [queue.Queue(queue_depth) for _ in range(max_workers)]
+        self.threads = [threading.Thread(target=self._work, args=(q,), daemon=True) for q in self.queues]
+        for thread in self.threads:
+            thread.start()
+
+    def _work(self, tasks):
+        """
+        Hash the chunk slices assigned to a worker.
+
+        Args:
+            tasks (queue.Queue): Worker's (member's position, chunk slice, last slice) tasks.
+
+        """
+        states = {}
+        busy, nbytes = 0.0, 0
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            idx, data, last = task
+            start = time.perf_counter()
+            if idx not in states:
+                states[idx] = [DIGESTS[digest]() for digest in self.digests]
+            for state in states[idx]:
+                state.update(data)
+            if last:
+                self.results[idx] = [state.hexdigest() for state in states.pop(idx)]
+            busy += time.perf_counter() - start
+            nbytes += len(data)
+        with self.lock:
+            self.busy += busy
+            self.nbytes += nbytes
+
+    def add_member(self, idx, member):
+        """
+        Register a member whose payload follows in the chunks not yet consumed.
+
+        Args:
+            idx (int): Member's position w/in the archive's index.
+
+            member (tuple): Member's (name, size, type, offset, offset_data).
+
+        """
+        _, size, mtype, _, offset_data = member
+        if mtype not in FILE_TYPES:
+            return
+        if size == 0:
+            self.queues[idx % len(self.queues)].put((idx, b'', True))
+        else:
+            self.pending.append((idx, offset_data, offset_data + size))
+
+    def consume(self, chunk, start):
+        """
+        Hash the payload bytes of the registered members featured within a chunk.
+
+        Args:
+            chunk (bytes): Chunk of the uncompressed archive.
+
+            start (int): Position of the chunk w/in the archive.
+
+        """
+        end = start + len(chunk)
+        view = memoryview(chunk)
+        while self.pending and self.pending[0][1] < end:
+            idx, lo, hi = self.pending[0]
+            data = view[max(lo, start) - start:min(hi, end) - start]
+            self.queues[idx % len(self.queues)].put((idx, data, hi <= end))
+            if hi > end:
+                break
+            self.pending.popleft()
+
+    def close(self):
+        """
+        Wait for the queued chunk slices to be hashed & stop the workers.
+
+        Return (dict): Hex digests (in the order of the requested digests) per member's
+        position (members whose payload was not fully consumed are omitted).
+
+        """
+        for tasks in self.queues:
+            tasks.put(None)
+        for thread in self.threads:
+            thread.join()
+        return self.results
+
+    def columns(self, n_members):
+        """
+        Arrange the members' digests as index columns.
+
+        Args:
+            n_members (int): Number of members featured within the archive's index.
+
+        Return (dict): List of hex digests (None for non-file members) per digest.
+
+        """
+        return {digest: [self.results[idx][pos] if idx in self.results else None for idx in range(n_members)]
+                for pos, digest in enumerate(self.digests)}
+
+
+def _gather_fields(blocks, offsets, start, length):
+    """
+    Gather a fixed-width header field of many header blocks.
+
+    Args:
+        blocks (np.ndarray): Archive's bytes viewed as a (n, BLOCKSIZE) uint8 array.
+
+        offsets (np.ndarray): Positions of the header blocks (multiples of BLOCKSIZE).
+
+        start (int): Position of the field w/in a header block.
+
+        length (int): Width of the field in bytes.
+
+    Return (np.ndarray): Fields as a (len(offsets), length) uint8 array.
+
+    """
+    return blocks[offsets // BLOCKSIZE, start:start + length]
+
+
+def _parse_octal_fields(fields):
+    """
+    Parse octal header fields (e.g. checksums) in bulk.
+
+    Leading spaces are skipped & each field ends at its first non-octal character.
+
+    Args:
+        fields (np.ndarray): Fields as a (n, width) uint8 array.
+
+    Return (np.ndarray): Parsed values (int64).
+
+    """
+    is_digit = (fields >= ord('0')) & (fields <= ord('7'))
+    started = np.logical_or.accumulate(is_digit, axis=1)
+    ended = np.logical_or.accumulate(started & ~is_digit, axis=1)
+    valid = is_digit & ~ended
+    values = np.zeros(len(fields), dtype=np.int64)
+    for col in range(fields.shape[1]):
+        values = np.where(valid[:, col], values * 8 + fields[:, col] - ord('0'), values)
+    return values
+
+
+def _check_chksums(blocks, offsets):
+    """
+    Validate the checksums of many header blocks in bulk (as tarfile does, both the
+    unsigned & signed sums of the block are accepted).
+
+    Args:
+        blocks (np.ndarray): Archive's bytes viewed as a (n, BLOCKSIZE) uint8 array.
+
+        offsets (np.ndarray): Positions of the header blocks.
+
+    """
+    for idx in range(0, len(offsets), SCAN_CHUNK):
+        chunk = offsets[idx:idx + SCAN_CHUNK]
+        headers = _gather_fields(blocks, chunk, 0, BLOCKSIZE)
+        chksum_fields = headers[:, 148:156]
+        stored = _parse_octal_fields(chksum_fields)
+        spaces = 8 * ord(' ')
+        unsigned = headers.sum(axis=1, dtype=np.int64) - chksum_fields.sum(axis=1, dtype=np.int64) + spaces
+        signed = (headers.view(np.int8).sum(axis=1, dtype=np.int64) 
+                  - chksum_fields.view(np.int8).sum(axis=1, dtype=np.int64) + spaces)
+        bad = np.flatnonzero((stored != unsigned) & (stored != signed))
+        if len(bad):
+            raise tarfile.InvalidHeaderError(f"bad checksum at offset {chunk[bad[0]]}")
+
+
+def _decode_names(blocks, offsets, types):
+    """
+    Decode the names of many header blocks in bulk (incl. the ustar prefix field).
+
+    Args:
+        blocks (np.ndarray): Archive's bytes viewed as a (n, BLOCKSIZE) uint8 array.
+
+        offsets (np.ndarray): Positions of the members' header blocks.
+
+        types (np.ndarray): Members' type flags (uint8).
+
+    Return (list): Members' names.
+
+    """
+    names = []
+    for idx in range(0, len(offsets), SCAN_CHUNK):
+        chunk = offsets[idx:idx + SCAN_CHUNK]
+        fields = np.ascontiguousarray(_gather_fields(blocks, chunk, 0, 100)).view('S100').ravel()
+        names.extend(name.split(b'\0', 1)[0].decode(ENCODING, ERRORS) for name in fields.tolist())
+
+    # Reconstruct the ustar longnames from their prefix field.
+    has_prefix = (blocks[offsets // BLOCKSIZE, 345] != 0) & ~np.isin(types, GNU_TYPE_CODES)
+    for idx in np.flatnonzero(has_prefix):
+        prefix = _nts(blocks[offsets[idx] // BLOCKSIZE, 345:500].tobytes())
+        if prefix:
+            name = names[idx].rstrip('/') if types[idx] == tarfile.DIRTYPE[0] else names[idx]
+            names[idx] = prefix + '/' + name
+    return names
+
+
+def scan_tar_mmap(tar_fn):
+    """
+    Scan the headers of an uncompressed TAR saved on local disk via a memory mapping.
+
+    Each header's size field is parsed to jump over the member's payload, while the
+    checksums, names & types of all headers are gathered from the mapping in bulk,
+    so no TarInfo (or other per-member) objects are built along the way.
+
+    Args:
+        tar_fn (str): Filename of the uncompressed TAR.
+
+    Return (dict): TAR member index as compact arrays keyed by TAR_INDEX_COLUMNS
+    (object array of names, single-character type array & int64 size/offset arrays).
+
+    """
+    with open(tar_fn, 'rb') as f_handle:
+        if os.fstat(f_handle.fileno()).st_size == 0:
+            return _index_arrays([], array('q'), bytearray(), array('q'), array('q'))
+        with mmap.mmap(f_handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _scan_mapping(mm)
+
+
+def _scan_mapping(mm):
+    """
+    Scan the headers of a memory-mapped TAR (refer to scan_tar_mmap()).
+
+    Args:
+        mm (mmap.mmap): Memory-mapped TAR.
+
+    Return (dict): TAR member index as compact arrays keyed by TAR_INDEX_COLUMNS.
+
+    """
+    end = len(mm)
+    header_offsets = array('q')
+    member_offsets = array('q')
+    sizes = array('q')
+    types = bytearray()
+    ext_offsets = array('q')
+    overrides = {}
+    offset = 0
+    member_offset = None
+    long_name = None
+    pax = {}
+    while offset + BLOCKSIZE <= end:
+        if mm[offset] == 0 and mm[offset:offset + BLOCKSIZE] == ZERO_BLOCK:
+            break
+        size_field = mm[offset + 124:offset + 136]
+        try:
+            size = int(size_field.strip(b' \0') or b'0', 8)
+        except ValueError:
+            try:
+                size = _nti(size_field)
+            except ValueError:
+                raise tarfile.InvalidHeaderError(f"invalid size field at offset {offset}")
+        mtype = mm[offset + 156]
+        offset_data = offset + BLOCKSIZE
+        if member_offset is None:
+            member_offset = offset
+
+        # Extension headers describe the member that follows them.
+        if mtype in EXT_TYPE_CODES:
+            ext_offsets.append(offset)
+            if mtype == tarfile.GNUTYPE_LONGNAME[0]:
+                long_name = _nts(mm[offset_data:offset_data + size])
+            elif mtype in (PAX_TYPES[0][0], PAX_TYPES[1][0]):
+                pax = parse_pax_headers(mm[offset_data:offset_data + size])
+        else:
+            if long_name is not None or pax:
+                name = pax['path'].rstrip('/') if 'path' in pax else long_name
+                if 'size' in pax:
+                    size = int(pax['size'])
+                overrides[len(header_offsets)] = name
+            header_offsets.append(offset)
+            member_offsets.append(member_offset)
+            sizes.append(size)
+            types.append(mtype)
+            member_offset = None
+            long_name = None
+            pax = {}
+
+        offset = offset_data + padded_size(size)
+
+    # Views on the mapping (incl. those referenced by a traceback) must be released before it is closed.
+    blocks = np.frombuffer(mm, dtype=np.uint8, count=end // BLOCKSIZE * BLOCKSIZE).reshape(-1, BLOCKSIZE)
+    error = None
+    try:
+        offsets = np.frombuffer(header_offsets, dtype=np.int64)
+        _check_chksums(blocks, np.concatenate([offsets, np.frombuffer(ext_offsets, dtype=np.int64)]))
+        names = _decode_names(blocks, offsets, np.frombuffer(types, dtype=np.uint8))
+    except tarfile.InvalidHeaderError as exc:
+        error = str(exc)
+    finally:
+        del blocks
+    if error is not None:
+        raise tarfile.InvalidHeaderError(error)
+    for idx, name in overrides.items():
+        if name is not None:
+            names[idx] = name
+    return _index_arrays(names, sizes, types, member_offsets, header_offsets)
+
+
+def _index_arrays(names, sizes, types, member_offsets, header_offsets):
+    """
+    Pack the scanned member details into a TAR member index of compact arrays.
+
+    Args:
+        names (list): Members' names.
+
+        sizes (array): Members' sizes.
+
+        types (bytearray): Members' type flags.
+
+        member_offsets (array): Positions of the members' first header blocks.
+
+        header_offsets (array): Positions of the members' own header blocks.
+
+    Return (dict): TAR member index as compact arrays keyed by TAR_INDEX_COLUMNS.
+
+    """
+    # Old V7 archives represent a directory as a regular file w/ a trailing slash.
+    type_codes = np.frombuffer(bytes(types), dtype=np.uint8)
+    name_array = np.empty(len(names), dtype=object)
+    name_array[:] = names
+    for idx in np.flatnonzero((type_codes == tarfile.DIRTYPE[0]) | (type_codes == tarfile.AREGTYPE[0])):
+        if type_codes[idx] == tarfile.DIRTYPE[0] or name_array[idx].endswith('/'):
+            types[idx] = tarfile.DIRTYPE[0]
+            name_array[idx] = name_array[idx].rstrip('/')
+
+    # Type flags are kept as single characters (incl. the NUL flag of regular files).
+    type_array = np.empty(len(types), dtype=object)
+    type_array[:] = list(bytes(types).decode('ascii'))
+
+    return dict(zip(TAR_INDEX_COLUMNS, [name_array, 
+                                        np.array(sizes, dtype=np.int64), 
+                                        type_array,
+                                        np.array(member_offsets, dtype=np.int64),
+                                        np.array(header_offsets, dtype=np.int64) + BLOCKSIZE]))
+
+
+def scan_local_tar(tar_fn):
+    """
+    Scan the members of a TAR saved on local disk. Uncompressed TARs are scanned
+    via a memory mapping, compressed TARs w/in a single streaming pass.
+
+    Args:
+        tar_fn (str): Filename of the TAR.
+
+    Return (dict): TAR member index as compact arrays keyed by TAR_INDEX_COLUMNS.
+
+    """
+    with open(tar_fn, 'rb') as f_handle:
+        if is_tar_header(f_handle.read(BLOCKSIZE)):
+            return scan_tar_mmap(tar_fn)
+
+        f_handle.seek(0)
+        names, sizes, types = [], array('q'), bytearray()
+        member_offsets, header_offsets = array('q'), array('q')
+        with tarfile.open(fileobj=f_handle, mode='r|*') as tarf:
+            for tarinfo in tarf:
+                names.append(tarinfo.name)
+                sizes.append(tarinfo.size)
+                types.extend(tarinfo.type)
+                member_offsets.append(tarinfo.offset)
+                header_offsets.append(tarinfo.offset_data - BLOCKSIZE)
+
+                # Release the TarInfo objects retained by the reader.
+                tarf.members = []
+    return _index_arrays(names, sizes, types, member_offsets, header_offsets)
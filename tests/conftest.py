@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules are imported the same way as by the tools under main/.
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'modules'))
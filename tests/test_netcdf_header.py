@@ -0,0 +1,70 @@
+import os
+import pytest
+from netcdf_header import sniff_format, read_netcdf_header
+
+'''
+Header introspection of small NetCDF/HDF5 files checked in under fixtures/netcdf:
+
+* classic.nc, offset64.nc: NetCDF-3 classic & 64-bit offset files (netCDF4-python).
+* nc4_compact.nc, nc4_dense.nc: NetCDF-4 files w/ 2 variables of 2 attributes each (links &
+  attributes stored in the object headers) & w/ 12 variables of 12 attributes each (stored in
+  fractal heaps indexed by v2 B-trees).
+* h5_symbol_table.h5: HDF5 file written w/ libver='earliest' (groups stored as symbol tables).
+* h5_compact.h5, h5_dense.h5: HDF5 files written w/ libver='latest' (h5py) w/ 3 datasets of 2
+  attributes each & w/ 12 datasets of 12 attributes each, plus the grp/x dataset.
+
+'''
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'netcdf')
+
+NC_DIMENSIONS = {'time': 0, 'yaxis_1': 3, 'xaxis_1': 4}
+
+
+def nc_variables(nvars):
+    return {'time': (0,), **{f'var{idx:02d}': (3, 4) for idx in range(nvars)}}
+
+
+def h5_variables(ndsets):
+    return {**{f'd{idx:02d}': (idx + 1,) for idx in range(ndsets)}, 'grp/x': (3, 4)}
+
+
+EXPECTED_HEADERS = {
+    'classic.nc': ('NetCDF-3 classic', NC_DIMENSIONS, nc_variables(2)),
+    'offset64.nc': ('NetCDF-3 64-bit offset', NC_DIMENSIONS, nc_variables(2)),
+    'nc4_compact.nc': ('NetCDF-4', NC_DIMENSIONS, nc_variables(2)),
+    'nc4_dense.nc': ('NetCDF-4', NC_DIMENSIONS, nc_variables(12)),
+    'h5_symbol_table.h5': ('HDF5', {}, h5_variables(3)),
+    'h5_compact.h5': ('HDF5', {}, h5_variables(3)),
+    'h5_dense.h5': ('HDF5', {}, h5_variables(12)),
+}
+
+
+def file_reader(fn):
+    with open(os.path.join(FIXTURE_DIR, fn), 'rb') as f_handle:
+        data = f_handle.read()
+    return lambda offset, length: data[offset:offset + length]
+
+
+@pytest.mark.parametrize('fn', sorted(EXPECTED_HEADERS))
+def test_read_netcdf_header(fn):
+    file_format, dimensions, variables = EXPECTED_HEADERS[fn]
+    header = read_netcdf_header(file_reader(fn))
+    
+    assert header['format'] == file_format
+    assert header['dimensions'] == dimensions
+    assert header['variables'] == variables
+
+
+@pytest.mark.parametrize('fn', sorted(EXPECTED_HEADERS))
+def test_read_netcdf_header_truncated(fn):
+    read = file_reader(fn)
+    
+    # Headers cut short are reported as such rather than parsed from garbage.
+    with pytest.raises((ValueError, EOFError)):
+        read_netcdf_header(lambda offset, length: read(offset, length)[:max(0, 64 - offset)])
+
+
+def test_sniff_format():
+    assert sniff_format(b'CDF\x05' + bytes(4)) == 'NetCDF-3 64-bit data'
+    assert sniff_format(b'\x89HDF\r\n\x1a\n') == 'HDF5'
+    assert sniff_format(b'GRIB') is None
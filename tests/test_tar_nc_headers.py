@@ -0,0 +1,68 @@
+import os
+import tarfile
+import pytest
+import data_map_generator
+from data_map_generator import DataMapGenerator, NC_HEADER_COLUMNS
+
+'''
+Header introspection of the NetCDF members of TAR-based objects served from a local mirror,
+for every compression (members of objects w/o random access are introspected while streamed).
+
+'''
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'netcdf')
+
+MEMBERS = {'inputs/C96/classic.nc': 'NetCDF-3 classic',
+           'inputs/C96/nc4_dense.nc': 'NetCDF-4',
+           'inputs/C96/h5_dense.h5': '',
+           'outputs/offset64.nc': 'NetCDF-3 64-bit offset'}
+
+
+@pytest.fixture
+def mirror(tmp_path, monkeypatch):
+    for mode in ['w', 'w:gz', 'w:bz2', 'w:xz']:
+        ext = mode.partition(':')[2]
+        with tarfile.open(tmp_path / f'data.tar{"." + ext if ext else ""}', mode) as tarf:
+            for name in MEMBERS:
+                tarf.add(os.path.join(FIXTURE_DIR, os.path.basename(name)), arcname=name)
+    
+    # Tools are run from main/ (results are saved to ../results).
+    (tmp_path / 'main').mkdir()
+    monkeypatch.chdir(tmp_path / 'main')
+    return DataMapGenerator('land-da', use_snapshot=False, use_index_cache=False, backend='local', mirror_dir=str(tmp_path))
+
+
+@pytest.mark.parametrize('key', ['data.tar', 'data.tar.gz', 'data.tar.bz2', 'data.tar.xz'])
+def test_read_s3_tar_nc_headers(mirror, key):
+    headers = mirror.read_s3_tar_nc_headers(key)
+    
+    # Only members w/ a NetCDF extension are introspected by default.
+    assert dict(zip(headers['name'], headers['File Format'])) == {name: fmt for name, fmt in MEMBERS.items() if fmt}
+    assert (headers.set_index('name').loc['inputs/C96/nc4_dense.nc', 'Variables'] == 
+            ', '.join(['time'] + [f'var{idx:02d}' for idx in range(12)]))
+
+
+def test_read_s3_tar_nc_headers_wo_indexed_gzip(mirror, monkeypatch):
+    monkeypatch.setattr(data_map_generator, 'indexed_gzip', None)
+    headers = mirror.read_s3_tar_nc_headers('data.tar.gz', names=list(MEMBERS))
+    
+    assert dict(zip(headers['name'], headers['File Format'])) == {name: fmt or 'HDF5' for name, fmt in MEMBERS.items()}
+
+
+def test_read_s3_tar_nc_headers_truncated_stream(mirror, tmp_path, monkeypatch):
+    monkeypatch.setattr(data_map_generator, 'indexed_gzip', None)
+    
+    # Members past the end of a truncated archive are left empty rather than failing the map.
+    data = (tmp_path / 'data.tar.gz').read_bytes()
+    (tmp_path / 'truncated.tar.gz').write_bytes(data[:len(data) * 3 // 4])
+    headers = mirror.read_s3_tar_nc_headers('truncated.tar.gz', names=list(MEMBERS), tar_index=mirror.read_s3_tar_index('data.tar.gz'))
+    
+    assert headers['name'].tolist() == list(MEMBERS)
+    assert headers['File Format'].iloc[0] == 'NetCDF-3 classic'
+    assert headers[NC_HEADER_COLUMNS].iloc[-1].tolist() == ['', '', '']
+
+
+def test_map_tar_object_introspect(mirror):
+    df = mirror.map_tar_object('data.tar.xz', {0: 'Category', 1: 'Resolution'}, save_keys=False, introspect=True)
+    
+    assert df.set_index('TAR Member')['File Format'].to_dict() == MEMBERS